@@ -0,0 +1 @@
+"""Benchmark and stress tools for the Library Management System."""
@@ -0,0 +1,178 @@
+"""
+Seeded generator for realistic synthetic library data.
+
+Usage:
+    python -m benchmarks.generate --transactions 1000000 [--books N] [--members N]
+                                  [--seed 42] [--out DIR]
+
+Writes DIR/data/books.csv, members.csv and transactions.csv in the
+app's own format (the app splits transactions.csv into monthly
+partitions on first use). The same seed and sizes always produce the same
+rows (dates are relative to today, so overdue queries stay meaningful).
+Book popularity follows a bounded Zipf law (a few titles get most
+loans, none gets more than a share of them), borrow dates span several
+years and a small share of loans is still open. A book is only lent
+while it is on the shelf, and books out on loan are marked unavailable;
+generate() re-reads what it wrote and checks these invariants.
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+from datetime import date
+from itertools import accumulate
+
+from library.book import Book
+from library.member import Member
+from library.transaction import Transaction
+
+WORDS = [
+    "Python", "Java", "Data", "Science", "History", "Modern", "Art", "Music", "Network", "Systems",
+    "Physics", "Chemistry", "Garden", "Ocean", "Mountain", "River", "Silent", "Golden", "Shadow",
+    "Empire", "Journey", "Machine", "Learning", "Design", "Patterns", "Quantum", "Theory", "Practical",
+    "Introduction", "Advanced", "Guide", "Secrets", "Winter", "Summer", "City", "Night", "Stars",
+]
+FIRST_NAMES = ["Ali", "Sara", "Ahmad", "Fatima", "Usman", "Ayesha", "Bilal", "Zainab", "Hamza", "Maryam",
+               "John", "Emma", "Omar", "Hina", "Imran", "Nadia", "Tariq", "Sana", "Kamran", "Rabia"]
+LAST_NAMES = ["Khan", "Ahmed", "Malik", "Hussain", "Sheikh", "Raza", "Butt", "Iqbal", "Qureshi", "Smith"]
+GENRES = ["Programming", "Fiction", "Science", "History", "Biography", "Mathematics", "Art", "Poetry"]
+DEPARTMENTS = ["Cs", "Math", "Physics", "Chemistry", "English", "Business", "Law", "Arts"]
+
+HISTORY_DAYS = 5 * 365
+OPEN_SHARE = 0.05
+ZIPF_EXPONENT = 1.0     # popularity of the n-th most popular book ~ 1 / n**ZIPF_EXPONENT
+DRAWS = 20              # popularity draws before falling back to any book on the shelf
+
+
+def default_sizes(transactions):
+    """Catalog and member counts that scale with the history size."""
+    return max(100, transactions // 10), max(50, transactions // 20)
+
+
+def generate(out_dir, transactions, books=None, members=None, seed=42):
+    """Write the three tables under out_dir/data; return the row counts."""
+    default_books, default_members = default_sizes(transactions)
+    books = books or default_books
+    members = members or default_members
+    rng = random.Random(seed)
+    data_dir = os.path.join(out_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    # Zipf weights over the books in a random popularity order
+    ranking = rng.sample(range(1, books + 1), books)
+    cum_weights = list(accumulate(1 / rank ** ZIPF_EXPONENT for rank in range(1, books + 1)))
+    back = [-math.inf] * (books + 1)    # book number -> day it is back on the shelf (math.inf: still out)
+
+    def lend(day, until):
+        """A book on the shelf on day (popular ones first); it is then out until until."""
+        for _ in range(DRAWS):
+            book = rng.choices(ranking, cum_weights=cum_weights)[0]
+            if back[book] <= day:
+                break
+        else:
+            first = rng.randrange(books)
+            for offset in range(books):
+                book = (first + offset) % books + 1
+                if back[book] <= day:
+                    break
+            else:
+                raise ValueError(f"{books} books are too few for {transactions} transactions")
+        back[book] = until
+        return book
+
+    # Open loans: the newest OPEN_SHARE of the history, at most one per book
+    open_count = min(int(transactions * OPEN_SHARE), books)
+    today = date.today().toordinal()
+    start = today - HISTORY_DAYS
+    open_dates = sorted(today - rng.randint(0, 30) for _ in range(open_count))
+
+    with open(os.path.join(data_dir, os.path.basename(Transaction.DATA_FILE)), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Transaction.FIELDNAMES)
+        closed = transactions - open_count
+        for i in range(1, transactions + 1):
+            member_id = f"M{rng.randint(1, members):03d}"
+            if i <= closed:
+                # Borrow dates advance through the history
+                borrowed = start + (HISTORY_DAYS - 30) * i // max(closed, 1)
+                returned = borrowed + rng.randint(0, 28)
+                book_id = f"B{lend(borrowed, returned):03d}"
+                writer.writerow([f"T{i:04d}", member_id, book_id, date.fromordinal(borrowed).isoformat(),
+                                 date.fromordinal(returned).isoformat(), "Returned"])
+            else:
+                borrowed = open_dates[i - closed - 1]
+                book_id = f"B{lend(borrowed, math.inf):03d}"
+                writer.writerow([f"T{i:04d}", member_id, book_id,
+                                 date.fromordinal(borrowed).isoformat(), "", "Borrowed"])
+    lent = {book for book in range(1, books + 1) if back[book] == math.inf}
+
+    with open(os.path.join(data_dir, os.path.basename(Book.DATA_FILE)), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Book.FIELDNAMES)
+        for i in range(1, books + 1):
+            title = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+            author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            writer.writerow([f"B{i:03d}", title, author, rng.choice(GENRES),
+                             rng.randint(1950, 2025), i not in lent])
+
+    with open(os.path.join(data_dir, os.path.basename(Member.DATA_FILE)), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Member.FIELDNAMES)
+        for i in range(1, members + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            joined = date.fromordinal(start + rng.randint(0, HISTORY_DAYS)).isoformat()
+            writer.writerow([f"M{i:03d}", f"{first} {last}", f"{first}.{last}.{i}@example.org".lower(),
+                             f"03{rng.randint(0, 10**9 - 1):09d}", rng.choice(DEPARTMENTS), joined])
+
+    problems = verify(data_dir)
+    if problems:
+        raise RuntimeError("generated data breaks table invariants: " + "; ".join(problems[:5]))
+    return {"books": books, "members": members, "transactions": transactions, "open_loans": open_count}
+
+
+def verify(data_dir):
+    """
+    Check the generated tables; return a list of problems. Rows are
+    written in borrow-date order, so one pass finds any loan of a book
+    that had not been returned yet.
+    """
+    problems = []
+    back = {}      # book_id -> return date of its latest loan (None: still out)
+    with open(os.path.join(data_dir, os.path.basename(Transaction.DATA_FILE)), newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for transaction_id, _, book_id, borrow_date, return_date, status in reader:
+            if book_id in back and (back[book_id] is None or back[book_id] > borrow_date):
+                problems.append(f"{transaction_id} lends {book_id} while it is out")
+            if (status == "Borrowed") == bool(return_date):
+                problems.append(f"{transaction_id} has status {status} and return date {return_date!r}")
+            back[book_id] = return_date or None
+    with open(os.path.join(data_dir, os.path.basename(Book.DATA_FILE)), newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for book_id, *_, available in reader:
+            if (available == "True") != (back.get(book_id, "") is not None):
+                problems.append(f"{book_id} availability does not match its open loans")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic library data.")
+    parser.add_argument("--transactions", type=int, default=10000, help="history rows (1k to 10M)")
+    parser.add_argument("--books", type=int, help="catalog size (default: transactions / 10)")
+    parser.add_argument("--members", type=int, help="member count (default: transactions / 20)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=".", help="directory to write data/ into")
+    args = parser.parse_args(argv)
+
+    sizes = generate(args.out, args.transactions, args.books, args.members, args.seed)
+    print(f"✅ {sizes['books']} books, {sizes['members']} members, {sizes['transactions']} transactions "
+          f"({sizes['open_loans']} open) written to {os.path.join(args.out, 'data')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Multi-process stress test for concurrent terminals sharing one data/ dir.
+
+Usage:
+    python -m benchmarks.hammer [--processes 8] [--threads 2] [--ops 200]
+
+Every worker borrows and returns random books as fast as it can against
+a scratch data directory. Afterwards the tables are checked: no book is
+lent twice, transaction IDs are unique, availability matches open loans,
+every successful operation was persisted and the summary counters agree.
+Exits non-zero on failure.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from library.book import Book
+from library.member import Member
+from library.transaction import Transaction
+from library.file_handler import FileHandler
+from library.store import LibraryStore
+from library.concurrency import GroupCommit
+from library.counters import SummaryCounters
+
+
+def seed_data(books, members):
+    """Write a fresh catalog and member list into ./data."""
+    FileHandler.write_csv(Book.DATA_FILE, Book.FIELDNAMES, [
+        {"book_id": f"B{i:03d}", "title": f"Book {i}", "author": "Author", "genre": "Test",
+         "year": "2000", "available": "True"}
+        for i in range(1, books + 1)
+    ])
+    FileHandler.write_csv(Member.DATA_FILE, Member.FIELDNAMES, [
+        {"member_id": f"M{i:03d}", "name": f"Member {i}", "email": f"m{i}@test.org", "phone": "0",
+         "department": "Test", "join_date": "2025-01-01"}
+        for i in range(1, members + 1)
+    ])
+    Transaction.save_transactions([])
+    SummaryCounters.rebuild()
+
+
+def worker(work_dir, seed, ops, threads, books, members, results):
+    os.chdir(work_dir)
+    counts = {"borrowed": 0, "returned": 0}
+    count_lock = threading.Lock()
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        for _ in range(ops):
+            pair = (f"M{rng.randint(1, members):03d}", f"B{rng.randint(1, books):03d}")
+            if rng.random() < 0.5:
+                ok = Transaction.borrow_many([pair])[0]["ok"]
+                key = "borrowed"
+            else:
+                ok = Transaction.return_many([pair])[0]["ok"]
+                key = "returned"
+            if ok:
+                with count_lock:
+                    counts[key] += 1
+
+    pool = [threading.Thread(target=run, args=(seed * 1000 + t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    counts["fsync_requests"] = GroupCommit.requests
+    counts["fsyncs"] = GroupCommit.flushes
+    results.put(counts)
+
+
+def verify(expected_borrows, expected_returns):
+    """Check table invariants; return a list of problems."""
+    LibraryStore.invalidate()
+    problems = []
+    transactions = Transaction.load_transactions()
+    ids = [t.transaction_id for t in transactions]
+    if len(ids) != len(set(ids)):
+        problems.append("duplicate transaction IDs")
+    if len(transactions) != expected_borrows:
+        problems.append(f"{len(transactions)} transactions stored, {expected_borrows} borrows succeeded")
+    returned = sum(1 for t in transactions if t.status == "Returned")
+    if returned != expected_returns:
+        problems.append(f"{returned} returns stored, {expected_returns} returns succeeded")
+
+    open_loans = {}
+    for t in transactions:
+        if t.status == "Borrowed":
+            open_loans[t.book_id] = open_loans.get(t.book_id, 0) + 1
+    for book_id, count in open_loans.items():
+        if count > 1:
+            problems.append(f"{book_id} is lent {count} times")
+    for book in Book.load_books():
+        if book.available == (book.book_id in open_loans):
+            problems.append(f"{book.book_id} availability does not match its open loans")
+    for name, (stored, actual) in SummaryCounters.check().items():
+        problems.append(f"summary counter {name} is {stored}, tables say {actual}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hammer the data layer from many processes.")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=2, help="threads per process")
+    parser.add_argument("--ops", type=int, default=200, help="operations per thread")
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--members", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="library-hammer-")
+    start_dir = os.getcwd()
+    try:
+        os.chdir(work_dir)
+        seed_data(args.books, args.members)
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=worker, args=(work_dir, seed, args.ops, args.threads,
+                                                         args.books, args.members, results))
+            for seed in range(args.processes)
+        ]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        totals = {"borrowed": 0, "returned": 0, "fsync_requests": 0, "fsyncs": 0}
+        for _ in procs:
+            for key, value in results.get().items():
+                totals[key] += value
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        ops = args.processes * args.threads * args.ops
+        print(f"⚙️  {ops} operations from {args.processes} processes × {args.threads} threads "
+              f"in {elapsed:.2f}s ({ops / elapsed:.0f} ops/s)")
+        print(f"   {totals['borrowed']} borrows, {totals['returned']} returns succeeded; "
+              f"{totals['fsync_requests']} fsync requests served by {totals['fsyncs']} fsyncs")
+
+        problems = verify(totals["borrowed"], totals["returned"])
+    finally:
+        os.chdir(start_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+    print("✅ All invariants hold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Load test: the long-running API server versus one CLI process per request.
+
+Usage:
+    python -m benchmarks.loadtest [--transactions 100000] [--concurrency 16]
+                                  [--duration 10] [--cli-requests 40] [--output results.json]
+
+Generates data into a scratch directory (benchmarks.generate), starts
+`python main.py serve` on a free port and drives it with keep-alive
+asyncio clients for --duration seconds. The request mix is the same
+for both sides: search, book lookup, member lookup, overdue, and a
+borrow followed by its return. The same mix is then run as
+`python main.py <subcommand>` processes at the same concurrency.
+Prints requests per second and latency percentiles for both.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import generate, WORDS
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def request_mix(rng, sizes):
+    """Yield endless (kind, args) tuples in a fixed, seeded mix."""
+    while True:
+        roll = rng.random()
+        if roll < 0.5:
+            yield "search", (" ".join(rng.sample(WORDS, 2)),)
+        elif roll < 0.7:
+            yield "book", (f"B{rng.randint(1, sizes['books']):03d}",)
+        elif roll < 0.85:
+            yield "member", (f"M{rng.randint(1, sizes['members']):03d}",)
+        elif roll < 0.9:
+            yield "overdue", ("28",)
+        else:
+            yield "loan", (f"M{rng.randint(1, sizes['members']):03d}", f"B{rng.randint(1, sizes['books']):03d}")
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {}
+    latencies = sorted(latencies)
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+    return {"p50_ms": pick(0.50), "p90_ms": pick(0.90), "p99_ms": pick(0.99),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 3)}
+
+
+# ------------------------
+# Server side
+# ------------------------
+async def http(reader, writer, method, path, body=None):
+    """One keep-alive HTTP/1.1 exchange; return the status code."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n\r\n"
+                 .encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def server_client(port, mix, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            kind, args = next(mix)
+            started = time.perf_counter()
+            if kind == "search":
+                status = await http(reader, writer, "GET", "/books/search?q=" + args[0].replace(" ", "+"))
+            elif kind == "book":
+                status = await http(reader, writer, "GET", f"/books/{args[0]}")
+            elif kind == "member":
+                status = await http(reader, writer, "GET", f"/members/{args[0]}")
+            elif kind == "overdue":
+                status = await http(reader, writer, "GET", f"/overdue?days={args[0]}")
+            else:
+                pair = {"member_id": args[0], "book_id": args[1]}
+                status = await http(reader, writer, "POST", "/borrow", pair)
+                if status == 200:
+                    await http(reader, writer, "POST", "/return", pair)
+            latencies.append(time.perf_counter() - started)
+            if status >= 500:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def run_server(work_dir, sizes, concurrency, duration, seed):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(MAIN)}
+    process = subprocess.Popen([sys.executable, MAIN, "serve", "--port", "0"], cwd=work_dir, env=env,
+                               stderr=subprocess.PIPE, text=True)
+    try:
+        started = time.perf_counter()
+        line = process.stderr.readline()
+        port = int(re.search(r":(\d+)\s*$", line).group(1))
+        warm_up_s = time.perf_counter() - started
+
+        async def drive():
+            latencies, errors = [], []
+            mix = request_mix(random.Random(seed), sizes)
+            deadline = time.perf_counter() + duration
+            began = time.perf_counter()
+            await asyncio.gather(*(server_client(port, mix, deadline, latencies, errors)
+                                   for _ in range(concurrency)))
+            return latencies, errors, time.perf_counter() - began
+
+        latencies, errors, elapsed = asyncio.run(drive())
+    finally:
+        process.terminate()
+        process.wait()
+    return {"requests": len(latencies), "errors": len(errors), "seconds": round(elapsed, 3),
+            "requests_per_s": round(len(latencies) / elapsed, 1), "startup_s": round(warm_up_s, 3),
+            **percentiles(latencies)}
+
+
+# ------------------------
+# CLI side
+# ------------------------
+def cli_commands(kind, args):
+    if kind == "search":
+        return [["search", *args[0].split()]]
+    if kind in ("book", "member"):
+        return [[kind, args[0]]]
+    if kind == "overdue":
+        return [["overdue", "--days", args[0]]]
+    return [["borrow", *args], ["return", *args]]
+
+
+def run_cli(work_dir, sizes, concurrency, count, seed):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(MAIN)}
+    mix = request_mix(random.Random(seed), sizes)
+
+    async def one(semaphore, kind, args, latencies):
+        async with semaphore:
+            started = time.perf_counter()
+            for command in cli_commands(kind, args):
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, MAIN, *command, cwd=work_dir, env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                await process.wait()
+            latencies.append(time.perf_counter() - started)
+
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        began = time.perf_counter()
+        await asyncio.gather(*(one(semaphore, *next(mix), latencies) for _ in range(count)))
+        return latencies, time.perf_counter() - began
+
+    latencies, elapsed = asyncio.run(drive())
+    return {"requests": len(latencies), "seconds": round(elapsed, 3),
+            "requests_per_s": round(len(latencies) / elapsed, 1), **percentiles(latencies)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the API server with per-request CLI processes.")
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=16, help="clients in flight at once")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load on the server")
+    parser.add_argument("--cli-requests", type=int, default=40, help="requests to run through the CLI")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="library-load-")
+    try:
+        sizes = generate(work_dir, args.transactions, seed=args.seed)
+        server = run_server(work_dir, sizes, args.concurrency, args.duration, args.seed)
+        cli = run_cli(work_dir, sizes, args.concurrency, args.cli_requests, args.seed)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"📦 {sizes['transactions']} transactions, {sizes['books']} books, {sizes['members']} members; "
+          f"concurrency {args.concurrency}")
+    print(f"{'':8} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, result in (("server", server), ("cli", cli)):
+        print(f"{name:8} {result['requests']:9} {result['requests_per_s']:9} "
+              f"{result['p50_ms']:9} {result['p99_ms']:9}")
+    print(f"🚀 server is {server['requests_per_s'] / cli['requests_per_s']:.0f}x the CLI throughput "
+          f"({server['errors']} server errors; startup {server['startup_s']}s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"sizes": sizes, "concurrency": args.concurrency, "server": server, "cli": cli}, file, indent=2)
+    return 1 if server["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
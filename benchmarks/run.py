@@ -0,0 +1,231 @@
+"""
+Time every public operation against generated data.
+
+Usage:
+    python -m benchmarks.run [--transactions 100000] [--repeat 5] [--seed 42]
+                             [--output results.json] [--compare baseline.json]
+
+A scratch data directory is filled by benchmarks.generate, then each
+operation is timed once cold (caches dropped, tables parsed from disk),
+--repeat times warm (tables in memory, query results recomputed) and
+--repeat times cached (QueryCache hits allowed). Console output of the
+operations is discarded. Results are written as JSON; --compare prints
+the warm ratio against an earlier run and exits non-zero when an
+operation got slower than --threshold.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import generate, WORDS, FIRST_NAMES, LAST_NAMES, GENRES, DEPARTMENTS
+from library.book import Book
+from library.member import Member
+from library.transaction import Transaction
+from library.report import Report
+from library.query_cache import QueryCache
+from library.store import LibraryStore
+from library.counters import SummaryCounters
+from library.config import Config
+from library.paging import PAGE_SIZE
+
+
+def operations(rng):
+    """Return [(name, callable)] for every public operation, in run order."""
+    available = [b.book_id for b in Book.iter_books() if b.available]
+    member_ids = [m.member_id for m in Member.iter_members()]
+    rng.shuffle(available)
+    loans = [(t.member_id, t.book_id) for t in Transaction.iter_transactions() if t.status == "Borrowed"]
+    registered = iter(range(1, 10**9))
+
+    def borrow():
+        pair = (rng.choice(member_ids), available.pop())
+        loans.append(pair)
+        Transaction.borrow_book(*pair)
+
+    def return_():
+        Transaction.return_book(*loans.pop())
+
+    def register():
+        n = next(registered)
+        Member.register(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                        f"bench.{n}@example.org", "03000000000", rng.choice(DEPARTMENTS))
+
+    return [
+        ("Book.search", lambda: Book.search(" ".join(rng.sample(WORDS, 2)))),
+        ("Book.add_book", lambda: Book.add_book(" ".join(rng.sample(WORDS, 3)), "Bench Author",
+                                                rng.choice(GENRES), "2024")),
+        ("Member.search", lambda: Member.search(rng.choice(LAST_NAMES))),
+        ("Member.register", register),
+        ("Transaction.borrow_book", borrow),
+        ("Transaction.return_book", return_),
+        ("Transaction.overdue_books", lambda: Transaction.overdue_books(7)),
+        ("Book.display_all (one page)", lambda: Book.display_all(0, PAGE_SIZE)),
+        ("Member.display_all (one page)", lambda: Member.display_all(0, PAGE_SIZE)),
+        ("Transaction.view_all (one page)", lambda: Transaction.view_all(0, PAGE_SIZE)),
+        ("Report.total_summary", Report.total_summary),
+        ("Report.most_borrowed_books", Report.most_borrowed_books),
+        ("Report.active_members_report", Report.active_members_report),
+        ("Report.overdue_report", Report.overdue_report),
+        ("Report.department_activity", Report.department_activity),
+        ("Report.borrows_per_period", Report.borrows_per_period),
+        ("Report.average_loan_duration", Report.average_loan_duration),
+        ("Report.export_to_csv", Report.export_to_csv),
+    ]
+
+
+def time_operation(operation, repeat):
+    """
+    Time one cold call, `repeat` warm calls and `repeat` cached calls;
+    return a result dict. Warm calls find the tables in memory but
+    recompute their result (QueryCache is cleared before each), so they
+    measure the operation itself; cached calls may be QueryCache hits.
+    """
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        LibraryStore.invalidate()
+        QueryCache.invalidate()
+        started = time.perf_counter()
+        operation()
+        cold = time.perf_counter() - started
+
+        warm = []
+        for _ in range(repeat):
+            QueryCache.invalidate()
+            started = time.perf_counter()
+            operation()
+            warm.append(time.perf_counter() - started)
+
+        cached = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            cached.append(time.perf_counter() - started)
+    return {
+        "cold_s": round(cold, 6),
+        "warm_min_s": round(min(warm), 6) if warm else None,
+        "warm_median_s": round(statistics.median(warm), 6) if warm else None,
+        "cached_median_s": round(statistics.median(cached), 6) if cached else None,
+        "runs": repeat,
+    }
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git tree."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(transactions, books=None, members=None, seed=42, repeat=5, only=None):
+    """Generate data in a scratch directory, time every operation and return the results."""
+    work_dir = tempfile.mkdtemp(prefix="library-bench-")
+    start_dir = os.getcwd()
+    try:
+        started = time.perf_counter()
+        sizes = generate(work_dir, transactions, books, members, seed)
+        generate_s = time.perf_counter() - started
+        os.chdir(work_dir)
+        if Config.BACKEND == "sqlite":
+            from library.migrate import migrate_csv_to_sqlite
+            migrate_csv_to_sqlite()
+        # Setup, not measured: the first write would otherwise pay for it
+        SummaryCounters.rebuild()
+
+        results = {}
+        for name, operation in operations(random.Random(seed)):
+            if only and name not in only:
+                continue
+            results[name] = time_operation(operation, repeat)
+            print(f"⏱️  {name:32} cold {results[name]['cold_s']:9.4f}s   "
+                  f"warm {results[name]['warm_median_s']:9.4f}s   "
+                  f"cached {results[name]['cached_median_s']:9.4f}s", file=sys.stderr)
+    finally:
+        os.chdir(start_dir)
+        LibraryStore.invalidate()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": Config.BACKEND,
+            "analytics": Config.ANALYTICS,
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": sizes,
+            "generate_s": round(generate_s, 3),
+        },
+        "operations": results,
+    }
+
+
+# Differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_S = 0.001
+
+
+def compare(current, baseline, threshold):
+    """Print current/baseline ratios; return the names slower than threshold."""
+    slower = []
+    print(f"\n{'operation':32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in current["operations"].items():
+        before = baseline.get("operations", {}).get(name)
+        if not before:
+            print(f"{name:32} {'-':>10} {result['warm_median_s']:10.4f}")
+            continue
+        ratio = result["warm_median_s"] / max(before["warm_median_s"], 1e-9)
+        flag = ""
+        if ratio > threshold and result["warm_median_s"] - before["warm_median_s"] > NOISE_FLOOR_S:
+            slower.append(name)
+            flag = "  ❌ slower"
+        print(f"{name:32} {before['warm_median_s']:10.4f} {result['warm_median_s']:10.4f} {ratio:6.2f}x{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every public operation on synthetic data.")
+    parser.add_argument("--transactions", type=int, default=100000, help="history rows (1k to 10M)")
+    parser.add_argument("--books", type=int, help="catalog size (default: transactions / 10)")
+    parser.add_argument("--members", type=int, help="member count (default: transactions / 20)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="warm (and cached) runs per operation")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="time only these operations")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="ratio above which --compare reports a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.transactions, args.books, args.members, args.seed, args.repeat, args.only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"📁 Results written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        with contextlib.redirect_stdout(sys.stderr):
+            slower = compare(results, baseline, args.threshold)
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
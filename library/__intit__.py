@@ -10,7 +10,16 @@ Modules:
  - member.py        → Member data model & operations
  - transaction.py  → Borrowing & returning logic
  - report.py        → Reports and summaries
- - file_handler.py  → File I/O operations
+ - file_handler.py  → File I/O operations (delegates to a backend)
+ - backends.py      → CSV and SQLite storage backends
+ - config.py        → Runtime configuration (backend selection)
+ - concurrency.py   → Multi-terminal file locking and group commit
+ - migrate.py       → One-shot CSV → SQLite migration
+ - journal.py       → Append-only borrow/return event log
+ - store.py         → In-memory table cache (mtime/size invalidation)
+ - search_index.py  → Inverted index for ranked catalog search
+ - counters.py      → Persisted O(1) summary counters
+ - overdue_index.py → Open loans ordered by borrow date
 
 Usage Example:
 --------------
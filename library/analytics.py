@@ -0,0 +1,168 @@
+"""
+Analytics engines behind the Report aggregations.
+
+PythonAnalytics  → streams Transaction objects with dict/loop counting
+ColumnarAnalytics → loads transactions once into NumPy columns
+                    (categorical codes for ids, day numbers for dates)
+                    and answers with bincount/unique/argsort
+
+NumPy is optional: Report uses the columnar engine only when it can be
+imported (or when LIBRARY_ANALYTICS=numpy). Both engines return exactly
+the same results.
+"""
+
+from datetime import date
+from library.config import Config
+from library.store import LibraryStore
+from library.transaction import Transaction
+
+np = None
+
+
+def load_numpy():
+    """Import NumPy on first use; return None if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+class PythonAnalytics:
+    """Pure-Python aggregations over a stream of transactions."""
+
+    name = "python"
+
+    def __init__(self, transactions=None):
+        # A zero-argument callable so every query can re-stream the table
+        self.__transactions = transactions or Transaction.iter_transactions
+
+    def top_books(self, top_n):
+        """[(book_id, count)] by count desc (all books if top_n is None); ties keep first-borrowed order."""
+        borrow_counts = {}
+        for t in self.__transactions():
+            borrow_counts[t.book_id] = borrow_counts.get(t.book_id, 0) + 1
+        return sorted(borrow_counts.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+    def department_activity(self, departments):
+        """[(department, borrows)] by borrows desc, then department name."""
+        counts = {}
+        for t in self.__transactions():
+            dept = departments.get(t.member_id, "Unknown")
+            counts[dept] = counts.get(dept, 0) + 1
+        return sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+
+    def borrows_per_period(self, period="month"):
+        """[(YYYY-MM or YYYY, borrows)] in chronological order."""
+        width = 7 if period == "month" else 4
+        counts = {}
+        for t in self.__transactions():
+            key = t.borrow_date[:width]
+            counts[key] = counts.get(key, 0) + 1
+        return sorted(counts.items())
+
+    def average_loan_duration(self):
+        """Mean days between borrow and return over returned loans (None if none)."""
+        total = 0
+        count = 0
+        for t in self.__transactions():
+            if t.return_date:
+                total += (date.fromisoformat(t.return_date) - date.fromisoformat(t.borrow_date)).days
+                count += 1
+        return total / count if count else None
+
+
+class ColumnarAnalytics:
+    """
+    Transactions as NumPy columns, built once per table version and
+    cached in LibraryStore. Member and book ids become integer codes
+    (np.unique), dates become datetime64 day numbers.
+    """
+
+    name = "numpy"
+
+    def __init__(self, transactions):
+        np = load_numpy()
+        member_ids, book_ids, borrow_dates, return_dates = [], [], [], []
+        for t in transactions:
+            member_ids.append(t.member_id)
+            book_ids.append(t.book_id)
+            borrow_dates.append(t.borrow_date)
+            return_dates.append(t.return_date or "")
+        self.size = len(book_ids)
+
+        # Categorical codes; first-occurrence index keeps tie order stable
+        self.book_keys, self.book_first, self.book_codes = np.unique(
+            np.array(book_ids, dtype=str), return_index=True, return_inverse=True)
+        self.member_keys, self.member_codes = np.unique(
+            np.array(member_ids, dtype=str), return_inverse=True)
+
+        # Day numbers ("" → NaT for open loans)
+        self.borrow_days = np.array(borrow_dates, dtype="datetime64[D]")
+        self.return_days = np.array(return_dates, dtype="datetime64[D]")
+
+    @classmethod
+    def available(cls):
+        return load_numpy() is not None
+
+    @classmethod
+    def for_transactions(cls):
+        """Columnar view of the current transactions table (cached, built by streaming)."""
+        return LibraryStore.view("transactions", Transaction._paths(), "columnar",
+                                 lambda: cls(Transaction.iter_transactions()))
+
+    # ------------------------
+    # Aggregations
+    # ------------------------
+    def top_books(self, top_n):
+        if not self.size:
+            return []
+        counts = np.bincount(self.book_codes, minlength=len(self.book_keys))
+        order = np.lexsort((self.book_first, -counts))[:top_n]
+        return [(str(self.book_keys[i]), int(counts[i])) for i in order]
+
+    def department_activity(self, departments):
+        if not self.size:
+            return []
+        member_depts = np.array([departments.get(m, "Unknown") for m in self.member_keys.tolist()], dtype=str)
+        dept_keys, dept_of_member = np.unique(member_depts, return_inverse=True)
+        counts = np.bincount(dept_of_member[self.member_codes], minlength=len(dept_keys))
+        # dept_keys is sorted, so index order breaks ties by name
+        order = np.lexsort((np.arange(len(dept_keys)), -counts))
+        return [(str(dept_keys[i]), int(counts[i])) for i in order if counts[i]]
+
+    def borrows_per_period(self, period="month"):
+        if not self.size:
+            return []
+        unit = "datetime64[M]" if period == "month" else "datetime64[Y]"
+        keys, counts = np.unique(self.borrow_days.astype(unit), return_counts=True)
+        return [(str(k), int(c)) for k, c in zip(keys, counts)]
+
+    def average_loan_duration(self):
+        returned = ~np.isnat(self.return_days)
+        count = int(returned.sum())
+        if not count:
+            return None
+        total = int((self.return_days[returned] - self.borrow_days[returned]).astype(np.int64).sum())
+        return total / count
+
+
+def engine(transactions=None):
+    """
+    Return the analytics engine selected by Config (auto: NumPy if
+    installed), over the transactions table or, if given, over a list of
+    already loaded transactions.
+    """
+    choice = Config.ANALYTICS
+    if choice == "numpy" or (choice == "auto" and ColumnarAnalytics.available()):
+        if not ColumnarAnalytics.available():
+            raise ImportError("LIBRARY_ANALYTICS=numpy but NumPy is not installed")
+        if transactions is not None:
+            return ColumnarAnalytics(transactions)
+        return ColumnarAnalytics.for_transactions()
+    if transactions is not None:
+        return PythonAnalytics(lambda: transactions)
+    return PythonAnalytics()
@@ -0,0 +1,97 @@
+"""
+JSON-ready queries and commands shared by the CLI subcommands and the
+HTTP server. Every function returns plain dicts/lists with JSON types
+(year as an int, available as a bool, no return date as null). Models are
+imported inside each function so a caller only loads what it uses.
+"""
+
+REPORTS = ["summary", "top", "departments", "periods", "duration"]
+
+
+# ------------------------
+# Serializers: JSON types, not the CSV row form of to_dict()
+# ------------------------
+def _book_json(book):
+    return {"book_id": book.book_id, "title": book.title, "author": book.author,
+            "genre": book.genre, "year": book.year, "available": book.available}
+
+
+def _member_json(member):
+    return {"member_id": member.member_id, "name": member.name, "email": member.email,
+            "phone": member.phone, "department": member.department, "join_date": member.join_date}
+
+
+def _transaction_json(t):
+    return {"transaction_id": t.transaction_id, "member_id": t.member_id, "book_id": t.book_id,
+            "borrow_date": t.borrow_date, "return_date": t.return_date or None, "status": t.status}
+
+
+def search_books(keyword):
+    """Books matching every term of keyword, best match first."""
+    from library.book import Book
+    return [_book_json(b) for b in Book.search_results(keyword)]
+
+
+def get_book(book_id):
+    """One book, or None."""
+    from library.book import Book
+    book = Book.get(book_id)
+    return _book_json(book) if book else None
+
+
+def get_member(member_id):
+    """One member with their open loans, or None."""
+    from library.member import Member
+    from library.transaction import Transaction
+    member = Member.get(member_id)
+    if member is None:
+        return None
+    loans = [_transaction_json(t) for t in Transaction.open_loans().for_member(member_id)]
+    return {**_member_json(member), "loans": loans}
+
+
+def borrow(pairs):
+    """Borrow each (member_id, book_id); one result dict per pair."""
+    from library.transaction import Transaction
+    return Transaction.borrow_many(pairs)
+
+
+def return_books(pairs):
+    """Return each (member_id, book_id); one result dict per pair."""
+    from library.transaction import Transaction
+    return Transaction.return_many(pairs)
+
+
+def overdue(days_limit=7):
+    """Open loans older than days_limit, oldest first, with days elapsed."""
+    from datetime import date
+    from library.transaction import Transaction
+    from library.overdue_index import OpenLoanIndex
+    today = date.today().toordinal()
+    return [
+        {**_transaction_json(t), "days": today - OpenLoanIndex.ordinal(t.borrow_date)}
+        for t in Transaction.overdue(days_limit)
+    ]
+
+
+def report(name, top_n=5, period="month"):
+    """One of REPORTS as JSON-ready data (rows from the query cache)."""
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report: {name}")
+    from library.report import Report
+    if name == "summary":
+        return Report.summary()
+    if name == "top":
+        return [{"book_id": book_id, "title": title, "borrows": count}
+                for book_id, title, count in Report.top_books(top_n)]
+    if name == "departments":
+        return [{"department": dept, "borrows": count} for dept, count in Report.department_rows()]
+    if name == "periods":
+        return [{"period": key, "borrows": count} for key, count in Report.period_rows(period)]
+    return {"average_loan_days": Report.average_duration()}
+
+
+def cache_stats():
+    """Query cache counters: hits, misses, hit_rate, evictions, entries, ..."""
+    from library.query_cache import QueryCache
+    return QueryCache.stats()
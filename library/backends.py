@@ -0,0 +1,286 @@
+import csv
+import os
+
+
+def _as_rows(fieldnames, data_list):
+    """Convert dict rows to sequences in fieldnames order ("" for missing)."""
+    for data in data_list:
+        yield [data.get(name) or "" for name in fieldnames]
+
+
+class CSVBackend:
+    """
+    Stores each table as a flat CSV file (the original layout).
+    Rewrites go through a temp file + rename so a crash never leaves a
+    truncated table; appends are fsynced by the caller (group commit).
+    """
+
+    name = "csv"
+    needs_sync = True
+
+    def initialize(self, file_path, fieldnames=None):
+        """Ensure file exists with header."""
+        # Make sure folder exists
+        if not os.path.exists(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # If fieldnames not provided, create empty file
+            with open(file_path, 'w', newline='', encoding='utf-8') as file:
+                if fieldnames:
+                    writer = csv.DictWriter(file, fieldnames=fieldnames)
+                    writer.writeheader()
+
+    def iter(self, file_path, fieldnames=None):
+        """Yield CSV rows as dicts one at a time (streaming)."""
+        self.initialize(file_path, fieldnames)
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            # Automatically read headers if not provided
+            if fieldnames:
+                reader = csv.DictReader(file, fieldnames=fieldnames)
+                next(reader, None)  # skip header row if given manually
+            else:
+                reader = csv.DictReader(file)
+
+            yield from reader
+
+    def iter_rows(self, file_path, fieldnames):
+        """Yield CSV rows as plain lists in fieldnames order (no per-row dict)."""
+        self.initialize(file_path, fieldnames)
+        width = len(fieldnames)
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)  # skip header row
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                yield row
+
+    def read(self, file_path, fieldnames=None):
+        """Read CSV and return list of dicts."""
+        return list(self.iter(file_path, fieldnames))
+
+    def write(self, file_path, fieldnames, data_list):
+        """Write list of dicts to CSV atomically (temp file + rename)."""
+        self.write_rows(file_path, fieldnames, _as_rows(fieldnames, data_list))
+
+    def write_rows(self, file_path, fieldnames, rows):
+        """Write rows (sequences in fieldnames order) atomically (temp file + rename)."""
+        self.initialize(file_path, fieldnames)
+        previous = self._mtime(file_path)
+        folder = os.path.dirname(file_path) or "."
+        import tempfile     # on first write only: keeps read-only CLI startup lean
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=folder)
+        try:
+            # mkstemp creates the file 0600; keep the table readable by other desks' users
+            os.fchmod(fd, self._file_mode(file_path))
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(fieldnames)
+                writer.writerows(rows)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._advance_mtime(file_path, previous)
+
+    def append(self, file_path, fieldnames, data_list):
+        """Append list of dicts to the end of a CSV (no rewrite)."""
+        self.append_rows(file_path, fieldnames, _as_rows(fieldnames, data_list))
+
+    def append_rows(self, file_path, fieldnames, rows):
+        """Append rows (sequences in fieldnames order) to the end of a CSV."""
+        self.initialize(file_path, fieldnames)
+        previous = self._mtime(file_path)
+        with open(file_path, 'a', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+        self._advance_mtime(file_path, previous)
+
+    @staticmethod
+    def _file_mode(file_path):
+        """Permission bits of the existing table, or what a plain open() would create."""
+        try:
+            return os.stat(file_path).st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    @staticmethod
+    def _mtime(file_path):
+        try:
+            return os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _advance_mtime(file_path, previous):
+        """
+        Make sure every write moves mtime forward, even within one clock
+        tick, so other processes' caches always notice the change.
+        """
+        stat = os.stat(file_path)
+        if previous is not None and stat.st_mtime_ns <= previous:
+            os.utime(file_path, ns=(stat.st_atime_ns, previous + 1))
+
+    def exists(self, file_path):
+        """True if the table has been created."""
+        return os.path.exists(file_path)
+
+    def signature(self, file_path):
+        """Identify the current on-disk state of a table (inode, mtime, size)."""
+        try:
+            stat = os.stat(file_path)
+            return (os.path.abspath(file_path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return (os.path.abspath(file_path), None, None, None)
+
+
+class SQLiteBackend:
+    """
+    Stores each table in a SQLite database (stdlib sqlite3).
+    A table is named after its CSV file ("data/books.csv" → books) and
+    keeps the same columns, so models work unchanged on either backend.
+    """
+
+    name = "sqlite"
+    needs_sync = False  # SQLite commits are durable on their own
+
+    # Columns that get an index wherever they appear
+    INDEXED_COLUMNS = ("book_id", "member_id", "transaction_id", "status")
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.__connection = None
+
+    # ------------------------
+    # Connection & Schema
+    # ------------------------
+    def connection(self):
+        """Open the database lazily (one connection per backend)."""
+        if self.__connection is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            import sqlite3  # only needed when the SQLite backend is selected
+            self.__connection = sqlite3.connect(self.db_path, timeout=30)
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS _table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            self.__connection.commit()
+        return self.__connection
+
+    def close(self):
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    @staticmethod
+    def table_name(file_path):
+        """Map a CSV path to its table name: data/books.csv → books."""
+        return os.path.splitext(os.path.basename(file_path))[0]
+
+    def _exists(self, table):
+        row = self.connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
+    def _columns(self, table):
+        return [r[1] for r in self.connection().execute(f'PRAGMA table_info("{table}")')]
+
+    def initialize(self, file_path, fieldnames=None):
+        """Ensure the table (and its indexes) exists."""
+        table = self.table_name(file_path)
+        if not fieldnames or self._exists(table):
+            return
+        conn = self.connection()
+        columns = ", ".join(f'"{name}" TEXT NOT NULL DEFAULT \'\'' for name in fieldnames)
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+        for column in fieldnames:
+            if column in self.INDEXED_COLUMNS:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON "{table}" ("{column}")')
+        conn.commit()
+
+    def _bump_version(self, table):
+        self.connection().execute(
+            "INSERT INTO _table_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1", (table,)
+        )
+
+    # ------------------------
+    # Table Operations
+    # ------------------------
+    def iter(self, file_path, fieldnames=None):
+        """Yield the rows of a table as dicts, streaming from a cursor."""
+        self.initialize(file_path, fieldnames)
+        table = self.table_name(file_path)
+        if not self._exists(table):
+            return
+        columns = fieldnames or self._columns(table)
+        select = ", ".join(f'"{name}"' for name in columns)
+        cursor = self.connection().execute(f'SELECT {select} FROM "{table}" ORDER BY rowid')
+        for row in cursor:
+            yield dict(zip(columns, row))
+
+    def iter_rows(self, file_path, fieldnames):
+        """Yield the rows of a table as tuples in fieldnames order."""
+        self.initialize(file_path, fieldnames)
+        table = self.table_name(file_path)
+        if not self._exists(table):
+            return
+        select = ", ".join(f'"{name}"' for name in fieldnames)
+        yield from self.connection().execute(f'SELECT {select} FROM "{table}" ORDER BY rowid')
+
+    def read(self, file_path, fieldnames=None):
+        """Return all rows of a table as a list of dicts (insertion order)."""
+        return list(self.iter(file_path, fieldnames))
+
+    def write(self, file_path, fieldnames, data_list):
+        """Replace the contents of a table."""
+        self.write_rows(file_path, fieldnames, _as_rows(fieldnames, data_list))
+
+    def write_rows(self, file_path, fieldnames, rows):
+        """Replace the contents of a table with rows in fieldnames order."""
+        self.initialize(file_path, fieldnames)
+        table = self.table_name(file_path)
+        conn = self.connection()
+        with conn:
+            conn.execute(f'DELETE FROM "{table}"')
+            self._insert(table, fieldnames, rows)
+            self._bump_version(table)
+
+    def append(self, file_path, fieldnames, data_list):
+        """Insert rows at the end of a table."""
+        self.append_rows(file_path, fieldnames, _as_rows(fieldnames, data_list))
+
+    def append_rows(self, file_path, fieldnames, rows):
+        """Insert rows (in fieldnames order) at the end of a table."""
+        self.initialize(file_path, fieldnames)
+        table = self.table_name(file_path)
+        conn = self.connection()
+        with conn:
+            self._insert(table, fieldnames, rows)
+            self._bump_version(table)
+
+    def _insert(self, table, fieldnames, rows):
+        columns = ", ".join(f'"{name}"' for name in fieldnames)
+        placeholders = ", ".join("?" for _ in fieldnames)
+        self.connection().executemany(
+            f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})', rows
+        )
+
+    def exists(self, file_path):
+        """True if the table has been created."""
+        return self._exists(self.table_name(file_path))
+
+    def signature(self, file_path):
+        """Identify the current state of a table by its write version."""
+        table = self.table_name(file_path)
+        row = self.connection().execute(
+            "SELECT version FROM _table_versions WHERE name = ?", (table,)
+        ).fetchone()
+        return (os.path.abspath(self.db_path), table, row[0] if row else 0)
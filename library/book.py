@@ -1,5 +1,13 @@
 import os
 from library.file_handler import FileHandler
+from library.journal import TransactionJournal
+from library.store import LibraryStore
+from library.query_cache import QueryCache
+from library.search_index import CatalogIndex
+from library.counters import SummaryCounters
+from library.sequences import IdSequence
+from library.paging import PAGE_SIZE, paginate, print_page
+from library.snapshot import Snapshot
 
 class Book:
     """
@@ -9,18 +17,32 @@ class Book:
 
     DATA_FILE = "data/books.csv"
     FIELDNAMES = ["book_id", "title", "author", "genre", "year", "available"]
+    SNAPSHOT_TYPES = {"year": "int", "available": "bool"}
+
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("__book_id", "__title", "__author", "__genre", "__year", "__available")
 
     # ------------------------
     # Constructor
     # ------------------------
     def __init__(self, book_id, title, author, genre, year, available=True):
         self.__book_id = book_id
-        self.__title = title.strip().title()
-        self.__author = author.strip().title()
-        self.__genre = genre.strip().title()
-        self.__year = int(year)
+        self.__title, self.__author, self.__genre, self.__year = Book.normalize(title, author, genre, year)
         self.__available = available if isinstance(available, bool) else str(available).lower() == "true"
 
+    @staticmethod
+    def normalize(title, author, genre, year):
+        """Canonical (title, author, genre, year) as stored; ValueError on a bad year."""
+        return title.strip().title(), author.strip().title(), genre.strip().title(), int(year)
+
+    @classmethod
+    def _restore(cls, book_id, title, author, genre, year, available):
+        """Rebuild a stored (already normalized) book, skipping __init__ (binary snapshot)."""
+        book = cls.__new__(cls)
+        book.__book_id, book.__title, book.__author = book_id, title, author
+        book.__genre, book.__year, book.__available = genre, year, available
+        return book
+
     # ------------------------
     # Properties (Encapsulation)
     # ------------------------
@@ -69,79 +91,158 @@ class Book:
             "available": "True" if self.__available else "False"
         }
 
+    def to_row(self):
+        """Convert Book object to a CSV row (FIELDNAMES order), no dict."""
+        return (self.__book_id, self.__title, self.__author, self.__genre,
+                self.__year, "True" if self.__available else "False")
+
+    def line(self):
+        """One-line description used by display() and paged listings."""
+        status = "Available ✅" if self.__available else "Borrowed ❌"
+        return f"[{self.__book_id}] {self.__title} by {self.__author} ({self.__year}) | {self.__genre} | {status}"
+
     def display(self):
         """Display book details."""
-        status = "Available ✅" if self.__available else "Borrowed ❌"
-        print(f"[{self.__book_id}] {self.__title} by {self.__author} ({self.__year}) | {self.__genre} | {status}")
+        print(self.line())
 
     # ------------------------
     # Class-Level Operations
     # ------------------------
+    @classmethod
+    def _paths(cls):
+        """Files backing the book table: books.csv + the journal of loans not yet folded into it."""
+        return [cls.DATA_FILE, TransactionJournal.DATA_FILE]
+
     @classmethod
     def load_books(cls):
-        """Load all books from CSV using FileHandler."""
-        data = FileHandler.read_csv(cls.DATA_FILE, cls.FIELDNAMES)
-        books = []
-        for row in data:
-            books.append(Book(
-                row["book_id"],
-                row["title"],
-                row["author"],
-                row["genre"],
-                row["year"],
-                row["available"]
-            ))
+        """Load all books (served from LibraryStore, parsed only on change)."""
+        return LibraryStore.load("books", cls._paths(), cls._read_books)
+
+    @classmethod
+    def get(cls, book_id):
+        """Look up a single book by ID via the primary-key index."""
+        return LibraryStore.index("books", cls._paths(), cls._read_books, "book_id").get(book_id)
+
+    @classmethod
+    def iter_books(cls):
+        """Yield books one at a time (streamed unless already cached)."""
+        return LibraryStore.iter("books", cls._paths(), cls._stream_books)
+
+    @classmethod
+    def _stream_books(cls):
+        """Books from the binary snapshot if current, else parsed from CSV lazily (loans applied)."""
+        pending = TransactionJournal.availability()
+        rows = Snapshot.rows(cls.DATA_FILE, cls._on_loan(cls._restore, pending))
+        return rows if rows is not None else cls._parse_books(pending)
+
+    @classmethod
+    def _parse_books(cls, pending=None):
+        """Parse books from CSV lazily using FileHandler (availability from pending, if given)."""
+        build = cls._on_loan(Book, pending)
+        for book_id, title, author, genre, year, available in FileHandler.iter_rows(cls.DATA_FILE, cls.FIELDNAMES):
+            yield build(book_id, title, author, genre, year, available)
+
+    @staticmethod
+    def _on_loan(factory, pending):
+        """factory with each book's availability taken from pending ({book_id: available}) when listed."""
+        if not pending:
+            return factory
+
+        def build(*row):
+            book = factory(*row)
+            available = pending.get(book.book_id)
+            if available is not None:
+                book.available = available
+            return book
+        return build
+
+    @classmethod
+    def existing_ids(cls):
+        """Stream the stored book IDs (seeds the ID sequence)."""
+        return (row[0] for row in FileHandler.iter_rows(cls.DATA_FILE, cls.FIELDNAMES))
+
+    @classmethod
+    def _read_books(cls):
+        """
+        All books: mapped from the binary snapshot, or parsed from CSV (and
+        re-snapshotted), with the availability of books lent or returned
+        since the last compaction taken from the journal.
+        """
+        pending = TransactionJournal.availability()
+        rows = Snapshot.rows(cls.DATA_FILE, cls._on_loan(cls._restore, pending))
+        if rows is not None:
+            return rows
+        # The snapshot mirrors books.csv, so loans are applied after it is written
+        books = Snapshot.load(cls.DATA_FILE, cls.FIELDNAMES, cls.SNAPSHOT_TYPES, cls._restore, cls._parse_books)
+        if pending:
+            for book in books:
+                available = pending.get(book.book_id)
+                if available is not None:
+                    book.available = available
         return books
 
     @classmethod
     def save_books(cls, books):
-        """Save all books to CSV using FileHandler."""
-        data_list = [b.to_dict() for b in books]
-        FileHandler.write_csv(cls.DATA_FILE, cls.FIELDNAMES, data_list)
+        """Save all books to CSV (and its snapshot) using FileHandler."""
+        rows = [b.to_row() for b in books]
+        FileHandler.write_rows(cls.DATA_FILE, cls.FIELDNAMES, rows)
+        if Snapshot.enabled():
+            Snapshot.write(cls.DATA_FILE, cls.FIELDNAMES, cls.SNAPSHOT_TYPES, rows)
+        LibraryStore.store("books", cls._paths(), books)
 
     # ------------------------
     # Functional Methods
     # ------------------------
     @classmethod
     def add_book(cls, title, author, genre, year):
-        """Add a new book."""
-        books = cls.load_books()
-        new_id = f"B{len(books)+1:03d}"
-        new_book = Book(new_id, title, author, genre, year)
-        books.append(new_book)
-        cls.save_books(books)
+        """Add a new book (ID from the sequence, row appended, index updated in place)."""
+        # Validate first: a bad year must not use up an ID
+        fields = Book.normalize(title, author, genre, year)
+        with FileHandler.lock():
+            new_id = f"B{IdSequence.next('books', cls.existing_ids):03d}"
+            new_book = Book(new_id, *fields)
+            cached = LibraryStore.is_fresh("books", cls._paths())
+            FileHandler.append_rows(cls.DATA_FILE, cls.FIELDNAMES, [new_book.to_row()])
+            if cached:
+                LibraryStore.append("books", cls._paths(), [new_book])
+            else:
+                LibraryStore.invalidate("books")
+            SummaryCounters.increment(total_books=1)
         print(f"✅ Book '{title}' added successfully with ID {new_id}.")
 
     @classmethod
-    def search(cls, keyword):
-        """Search books by title or author."""
-        books = cls.load_books()
-        result = [b for b in books if keyword.lower() in b.title.lower() or keyword.lower() in b.author.lower()]
-        if not result:
-            print("⚠️ No matching books found.")
-        else:
-            print(f"\n🔍 Search results for '{keyword}':")
-            for b in result:
-                b.display()
+    def catalog_index(cls):
+        """Return the inverted search index, built once per catalog load."""
+        return LibraryStore.derived("books", cls._paths(), cls._read_books, "catalog", CatalogIndex)
 
     @classmethod
-    def display_all(cls):
-        """Display all books."""
-        books = cls.load_books()
-        if not books:
-            print("📚 No books found in the library.")
-        else:
-            print("\n=== All Books in Library ===")
-            for b in books:
-                b.display()
+    def page(cls, offset=0, limit=PAGE_SIZE, available_only=False):
+        """One page of books in catalog order; only that page is materialised."""
+        predicate = (lambda b: b.available) if available_only else None
+        return LibraryStore.page("books", cls._paths(), cls._read_books, cls._stream_books,
+                                 offset, limit, predicate)
 
     @classmethod
-    def available_books(cls):
-        """Display only available books."""
-        books = [b for b in cls.load_books() if b.available]
-        if not books:
-            print("❌ No available books at the moment.")
-        else:
-            print("\n=== Available Books ===")
-            for b in books:
-                b.display()
+    def search_results(cls, keyword):
+        """Books matching every term of keyword, best match first (cached until the catalog changes)."""
+        return QueryCache.get("book_search", (keyword,), {"books": cls._paths()},
+                              lambda: cls.catalog_index().search(keyword))
+
+    @classmethod
+    def search(cls, keyword, offset=0, limit=None):
+        """Search books by title, author or genre (prefix, all terms, ranked)."""
+        result = cls.search_results(keyword)
+        return print_page(paginate(result, offset, limit, len(result)),
+                          f"\n🔍 Search results for '{keyword}':", "⚠️ No matching books found.")
+
+    @classmethod
+    def display_all(cls, offset=0, limit=None):
+        """Display all books (or one page of them); return the Page shown."""
+        return print_page(cls.page(offset, limit), "\n=== All Books in Library ===",
+                          "📚 No books found in the library.")
+
+    @classmethod
+    def available_books(cls, offset=0, limit=None):
+        """Display only available books (or one page of them); return the Page shown."""
+        return print_page(cls.page(offset, limit, available_only=True), "\n=== Available Books ===",
+                          "❌ No available books at the moment.")
@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+from library.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LibraryLock:
+    """
+    Library-wide advisory lock shared by every terminal using data/.
+    Writers take it exclusively, readers take it shared. It is reentrant
+    within a thread, so a batch operation can hold it across its own
+    reads and writes. Appends made while it is held are fsynced through
+    GroupCommit only after it is released, so other writers can proceed
+    while the flush is in progress.
+    """
+
+    _thread_lock = threading.RLock()
+    _depth = 0
+    _mode = None
+    _file = None
+    _dirty = {}     # path -> position (inode, size) after our last append
+
+    # ------------------------
+    # OS-Level Locking
+    # ------------------------
+    @classmethod
+    def _os_lock(cls, exclusive):
+        if fcntl is not None:
+            fcntl.flock(cls._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            # msvcrt has no shared mode: every lock is exclusive
+            cls._file.seek(0)
+            msvcrt.locking(cls._file.fileno(), msvcrt.LK_LOCK, 1)
+
+    @classmethod
+    def _os_unlock(cls):
+        if fcntl is not None:
+            fcntl.flock(cls._file.fileno(), fcntl.LOCK_UN)
+        else:
+            cls._file.seek(0)
+            msvcrt.locking(cls._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    # ------------------------
+    # Acquire / Release
+    # ------------------------
+    @classmethod
+    def acquire(cls, exclusive=True):
+        cls._thread_lock.acquire()
+        try:
+            if cls._depth == 0:
+                folder = os.path.dirname(Config.LOCK_FILE)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                cls._file = open(Config.LOCK_FILE, "a+b")
+                cls._os_lock(exclusive)
+                cls._mode = "exclusive" if exclusive else "shared"
+            elif exclusive and cls._mode == "shared":
+                # Upgrade a shared hold (e.g. a write issued mid-read)
+                cls._os_lock(True)
+                cls._mode = "exclusive"
+        except BaseException:
+            if cls._depth == 0 and cls._file is not None:
+                cls._file.close()
+                cls._file = None
+            cls._thread_lock.release()
+            raise
+        cls._depth += 1
+
+    @classmethod
+    def release(cls):
+        cls._depth -= 1
+        dirty = {}
+        if cls._depth == 0:
+            cls._os_unlock()
+            cls._file.close()
+            cls._file = None
+            cls._mode = None
+            dirty, cls._dirty = cls._dirty, {}
+        cls._thread_lock.release()
+        # Durability outside the lock: concurrent committers share one fsync
+        for path, position in dirty.items():
+            GroupCommit.sync(path, position)
+
+    @classmethod
+    def defer_sync(cls, path):
+        """Queue an fsync of path (up to its current end) for when the outermost lock is released."""
+        cls._dirty[path] = GroupCommit.position(path)
+
+    # ------------------------
+    # Context Manager
+    # ------------------------
+    def __init__(self, exclusive=True):
+        self.exclusive = exclusive
+
+    def __enter__(self):
+        LibraryLock.acquire(self.exclusive)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        LibraryLock.release()
+        return False
+
+
+class GroupCommit:
+    """
+    Group commit for appended files, across threads and processes.
+    An append's end position (inode, size) is noted while the library
+    lock is held; once the lock is released the writer waits until the
+    file is on disk up to there. One fsync per file runs at a time:
+    threads queue on a condition, processes on an flock over a small
+    ledger next to the lock file, which records how far the last fsync
+    reached. Every writer whose bytes that fsync covered returns without
+    issuing its own, so desks appending together share one flush.
+    """
+
+    LEDGER_FILE = Config.LOCK_FILE + ".sync"
+
+    _cond = threading.Condition()
+    _state = {}     # path -> {"wanted": position, "synced": position, "running": bool}
+    requests = 0
+    flushes = 0
+
+    @staticmethod
+    def position(path):
+        """(inode, size) of path: where the append just made ends."""
+        stat = os.stat(path)
+        return (stat.st_ino, stat.st_size)
+
+    @staticmethod
+    def _covers(reached, position):
+        # A position in a replaced file is covered too: rewrites are fsynced before the rename
+        return reached is not None and (reached[0] != position[0] or reached[1] >= position[1])
+
+    @classmethod
+    def sync(cls, path, position):
+        """Block until path is on disk up to position (from position() right after the append)."""
+        with cls._cond:
+            cls.requests += 1
+            state = cls._state.setdefault(path, {"wanted": None, "synced": None, "running": False})
+            if state["wanted"] is None or state["wanted"][0] != position[0] or state["wanted"][1] < position[1]:
+                state["wanted"] = position
+            while not (state["synced"] is not None and cls._covers(state["synced"], position)):
+                if not state["running"]:
+                    break
+                cls._cond.wait()
+            else:
+                return
+            # Become the leader: this flush covers every request so far
+            state["running"] = True
+            target = state["wanted"]
+
+        reached = None
+        try:
+            reached = cls._flush(path, target)
+        finally:
+            with cls._cond:
+                state["running"] = False
+                if reached is not None:
+                    state["synced"] = reached
+                cls._cond.notify_all()
+
+    @classmethod
+    def _flush(cls, path, target):
+        """fsync path unless another process's fsync already reached target; return the position reached."""
+        if fcntl is None:   # no shared ledger: flush for this process alone
+            cls._fsync(path)
+            return target
+        with open(cls.LEDGER_FILE, "a+") as ledger:
+            fcntl.flock(ledger.fileno(), fcntl.LOCK_EX)
+            ledger.seek(0)
+            try:
+                reached = json.loads(ledger.read() or "{}")
+            except ValueError:
+                reached = {}
+            key = os.path.abspath(path)
+            done = reached.get(key)
+            if done is not None and cls._covers(done, target):
+                return tuple(done)
+            try:
+                current = cls.position(path)
+            except FileNotFoundError:
+                return target
+            if current[0] != target[0]:
+                return target   # replaced since (and the rewrite was fsynced)
+            cls._fsync(path)
+            reached[key] = current
+            ledger.seek(0)
+            ledger.truncate()
+            ledger.write(json.dumps(reached))
+            return current
+
+    @classmethod
+    def _fsync(cls, path):
+        with open(path, "rb") as file:
+            os.fsync(file.fileno())
+        with cls._cond:
+            cls.flushes += 1
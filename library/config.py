@@ -0,0 +1,23 @@
+import os
+
+
+class Config:
+    """
+    Runtime configuration, read from environment variables.
+
+    LIBRARY_BACKEND   → storage backend: "csv" (default) or "sqlite"
+    LIBRARY_DB        → SQLite database file (default: data/library.db)
+    LIBRARY_LOCK      → lock file shared by all terminals (default: data/.library.lock)
+    LIBRARY_ANALYTICS → report engine: "auto" (NumPy if installed), "numpy" or "python"
+    LIBRARY_SNAPSHOTS → "on" (default): keep binary table snapshots next to the CSVs; "off"
+    LIBRARY_QUERY_CACHE     → query results kept in the LRU cache (default 256; 0 disables it)
+    LIBRARY_QUERY_CACHE_TTL → seconds a cached query result stays valid (default 300)
+    """
+
+    BACKEND = os.environ.get("LIBRARY_BACKEND", "csv").strip().lower()
+    SQLITE_PATH = os.environ.get("LIBRARY_DB", "data/library.db")
+    LOCK_FILE = os.environ.get("LIBRARY_LOCK", "data/.library.lock")
+    ANALYTICS = os.environ.get("LIBRARY_ANALYTICS", "auto").strip().lower()
+    SNAPSHOTS = os.environ.get("LIBRARY_SNAPSHOTS", "on").strip().lower()
+    QUERY_CACHE_SIZE = int(os.environ.get("LIBRARY_QUERY_CACHE", "256"))
+    QUERY_CACHE_TTL = float(os.environ.get("LIBRARY_QUERY_CACHE_TTL", "300"))
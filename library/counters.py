@@ -0,0 +1,157 @@
+"""
+Persisted summary counters for the dashboard report.
+
+Usage:
+    python -m library.counters            # show stored counters
+    python -m library.counters --check    # compare with the raw tables
+    python -m library.counters --rebuild  # recount from the raw tables
+"""
+
+import sys
+from library.file_handler import FileHandler
+
+
+class SummaryCounters:
+    """
+    Library-wide totals, never recounted from the full tables for a
+    summary. Book and member totals are stored and kept up to date by
+    add_book, register and the importer. Loan totals are read from the
+    transaction partition manifest plus the journal, so a borrow or
+    return has nothing to rewrite here.
+    """
+
+    DATA_FILE = "data/summary.csv"
+    FIELDNAMES = ["counter", "value"]
+    COUNTERS = ["total_books", "total_members", "total_transactions", "borrowed_books", "returned_books"]
+    STORED = ["total_books", "total_members"]
+
+    # ------------------------
+    # Reading
+    # ------------------------
+    @classmethod
+    def _read(cls):
+        """Return stored counters, or None if missing/incomplete."""
+        rows = FileHandler.read_csv(cls.DATA_FILE, cls.FIELDNAMES)
+        counters = {}
+        for row in rows:
+            try:
+                counters[row["counter"]] = int(row["value"])
+            except (TypeError, ValueError):
+                return None
+        if any(name not in counters for name in cls.STORED):
+            return None
+        return {name: counters[name] for name in cls.STORED}
+
+    @staticmethod
+    def _loan_counters():
+        # Imported here: the models import this module to update counters
+        from library.transaction import Transaction
+        total, open_loans = Transaction.loan_counts()
+        return {"total_transactions": total, "borrowed_books": open_loans, "returned_books": total - open_loans}
+
+    @classmethod
+    def load(cls):
+        """Return every counter, rebuilding the stored ones first if never stored."""
+        counters = cls._read()
+        if counters is None:
+            return cls.rebuild()
+        counters.update(cls._loan_counters())
+        return {name: counters[name] for name in cls.COUNTERS}
+
+    # ------------------------
+    # Writing
+    # ------------------------
+    @classmethod
+    def _write(cls, counters):
+        FileHandler.write_rows(cls.DATA_FILE, cls.FIELDNAMES,
+                               [(name, counters[name]) for name in cls.STORED])
+
+    @classmethod
+    def increment(cls, **deltas):
+        """
+        Apply deltas to stored counters (e.g. total_books=1) after a table write.
+        If no counters were stored yet, they are rebuilt from the tables,
+        which already include that write.
+        """
+        with FileHandler.lock():
+            counters = cls._read()
+            if counters is None:
+                cls.rebuild()
+                return
+            for name, delta in deltas.items():
+                counters[name] += delta
+            cls._write(counters)
+
+    # ------------------------
+    # Rebuild / Consistency Check
+    # ------------------------
+    @classmethod
+    def compute(cls):
+        """Recount every counter from the raw tables (single streaming pass each)."""
+        # Imported here: the models import this module to update counters
+        from library.book import Book
+        from library.member import Member
+        from library.transaction import Transaction
+
+        counters = dict.fromkeys(cls.COUNTERS, 0)
+        for book in Book.iter_books():
+            counters["total_books"] += 1
+            if not book.available:
+                counters["borrowed_books"] += 1
+        for _ in Member.iter_members():
+            counters["total_members"] += 1
+        for t in Transaction.iter_transactions():
+            counters["total_transactions"] += 1
+            if t.status == "Returned":
+                counters["returned_books"] += 1
+        return counters
+
+    @classmethod
+    def rebuild(cls):
+        """Recount from the raw tables and persist the stored counters; return all of them."""
+        with FileHandler.lock():
+            counters = cls.compute()
+            cls._write(counters)
+        return counters
+
+    @classmethod
+    def check(cls):
+        """Return {counter: (stored, actual)} for every counter that drifted (loan totals: per the manifest)."""
+        with FileHandler.lock(exclusive=False):
+            stored = cls._read() or {}
+            stored.update(cls._loan_counters())
+            actual = cls.compute()
+        return {name: (stored.get(name), actual[name])
+                for name in cls.COUNTERS if stored.get(name) != actual[name]}
+
+
+def main(argv=None):
+    import argparse     # CLI only: this module is imported by every model
+    parser = argparse.ArgumentParser(description="Inspect, check or rebuild the summary counters.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="compare stored counters with the tables")
+    group.add_argument("--rebuild", action="store_true", help="recount counters from the tables")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        counters = SummaryCounters.rebuild()
+        print("✅ Counters rebuilt from the tables.")
+    elif args.check:
+        drift = SummaryCounters.check()
+        if not drift:
+            print("✅ Counters are consistent with the tables.")
+            return 0
+        for name, (stored, actual) in drift.items():
+            print(f"❌ {name:20} stored={stored} actual={actual}")
+        print("Run with --rebuild to fix.")
+        return 1
+    else:
+        counters = SummaryCounters.load()
+
+    for name in SummaryCounters.COUNTERS:
+        print(f"{name:20} {counters[name]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Persisted unique index on normalized member email, with a Bloom filter.
+
+data/member_emails.csv   email,member_id for every member (append-only)
+data/member_emails.bloom fixed-size JSON header + Bloom filter bits
+
+Registering checks the Bloom filter first: "definitely new" (the usual
+case) needs neither members.csv nor the email table. Only a possible hit
+consults the exact index. The header records the signatures of
+members.csv and the email table (inode, mtime, size; no paths, so it
+fits whatever directory data/ is in) as of the last update; if either
+changed behind the index's back, both files are rebuilt from members.csv.
+
+Usage:
+    python -m library.email_index --rebuild
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+from collections import namedtuple
+from library.file_handler import FileHandler
+from library.store import LibraryStore
+
+EmailEntry = namedtuple("EmailEntry", ["email", "member_id"])
+
+
+def normalize_email(email):
+    """Comparison key for an email: trimmed and case-folded."""
+    return (email or "").strip().casefold()
+
+
+class BloomFilter:
+    """Bit array with k hash positions per key (double hashing over blake2b)."""
+
+    def __init__(self, size_bits, hashes, bits=None):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.bits = bits if bits is not None else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01):
+        """Size for capacity keys at error_rate false positives (~9.6 bits/key at 1%)."""
+        size_bits = max(1024, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size_bits / max(capacity, 1) * math.log(2)))
+        return cls(size_bits, hashes)
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hashes)]
+
+    def add(self, key):
+        """Set key's bits; return the byte offsets that changed."""
+        changed = []
+        for position in self.positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                changed.append(byte)
+        return changed
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self.positions(key))
+
+
+class MemberEmailIndex:
+    """Unique normalized-email index for members (see module docstring)."""
+
+    DATA_FILE = "data/member_emails.csv"
+    FIELDNAMES = ["email", "member_id"]
+    BLOOM_FILE = "data/member_emails.bloom"
+    HEADER_SIZE = 512
+    MIN_CAPACITY = 1024
+
+    _header = None      # raw header bytes of the cached filter
+    _meta = None
+    _bloom = None
+
+    # ------------------------
+    # Signatures / Bloom File
+    # ------------------------
+    @staticmethod
+    def _signature(path):
+        # Without the leading absolute path, which would make the header's
+        # size depend on where data/ lives; the file name is implied anyway.
+        # JSON round-trip so stored and live signatures compare equal.
+        return json.loads(json.dumps(list(FileHandler.signature(path))[1:]))
+
+    @classmethod
+    def _members_file(cls):
+        from library.member import Member    # member.py imports this module
+        return Member.DATA_FILE
+
+    @classmethod
+    def _read_header(cls):
+        try:
+            with open(cls.BLOOM_FILE, "rb") as file:
+                return file.read(cls.HEADER_SIZE)
+        except OSError:
+            return None
+
+    @classmethod
+    def _encode_header(cls, meta):
+        header = json.dumps(meta).encode("utf-8")
+        if len(header) >= cls.HEADER_SIZE:
+            raise ValueError("email index header too large")
+        return header + b" " * (cls.HEADER_SIZE - len(header) - 1) + b"\n"
+
+    @classmethod
+    def _load(cls):
+        """Return (meta, bloom) for the current file, re-reading only if it changed."""
+        header = cls._read_header()
+        if header is None:
+            return None, None
+        if header != cls._header:
+            try:
+                meta = json.loads(header)
+                with open(cls.BLOOM_FILE, "rb") as file:
+                    file.seek(cls.HEADER_SIZE)
+                    bits = bytearray(file.read())
+            except (OSError, ValueError):
+                return None, None
+            if len(bits) != (meta["size_bits"] + 7) // 8:
+                return None, None
+            cls._header, cls._meta = header, meta
+            cls._bloom = BloomFilter(meta["size_bits"], meta["hashes"], bits)
+        return cls._meta, cls._bloom
+
+    @classmethod
+    def _write_bloom(cls, meta, bloom):
+        """Replace the whole Bloom file (temp file + rename; derivable, so no fsync)."""
+        folder = os.path.dirname(cls.BLOOM_FILE) or "."
+        os.makedirs(folder, exist_ok=True)
+        temp_path = os.path.join(folder, f".tmp-{os.getpid()}-member_emails.bloom")
+        header = cls._encode_header(meta)
+        with open(temp_path, "wb") as file:
+            file.write(header)
+            file.write(bloom.bits)
+        os.replace(temp_path, cls.BLOOM_FILE)
+        cls._header, cls._meta, cls._bloom = header, meta, bloom
+
+    # ------------------------
+    # Rebuild / Freshness
+    # ------------------------
+    @classmethod
+    def rebuild(cls):
+        """Rebuild the email table and Bloom filter from members.csv."""
+        from library.member import Member
+        with FileHandler.lock():
+            entries = {}
+            for member_id, _, email, *_ in FileHandler.iter_rows(Member.DATA_FILE, Member.FIELDNAMES):
+                key = normalize_email(email)
+                if key and key not in entries:
+                    entries[key] = member_id
+            FileHandler.write_rows(cls.DATA_FILE, cls.FIELDNAMES, entries.items())
+            LibraryStore.invalidate("member_emails")
+
+            # Twice the current size, so appends rarely force a rebuild
+            capacity = max(cls.MIN_CAPACITY, 2 * len(entries))
+            bloom = BloomFilter.for_capacity(capacity)
+            for key in entries:
+                bloom.add(key)
+            cls._write_bloom(cls._meta_for(bloom, len(entries), capacity), bloom)
+        return len(entries)
+
+    @classmethod
+    def _meta_for(cls, bloom, count, capacity):
+        return {
+            "size_bits": bloom.size_bits,
+            "hashes": bloom.hashes,
+            "count": count,
+            "capacity": capacity,
+            "members": cls._signature(cls._members_file()),
+            "emails": cls._signature(cls.DATA_FILE),
+        }
+
+    @classmethod
+    def _current(cls):
+        """(meta, bloom) in sync with members.csv, rebuilding if needed."""
+        meta, bloom = cls._load()
+        if (meta is None
+                or meta["members"] != cls._signature(cls._members_file())
+                or meta["emails"] != cls._signature(cls.DATA_FILE)):
+            cls.rebuild()
+            meta, bloom = cls._load()
+        return meta, bloom
+
+    # ------------------------
+    # Queries / Updates
+    # ------------------------
+    @classmethod
+    def _entries(cls):
+        return [EmailEntry(email, member_id)
+                for email, member_id in FileHandler.iter_rows(cls.DATA_FILE, cls.FIELDNAMES)]
+
+    @classmethod
+    def find(cls, email):
+        """member_id registered with this email (any case), or None."""
+        return cls.find_many([email])[0]
+
+    @classmethod
+    def find_many(cls, emails):
+        """find() for a batch: one freshness check, then a Bloom probe per email."""
+        _, bloom = cls._current()
+        found = []
+        index = None
+        for email in emails:
+            key = normalize_email(email)
+            if not key or key not in bloom:
+                found.append(None)  # definitely new: no table read at all
+                continue
+            if index is None:
+                index = LibraryStore.index("member_emails", [cls.DATA_FILE], cls._entries, "email")
+            entry = index.get(key)
+            found.append(entry.member_id if entry else None)
+        return found
+
+    @classmethod
+    def add_many(cls, pairs):
+        """
+        Record (email, member_id) pairs just appended to members.csv.
+        Call under the same library lock as the find() checks, after the
+        member rows are written.
+        """
+        meta, bloom = cls._load()
+        entries = [EmailEntry(normalize_email(email), member_id) for email, member_id in pairs]
+        entries = [entry for entry in entries if entry.email]
+        # members.csv just changed (the caller's append), so only the email
+        # table is checked; the caller held the lock since its find() calls.
+        # A rebuild reads members.csv, which already has the new rows.
+        if (meta is None or meta["emails"] != cls._signature(cls.DATA_FILE)
+                or meta["count"] + len(entries) > meta["capacity"]):
+            cls.rebuild()
+            return
+
+        cached = LibraryStore.is_fresh("member_emails", [cls.DATA_FILE])
+        FileHandler.append_rows(cls.DATA_FILE, cls.FIELDNAMES, entries)
+        if cached:
+            LibraryStore.append("member_emails", [cls.DATA_FILE], entries)
+        else:
+            LibraryStore.invalidate("member_emails")
+
+        # Bits first, header last: a crash in between leaves a stale
+        # header, which triggers a rebuild instead of a false "new"
+        changed = set()
+        for entry in entries:
+            changed.update(bloom.add(entry.email))
+        meta = {**meta, "count": meta["count"] + len(entries),
+                "members": cls._signature(cls._members_file()), "emails": cls._signature(cls.DATA_FILE)}
+        header = cls._encode_header(meta)
+        with open(cls.BLOOM_FILE, "r+b") as file:
+            for byte in sorted(changed):
+                file.seek(cls.HEADER_SIZE + byte)
+                file.write(bloom.bits[byte:byte + 1])
+            file.seek(0)
+            file.write(header)
+        cls._header, cls._meta = header, meta
+
+
+def main(argv=None):
+    import argparse     # CLI only: this module is imported by the models
+    parser = argparse.ArgumentParser(description="Rebuild the member email index.")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild from members.csv")
+    args = parser.parse_args(argv)
+    if args.rebuild:
+        count = MemberEmailIndex.rebuild()
+        print(f"✅ Email index rebuilt: {count} unique emails.")
+    else:
+        meta, _ = MemberEmailIndex._current()
+        print(f"{meta['count']} emails indexed, Bloom filter {meta['size_bits']} bits × {meta['hashes']} hashes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
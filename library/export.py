@@ -0,0 +1,266 @@
+"""
+Month-end report pack: every report, plus per-department and per-genre
+breakdowns, exported to one CSV each.
+
+Usage:
+    python -m library.export [--output-dir data/reports] [--workers N] [--days 7] [--only NAME ...]
+    python main.py export [...]
+
+The tables are loaded once, in the parent, into a Dataset. The reports
+then run concurrently in a process pool: forked workers inherit that
+Dataset (copy-on-write), so every report sees the same snapshot of the
+library and none of them re-reads the files. Borrow counts, loan
+durations and overdue cuts come from the same code as the Report
+screens (library.analytics, OpenLoanIndex). Each worker writes its own
+CSV (temp file + rename) and times itself; timings.csv lists every
+report's rows and wall-clock seconds.
+"""
+
+import csv
+import gc
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+from datetime import date
+
+Dataset = namedtuple("Dataset", ["books", "members", "transactions", "counters", "today", "days_limit"])
+
+OUTPUT_DIR = "data/reports"
+TIMINGS_FILE = "timings.csv"
+
+_dataset = None     # set in the parent before the pool forks
+_analytics = None   # (dataset, engine): the analytics engine built over it, see _engine()
+
+
+# ------------------------
+# Loading
+# ------------------------
+def load_dataset(days_limit=7):
+    """Read every table once (through LibraryStore) into a Dataset."""
+    from library.book import Book
+    from library.member import Member
+    from library.transaction import Transaction
+    from library.counters import SummaryCounters
+    return Dataset(Book.load_books(), Member.load_members(), Transaction.load_transactions(),
+                   SummaryCounters.load(), date.today().toordinal(), days_limit)
+
+
+def _engine(data):
+    """
+    The engine behind the Report aggregations, over the Dataset's
+    transactions. Built once per Dataset and shared by every report in
+    the process (and, when built before the pool forks, by the workers).
+    """
+    global _analytics
+    if _analytics is None or _analytics[0] is not data:
+        from library import analytics
+        _analytics = (data, analytics.engine(data.transactions))
+    return _analytics[1]
+
+
+def _open_loans(data):
+    return [t for t in data.transactions if t.status == "Borrowed"]
+
+
+def _overdue_loans(data):
+    """Overdue open loans, oldest first: the same index and cut as Transaction.overdue."""
+    from library.overdue_index import OpenLoanIndex
+    return OpenLoanIndex(data.transactions).borrowed_before(data.today - data.days_limit + 1)
+
+
+# ------------------------
+# Reports: each returns (header, rows)
+# ------------------------
+def summary_report(data):
+    """Counters plus loan totals derived from the history."""
+    average = _engine(data).average_loan_duration()
+    rows = list(data.counters.items())
+    rows.append(("overdue_loans", len(_overdue_loans(data))))
+    rows.append(("average_loan_days", round(average, 2) if average is not None else ""))
+    return ["metric", "value"], rows
+
+
+def most_borrowed_report(data):
+    """Every borrowed book by borrow count (ties: first borrowed first)."""
+    books = {b.book_id: b for b in data.books}
+    rows = []
+    for book_id, count in _engine(data).top_books(None):
+        book = books.get(book_id)
+        rows.append((book_id, book.title if book else "Unknown", book.author if book else "",
+                     book.genre if book else "", count))
+    return ["book_id", "title", "author", "genre", "borrows"], rows
+
+
+def active_members_report(data):
+    """Members with at least one open loan."""
+    open_counts = Counter(t.member_id for t in _open_loans(data))
+    rows = [(m.member_id, m.name, m.department, open_counts[m.member_id])
+            for m in data.members if m.member_id in open_counts]
+    return ["member_id", "name", "department", "open_loans"], rows
+
+
+def overdue_report(data):
+    """Overdue open loans, oldest first."""
+    members = {m.member_id: m for m in data.members}
+    books = {b.book_id: b for b in data.books}
+    rows = []
+    for t in _overdue_loans(data):
+        member = members.get(t.member_id)
+        book = books.get(t.book_id)
+        days = data.today - date.fromisoformat(t.borrow_date).toordinal()
+        rows.append((t.transaction_id, t.member_id, member.name if member else "Unknown",
+                     t.book_id, book.title if book else "Unknown", t.borrow_date, days))
+    return ["transaction_id", "member_id", "member_name", "book_id", "title", "borrow_date", "days"], rows
+
+
+def department_report(data):
+    """Per department: members, borrows, open and overdue loans, returns."""
+    departments = {m.member_id: m.department for m in data.members}
+    members = Counter(departments.values())
+    borrows = Counter(dict(_engine(data).department_activity(departments)))
+    open_loans, returned = Counter(), Counter()
+    for t in data.transactions:
+        if t.status == "Borrowed":
+            open_loans[departments.get(t.member_id, "Unknown")] += 1
+        elif t.return_date:
+            returned[departments.get(t.member_id, "Unknown")] += 1
+    overdue = Counter(departments.get(t.member_id, "Unknown") for t in _overdue_loans(data))
+    active = Counter(departments.get(m, "Unknown") for m in {t.member_id for t in _open_loans(data)})
+    rows = [(dept, members[dept], active[dept], borrows[dept], open_loans[dept], overdue[dept], returned[dept])
+            for dept in sorted(members.keys() | borrows.keys(), key=lambda d: (-borrows[d], d))]
+    return ["department", "members", "active_members", "borrows", "open_loans", "overdue_loans", "returned"], rows
+
+
+def genre_report(data):
+    """Per genre: catalog size, available copies, borrows, open and overdue loans."""
+    genres = {b.book_id: b.genre for b in data.books}
+    books = Counter(genres.values())
+    available = Counter(b.genre for b in data.books if b.available)
+    borrows = Counter()
+    for book_id, count in _engine(data).top_books(None):
+        borrows[genres.get(book_id, "Unknown")] += count
+    open_loans = Counter(genres.get(t.book_id, "Unknown") for t in _open_loans(data))
+    overdue = Counter(genres.get(t.book_id, "Unknown") for t in _overdue_loans(data))
+    rows = [(genre, books[genre], available[genre], borrows[genre], open_loans[genre], overdue[genre])
+            for genre in sorted(books.keys() | borrows.keys(), key=lambda g: (-borrows[g], g))]
+    return ["genre", "books", "available", "borrows", "open_loans", "overdue_loans"], rows
+
+
+def borrows_per_month_report(data):
+    """Borrows per YYYY-MM, in chronological order."""
+    return ["month", "borrows"], _engine(data).borrows_per_period("month")
+
+
+REPORTS = {
+    "summary": summary_report,
+    "most_borrowed": most_borrowed_report,
+    "active_members": active_members_report,
+    "overdue": overdue_report,
+    "departments": department_report,
+    "genres": genre_report,
+    "borrows_per_month": borrows_per_month_report,
+}
+ENGINE_REPORTS = {"summary", "most_borrowed", "departments", "genres", "borrows_per_month"}
+
+
+# ------------------------
+# Running
+# ------------------------
+def write_csv(path, header, rows):
+    """Write one report CSV atomically (temp file + rename)."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    temp_path = os.path.join(folder, f".tmp-{os.getpid()}-{os.path.basename(path)}")
+    with open(temp_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(temp_path, path)
+
+
+def run_report(name, output_dir, days_limit=7):
+    """Worker: build report name from the shared Dataset and write it; return its timing row."""
+    global _dataset
+    if _dataset is None:    # not forked from export_reports (spawn start method)
+        _dataset = load_dataset(days_limit)
+    started = time.perf_counter()
+    header, rows = REPORTS[name](_dataset)
+    path = os.path.join(output_dir, f"{name}.csv")
+    write_csv(path, header, rows)
+    return {"report": name, "file": path, "rows": len(rows), "seconds": round(time.perf_counter() - started, 4)}
+
+
+def _pool(workers):
+    from concurrent.futures import ProcessPoolExecutor
+    # fork hands every worker the parent's Dataset without pickling it
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def export_reports(output_dir=OUTPUT_DIR, workers=None, days_limit=7, names=None):
+    """
+    Write every report in names (default: all of REPORTS) to output_dir
+    and return a summary dict: output_dir, workers, load_seconds,
+    seconds (wall clock) and one timing dict per report.
+    """
+    global _dataset, _analytics
+    names = list(names or REPORTS)
+    unknown = [name for name in names if name not in REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(names)))
+
+    started = time.perf_counter()
+    _dataset = load_dataset(days_limit)
+    if workers > 1 and ENGINE_REPORTS.intersection(names):
+        _engine(_dataset)   # once, in the parent, instead of once per worker
+    loaded = time.perf_counter()
+    try:
+        if workers == 1:
+            timings = [run_report(name, output_dir, days_limit) for name in names]
+        else:
+            # Freeze the loaded objects out of the collector so a worker's
+            # GC passes do not touch (and so copy) the shared pages
+            gc.freeze()
+            try:
+                with _pool(workers) as pool:
+                    timings = list(pool.map(run_report, names, [output_dir] * len(names),
+                                             [days_limit] * len(names)))
+            finally:
+                gc.unfreeze()
+    finally:
+        _dataset = _analytics = None
+
+    seconds = round(time.perf_counter() - started, 4)
+    write_csv(os.path.join(output_dir, TIMINGS_FILE), ["report", "file", "rows", "seconds"],
+              [(t["report"], t["file"], t["rows"], t["seconds"]) for t in timings]
+              + [("(load)", "", "", round(loaded - started, 4)), ("(total wall clock)", "", "", seconds)])
+    return {"output_dir": output_dir, "workers": workers, "load_seconds": round(loaded - started, 4),
+            "seconds": seconds, "reports": timings}
+
+
+def main(argv=None):
+    import argparse     # CLI only: main.py imports this module for `export`
+    parser = argparse.ArgumentParser(description="Export every report to CSV, in parallel.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"folder for the CSVs (default {OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, help="report processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--days", type=int, default=7, help="overdue limit in days (default 7)")
+    parser.add_argument("--only", nargs="+", choices=list(REPORTS), metavar="NAME", help="export only these reports")
+    args = parser.parse_args(argv)
+
+    try:
+        result = export_reports(args.output_dir, args.workers, args.days, args.only)
+    except OSError as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+    for t in result["reports"]:
+        print(f"{t['report']:18} {t['rows']:>8} rows  {t['seconds']:>8.3f}s  {t['file']}")
+    print(f"📁 {len(result['reports'])} reports exported to {result['output_dir']} in {result['seconds']}s "
+          f"({result['workers']} workers, {result['load_seconds']}s loading).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,114 @@
-import csv
-import os
+from library.backends import CSVBackend, SQLiteBackend
+from library.concurrency import LibraryLock
+from library.config import Config
 
 class FileHandler:
-    """Reusable CSV file handler for reading and writing."""
+    """
+    Reusable table handler for reading and writing.
+    Delegates to the configured storage backend (CSV files by default,
+    or SQLite); callers always address tables by their CSV path.
+    Reads take the library lock shared and writes take it exclusively,
+    so several terminals can share one data/ directory.
+    """
 
+    _backend = None
+
+    # ------------------------
+    # Backend Selection
+    # ------------------------
+    @staticmethod
+    def backend():
+        """Return the active storage backend (created from Config on first use)."""
+        if FileHandler._backend is None:
+            if Config.BACKEND == "sqlite":
+                FileHandler._backend = SQLiteBackend(Config.SQLITE_PATH)
+            elif Config.BACKEND == "csv":
+                FileHandler._backend = CSVBackend()
+            else:
+                raise ValueError(f"Unknown storage backend: {Config.BACKEND}")
+        return FileHandler._backend
+
+    @staticmethod
+    def use_backend(backend):
+        """Switch the storage backend at runtime (e.g. for migrations)."""
+        FileHandler._backend = backend
+
+    @staticmethod
+    def lock(exclusive=True):
+        """
+        Library-wide lock for read-modify-write sequences, e.g.:
+            with FileHandler.lock():
+                books = Book.load_books(); ...; Book.save_books(books)
+        """
+        return LibraryLock(exclusive)
+
+    # ------------------------
+    # Table Operations
+    # ------------------------
     @staticmethod
     def initialize_csv(file_path, fieldnames=None):
-        """Ensure file exists with header."""
-        # Make sure folder exists
-        if not os.path.exists(file_path):
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            # If fieldnames not provided, create empty file
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                if fieldnames:
-                    writer = csv.DictWriter(file, fieldnames=fieldnames)
-                    writer.writeheader()
+        """Ensure file exists with header (locking exclusively only to create it)."""
+        backend = FileHandler.backend()
+        if backend.exists(file_path):
+            return
+        with LibraryLock():
+            backend.initialize(file_path, fieldnames)   # re-checks under the lock
 
     @staticmethod
-    def read_csv(file_path, fieldnames=None):
-        """Read CSV and return list of dicts."""
+    def iter_csv(file_path, fieldnames=None):
+        """Yield CSV rows as dicts one at a time, without building a list."""
         FileHandler.initialize_csv(file_path, fieldnames)
-        data = []
-        with open(file_path, 'r', newline='', encoding='utf-8') as file:
-            # Automatically read headers if not provided
-            if fieldnames:
-                reader = csv.DictReader(file, fieldnames=fieldnames)
-                next(reader, None)  # skip header row if given manually
-            else:
-                reader = csv.DictReader(file)
+        with LibraryLock(exclusive=False):
+            yield from FileHandler.backend().iter(file_path, fieldnames)
+
+    @staticmethod
+    def iter_rows(file_path, fieldnames):
+        """Yield rows as plain sequences in fieldnames order (fast path, no dicts)."""
+        FileHandler.initialize_csv(file_path, fieldnames)
+        with LibraryLock(exclusive=False):
+            yield from FileHandler.backend().iter_rows(file_path, fieldnames)
 
-            for row in reader:
-                data.append(row)
-        return data
+    @staticmethod
+    def read_csv(file_path, fieldnames=None):
+        """Read CSV and return list of dicts."""
+        return list(FileHandler.iter_csv(file_path, fieldnames))
 
     @staticmethod
     def write_csv(file_path, fieldnames, data_list):
-        """Write list of dicts to CSV."""
-        FileHandler.initialize_csv(file_path, fieldnames)
-        with open(file_path, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data_list)
+        """Write list of dicts to CSV (atomically replaces the table)."""
+        with LibraryLock():
+            FileHandler.backend().write(file_path, fieldnames, data_list)
+
+    @staticmethod
+    def write_rows(file_path, fieldnames, rows):
+        """Write rows given as sequences in fieldnames order (atomically)."""
+        with LibraryLock():
+            FileHandler.backend().write_rows(file_path, fieldnames, rows)
+
+    @staticmethod
+    def append_rows(file_path, fieldnames, rows):
+        """Append rows given as sequences in fieldnames order (no rewrite)."""
+        backend = FileHandler.backend()
+        with LibraryLock():
+            backend.append_rows(file_path, fieldnames, rows)
+            if backend.needs_sync:
+                LibraryLock.defer_sync(file_path)
+
+    @staticmethod
+    def append_csv(file_path, fieldnames, data_list):
+        """Append list of dicts to the end of a CSV (no rewrite)."""
+        backend = FileHandler.backend()
+        with LibraryLock():
+            backend.append(file_path, fieldnames, data_list)
+            if backend.needs_sync:
+                LibraryLock.defer_sync(file_path)
+
+    @staticmethod
+    def exists(file_path):
+        """True if the table exists (reading a missing table creates it empty)."""
+        return FileHandler.backend().exists(file_path)
+
+    @staticmethod
+    def signature(file_path):
+        """Return a value that changes whenever the table changes."""
+        return FileHandler.backend().signature(file_path)
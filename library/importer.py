@@ -0,0 +1,216 @@
+"""
+Bulk catalog import from a vendor CSV or JSON-lines file.
+
+Usage:
+    python -m library.importer FILE [--workers N] [--chunk-size 10000] [--dry-run]
+    python main.py import FILE [...]
+
+The input is streamed in chunks of raw records (CSV with a header row
+naming title, author, genre and year; or one JSON object per line).
+A process pool normalizes each chunk exactly as Book does (trimmed,
+title-cased, integer year) while the next chunks are being read.
+A record whose (title, author) is already in the catalog, or earlier
+in the same file, is skipped. Each chunk of new books gets one ID block
+from IdSequence and one append to books.csv, all under the library
+lock: the table is never re-read or rewritten, and re-running an
+interrupted import skips whatever already landed.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from operator import itemgetter
+from library.book import Book
+from library.file_handler import FileHandler
+from library.store import LibraryStore
+from library.counters import SummaryCounters
+from library.sequences import IdSequence
+
+FIELDS = ["title", "author", "genre", "year"]
+JSON_SUFFIXES = (".jsonl", ".ndjson", ".json")
+CHUNK_SIZE = 10000
+
+
+# ------------------------
+# Reading
+# ------------------------
+def _csv_records(path):
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in FIELDS if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(missing)}")
+        positions = [header.index(name) for name in FIELDS]
+        pick, width = itemgetter(*positions), max(positions) + 1
+        for row in reader:
+            if len(row) >= width:
+                yield pick(row)
+            elif row:
+                yield tuple(row[i] if i < len(row) else "" for i in positions)  # short row
+
+
+def _jsonl_records(path):
+    with open(path, "r", encoding="utf-8-sig") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            if isinstance(record, dict):
+                yield tuple(str(record.get(name, "")) for name in FIELDS)
+            else:
+                yield None
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield lists of raw (title, author, genre, year) tuples; None marks an unparseable line."""
+    records = _jsonl_records(path) if path.lower().endswith(JSON_SUFFIXES) else _csv_records(path)
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ------------------------
+# Normalizing
+# ------------------------
+def normalize_chunk(records):
+    """Worker: return (rows, invalid) with rows normalized via Book.normalize."""
+    rows = []
+    invalid = 0
+    normalize = Book.normalize
+    for record in records:
+        try:
+            row = normalize(*record)
+        except (TypeError, ValueError):
+            invalid += 1
+            continue
+        if not row[0] or not row[1]:
+            invalid += 1
+            continue
+        rows.append(row)
+    return rows, invalid
+
+
+def normalized_chunks(chunks, workers):
+    """normalize_chunk over chunks, in order; at most 2 × workers chunks in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield normalize_chunk(chunk)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(normalize_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ------------------------
+# Importing
+# ------------------------
+def import_catalog(path, workers=None, chunk_size=CHUNK_SIZE, dry_run=False, progress=None):
+    """
+    Import every new book from path; return a summary dict (read,
+    imported, duplicates, invalid, first_id, last_id, seconds,
+    records_per_s). progress, if given, is called with that dict
+    after each chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    stats = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0,
+             "first_id": None, "last_id": None, "seconds": 0.0, "records_per_s": 0.0}
+
+    with FileHandler.lock():
+        seen = {(b.title, b.author) for b in Book.iter_books()}
+        try:
+            for rows, invalid in normalized_chunks(read_chunks(path, chunk_size), workers):
+                new_rows = []
+                for row in rows:
+                    key = row[:2]
+                    if key in seen:
+                        stats["duplicates"] += 1
+                        continue
+                    seen.add(key)
+                    new_rows.append(row)
+
+                if new_rows and not dry_run:
+                    first = IdSequence.allocate("books", len(new_rows), Book.existing_ids)
+                    FileHandler.append_rows(Book.DATA_FILE, Book.FIELDNAMES, (
+                        (f"B{first + offset:03d}", title, author, genre, year, "True")
+                        for offset, (title, author, genre, year) in enumerate(new_rows)
+                    ))
+                    SummaryCounters.increment(total_books=len(new_rows))
+                    stats["first_id"] = stats["first_id"] or f"B{first:03d}"
+                    stats["last_id"] = f"B{first + len(new_rows) - 1:03d}"
+
+                stats["read"] += len(rows) + invalid
+                stats["imported"] += len(new_rows)
+                stats["invalid"] += invalid
+                stats["seconds"] = round(time.perf_counter() - started, 3)
+                stats["records_per_s"] = round(stats["read"] / max(stats["seconds"], 1e-9))
+                if progress:
+                    progress(stats)
+        finally:
+            if stats["imported"]:
+                LibraryStore.invalidate("books")
+    return stats
+
+
+def progress_printer(interval=1.0):
+    """
+    Progress callback for the CLI, printing to stderr at most every
+    interval seconds (one self-overwriting line on a terminal).
+    """
+    start, end = ("\r", "") if sys.stderr.isatty() else ("", "\n")
+    last = [0.0]
+
+    def report(stats):
+        if stats["seconds"] - last[0] < interval:
+            return
+        last[0] = stats["seconds"]
+        print(f"{start}📦 {stats['read']} read, {stats['imported']} new, "
+              f"{stats['duplicates']} duplicates, {stats['invalid']} invalid "
+              f"({stats['records_per_s']} records/s)", end=end, file=sys.stderr, flush=True)
+    return report
+
+
+def main(argv=None):
+    import argparse     # CLI only: main.py imports this module for `import`
+    parser = argparse.ArgumentParser(description="Bulk-import books from a CSV or JSON-lines file.")
+    parser.add_argument("file", help="CSV with title,author,genre,year columns, or .jsonl")
+    parser.add_argument("--workers", type=int, help="normalizing processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records per chunk")
+    parser.add_argument("--dry-run", action="store_true", help="count new/duplicate/invalid records only")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = import_catalog(args.file, args.workers, args.chunk_size, args.dry_run, progress_printer())
+    except (OSError, ValueError) as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    verb = "would be imported" if args.dry_run else "imported"
+    print(f"✅ {stats['imported']} books {verb} ({stats['first_id'] or '-'}..{stats['last_id'] or '-'}), "
+          f"{stats['duplicates']} duplicates and {stats['invalid']} invalid records skipped "
+          f"in {stats['seconds']}s ({stats['records_per_s']} records/s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
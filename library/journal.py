@@ -0,0 +1,129 @@
+from library.file_handler import FileHandler
+from library.store import LibraryStore
+
+
+class TransactionJournal:
+    """
+    Append-only event log for borrowing and returning.
+    Every borrow or return appends a single record instead of rewriting
+    the whole transactions file. The full transaction table is rebuilt by
+    replaying the journal on top of the compacted snapshot (transactions.csv).
+    Book availability is replayed the same way over books.csv, so a
+    borrow or return writes nothing but its journal record.
+    """
+
+    DATA_FILE = "data/transactions_journal.csv"
+    FIELDNAMES = ["event", "transaction_id", "member_id", "book_id", "date"]
+
+    # Journal is folded into the snapshot once it holds this many events
+    COMPACT_THRESHOLD = 500
+
+    BORROW = "borrow"
+    RETURN = "return"
+
+    # ------------------------
+    # Writing Events
+    # ------------------------
+    @classmethod
+    def record_borrow(cls, transaction):
+        """Append a borrow event for a new transaction."""
+        cls.record_borrows([transaction])
+
+    @classmethod
+    def record_return(cls, transaction):
+        """Append a return event for a closed transaction."""
+        cls.record_returns([transaction])
+
+    @classmethod
+    def record_borrows(cls, transactions):
+        """Append borrow events for several new transactions in one write."""
+        cls.append_events([cls._event(cls.BORROW, t, t.borrow_date) for t in transactions])
+
+    @classmethod
+    def record_returns(cls, transactions):
+        """Append return events for several closed transactions in one write."""
+        cls.append_events([cls._event(cls.RETURN, t, t.return_date) for t in transactions])
+
+    @classmethod
+    def append_events(cls, events):
+        """Append raw event dicts to the journal (and to its cached copy)."""
+        cached = LibraryStore.is_fresh("journal", [cls.DATA_FILE])
+        FileHandler.append_csv(cls.DATA_FILE, cls.FIELDNAMES, events)
+        if cached:
+            LibraryStore.append("journal", [cls.DATA_FILE], events)
+        else:
+            LibraryStore.invalidate("journal")
+
+    @classmethod
+    def clear(cls):
+        """Empty the journal (after its events are in the snapshot)."""
+        FileHandler.write_csv(cls.DATA_FILE, cls.FIELDNAMES, [])
+        LibraryStore.store("journal", [cls.DATA_FILE], [])
+
+    @staticmethod
+    def _event(event, transaction, date):
+        return {
+            "event": event,
+            "transaction_id": transaction.transaction_id,
+            "member_id": transaction.member_id,
+            "book_id": transaction.book_id,
+            "date": date or ""
+        }
+
+    # ------------------------
+    # Reading / Replaying
+    # ------------------------
+    @classmethod
+    def read_events(cls):
+        """All pending journal events in order (parsed once per change, via LibraryStore)."""
+        return LibraryStore.load("journal", [cls.DATA_FILE], cls._parse_events)
+
+    @classmethod
+    def _parse_events(cls):
+        return FileHandler.read_csv(cls.DATA_FILE, cls.FIELDNAMES)
+
+    @classmethod
+    def replay(cls, transactions, events, factory):
+        """
+        Yield transactions with journal events applied, in order: snapshot
+        rows first, then borrows that only exist in the journal. Streams
+        the snapshot; only the (bounded) journal is held in memory.
+        Replay is idempotent so a crash between writing the snapshot and
+        clearing the journal never duplicates a record.
+        """
+        borrows = {}
+        returns = {}
+        for event in events:
+            if event["event"] == cls.BORROW:
+                borrows.setdefault(event["transaction_id"], event)
+            elif event["event"] == cls.RETURN:
+                returns.setdefault(event["transaction_id"], event["date"])
+
+        for transaction in transactions:
+            borrows.pop(transaction.transaction_id, None)
+            cls._apply_return(transaction, returns)
+            yield transaction
+
+        for event in borrows.values():
+            transaction = factory(event["transaction_id"], event["member_id"],
+                                  event["book_id"], event["date"])
+            cls._apply_return(transaction, returns)
+            yield transaction
+
+    @staticmethod
+    def _apply_return(transaction, returns):
+        date = returns.get(transaction.transaction_id)
+        if date is not None and transaction.status == "Borrowed":
+            transaction.mark_returned(date)
+
+    @classmethod
+    def availability(cls, events=None):
+        """{book_id: available} after the pending events (a borrow lends the book, a return frees it)."""
+        if events is None:
+            events = cls.read_events()
+        return {event["book_id"]: event["event"] == cls.RETURN for event in events}
+
+    @classmethod
+    def needs_compaction(cls):
+        """True when the journal has grown past the compaction threshold."""
+        return len(cls.read_events()) >= cls.COMPACT_THRESHOLD
@@ -1,6 +1,14 @@
 import os
 from datetime import datetime
 from library.file_handler import FileHandler
+from library.store import LibraryStore
+from library.query_cache import QueryCache
+from library.counters import SummaryCounters
+from library.sequences import IdSequence
+from library.email_index import MemberEmailIndex, normalize_email
+from library.search_index import MemberSearchIndex
+from library.paging import PAGE_SIZE, paginate, print_page
+from library.snapshot import Snapshot
 
 class Member:
     """
@@ -10,6 +18,10 @@ class Member:
 
     DATA_FILE = "data/members.csv"
     FIELDNAMES = ["member_id", "name", "email", "phone", "department", "join_date"]
+    SNAPSHOT_TYPES = {}
+
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("__member_id", "__name", "__email", "__phone", "__department", "__join_date")
 
     # ------------------------
     # Constructor
@@ -22,6 +34,14 @@ class Member:
         self.__department = department.strip().title()
         self.__join_date = join_date if join_date else datetime.now().strftime("%Y-%m-%d")
 
+    @classmethod
+    def _restore(cls, member_id, name, email, phone, department, join_date):
+        """Rebuild a stored (already normalized) member, skipping __init__ (binary snapshot)."""
+        member = cls.__new__(cls)
+        member.__member_id, member.__name, member.__email = member_id, name, email
+        member.__phone, member.__department, member.__join_date = phone, department, join_date
+        return member
+
     # ------------------------
     # Encapsulation (Properties)
     # ------------------------
@@ -63,80 +83,145 @@ class Member:
             "join_date": self.__join_date
         }
 
+    def to_row(self):
+        """Convert Member object to a CSV row (FIELDNAMES order), no dict."""
+        return (self.__member_id, self.__name, self.__email, self.__phone,
+                self.__department, self.__join_date)
+
+    def line(self):
+        """One-line description used by display() and paged listings."""
+        return (f"[{self.__member_id}] {self.__name} | 📧 {self.__email} | "
+                f"📞 {self.__phone} | 🏢 {self.__department} | Joined: {self.__join_date}")
+
     def display(self):
         """Display member details nicely."""
-        print(f"[{self.__member_id}] {self.__name} | 📧 {self.__email} | "
-              f"📞 {self.__phone} | 🏢 {self.__department} | Joined: {self.__join_date}")
+        print(self.line())
 
     # ------------------------
     # CSV File Handling (via FileHandler)
     # ------------------------
     @classmethod
     def load_members(cls):
-        """Load all members from CSV using FileHandler."""
-        data = FileHandler.read_csv(cls.DATA_FILE, cls.FIELDNAMES)
-        members = []
-        for row in data:
-            members.append(Member(
-                row["member_id"],
-                row["name"],
-                row["email"],
-                row["phone"],
-                row["department"],
-                row["join_date"]
-            ))
-        return members
+        """Load all members (served from LibraryStore, parsed only on change)."""
+        return LibraryStore.load("members", [cls.DATA_FILE], cls._read_members)
+
+    @classmethod
+    def get(cls, member_id):
+        """Look up a single member by ID via the primary-key index."""
+        return LibraryStore.index("members", [cls.DATA_FILE], cls._read_members, "member_id").get(member_id)
+
+    @classmethod
+    def iter_members(cls):
+        """Yield members one at a time (streamed unless already cached)."""
+        return LibraryStore.iter("members", [cls.DATA_FILE], cls._stream_members)
+
+    @classmethod
+    def _stream_members(cls):
+        """Members from the binary snapshot if current, else parsed from CSV lazily."""
+        rows = Snapshot.rows(cls.DATA_FILE, cls._restore)
+        return rows if rows is not None else cls._parse_members()
+
+    @classmethod
+    def _parse_members(cls):
+        """Parse members from CSV lazily using FileHandler."""
+        for member_id, name, email, phone, department, join_date in FileHandler.iter_rows(cls.DATA_FILE, cls.FIELDNAMES):
+            yield Member(member_id, name, email, phone, department, join_date)
+
+    @classmethod
+    def existing_ids(cls):
+        """Stream the stored member IDs (seeds the ID sequence)."""
+        return (row[0] for row in FileHandler.iter_rows(cls.DATA_FILE, cls.FIELDNAMES))
+
+    @classmethod
+    def _read_members(cls):
+        """All members: mapped from the binary snapshot, or parsed from CSV (and re-snapshotted)."""
+        return Snapshot.load(cls.DATA_FILE, cls.FIELDNAMES, cls.SNAPSHOT_TYPES, cls._restore, cls._parse_members)
 
     @classmethod
     def save_members(cls, members):
         """Save all members to CSV using FileHandler."""
-        data_list = [m.to_dict() for m in members]
-        FileHandler.write_csv(cls.DATA_FILE, cls.FIELDNAMES, data_list)
+        FileHandler.write_rows(cls.DATA_FILE, cls.FIELDNAMES, (m.to_row() for m in members))
+        LibraryStore.store("members", [cls.DATA_FILE], members)
 
     # ------------------------
     # Functional Methods
     # ------------------------
     @classmethod
     def register(cls, name, email, phone, department):
-        """Register a new member."""
-        members = cls.load_members()
-
-        # Check for duplicate email
-        if any(m.email == email for m in members):
-            print("⚠️ Member with this email already exists!")
-            return
-
-        new_id = f"M{len(members)+1:03d}"
-        new_member = Member(new_id, name, email, phone, department)
-        members.append(new_member)
-        cls.save_members(members)
-        print(f"✅ Member '{name}' registered successfully with ID {new_id}.")
-
-    @classmethod
-    def display_all(cls):
-        """Display all registered members."""
-        members = cls.load_members()
-        if not members:
-            print("👥 No members found in the library.")
-        else:
-            print("\n=== Library Members ===")
-            for m in members:
-                m.display()
-
-    @classmethod
-    def search(cls, keyword):
-        """Search members by name, email, or department."""
-        members = cls.load_members()
-        result = [
-            m for m in members
-            if keyword.lower() in m.name.lower()
-            or keyword.lower() in m.email.lower()
-            or keyword.lower() in m.department.lower()
-        ]
-
-        if not result:
-            print("⚠️ No matching members found.")
-        else:
-            print(f"\n🔍 Search results for '{keyword}':")
-            for m in result:
-                m.display()
+        """Register a new member (email unique regardless of case)."""
+        result = cls.register_many([(name, email, phone, department)])[0]
+        print(result["message"])
+
+    @classmethod
+    def register_many(cls, records):
+        """
+        Register (name, email, phone, department) records in one locked
+        batch: one ID block, one append, one email-index update. Duplicate
+        emails (case-insensitive, also within the batch) are rejected via
+        MemberEmailIndex, without reading members.csv in the usual case.
+        Returns one dict per record: member_id, email, ok, message.
+        """
+        results = []
+        new_members = []
+        with FileHandler.lock():
+            records = list(records)
+            registered = MemberEmailIndex.find_many([email for _, email, _, _ in records])
+            batch_keys = set()
+            for (name, email, phone, department), existing in zip(records, registered):
+                key = normalize_email(email)
+                if key and (key in batch_keys or existing is not None):
+                    results.append({"member_id": "", "email": email, "ok": False,
+                                    "message": "⚠️ Member with this email already exists!"})
+                    continue
+                batch_keys.add(key)
+                results.append({"member_id": "", "email": email, "ok": True, "message": ""})
+                new_members.append((len(results) - 1, name, email, phone, department))
+
+            if new_members:
+                first = IdSequence.allocate("members", len(new_members), cls.existing_ids)
+                created = []
+                for offset, (i, name, email, phone, department) in enumerate(new_members):
+                    member = Member(f"M{first + offset:03d}", name, email, phone, department)
+                    created.append(member)
+                    results[i]["member_id"] = member.member_id
+                    results[i]["message"] = f"✅ Member '{name}' registered successfully with ID {member.member_id}."
+
+                cached = LibraryStore.is_fresh("members", [cls.DATA_FILE])
+                FileHandler.append_rows(cls.DATA_FILE, cls.FIELDNAMES, [m.to_row() for m in created])
+                if cached:
+                    LibraryStore.append("members", [cls.DATA_FILE], created)
+                else:
+                    LibraryStore.invalidate("members")
+                MemberEmailIndex.add_many([(m.email, m.member_id) for m in created])
+                SummaryCounters.increment(total_members=len(created))
+        return results
+
+    @classmethod
+    def page(cls, offset=0, limit=PAGE_SIZE):
+        """One page of members in registration order; only that page is materialised."""
+        return LibraryStore.page("members", [cls.DATA_FILE], cls._read_members, cls._stream_members,
+                                 offset, limit)
+
+    @classmethod
+    def display_all(cls, offset=0, limit=None):
+        """Display all registered members (or one page of them); return the Page shown."""
+        return print_page(cls.page(offset, limit), "\n=== Library Members ===",
+                          "👥 No members found in the library.")
+
+    @classmethod
+    def search_index(cls):
+        """Return the trigram search index, built once per member load and extended by register()."""
+        return LibraryStore.derived("members", [cls.DATA_FILE], cls._read_members, "trigrams", MemberSearchIndex)
+
+    @classmethod
+    def search_results(cls, keyword):
+        """Members most similar to keyword (cached until a member is registered)."""
+        return QueryCache.get("member_search", (keyword,), {"members": [cls.DATA_FILE]},
+                              lambda: cls.search_index().search(keyword))
+
+    @classmethod
+    def search(cls, keyword, offset=0, limit=None):
+        """Search members by name, email or department (typo-tolerant, most similar first)."""
+        result = cls.search_results(keyword)
+        return print_page(paginate(result, offset, limit, len(result)),
+                          f"\n🔍 Search results for '{keyword}':", "⚠️ No matching members found.")
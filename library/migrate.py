@@ -0,0 +1,68 @@
+"""
+One-shot migration of the CSV data files into the SQLite backend.
+
+Usage:
+    python -m library.migrate [--db data/library.db]
+
+Afterwards run the application with LIBRARY_BACKEND=sqlite.
+"""
+
+import argparse
+import os
+from library.backends import CSVBackend, SQLiteBackend
+from library.book import Book
+from library.member import Member
+from library.transaction import Transaction
+from library.journal import TransactionJournal
+from library.partitions import TransactionPartitions
+from library.config import Config
+
+
+# Every table that lives under data/, as (CSV path, columns)
+TABLES = [
+    (Book.DATA_FILE, Book.FIELDNAMES),
+    (Member.DATA_FILE, Member.FIELDNAMES),
+    (Transaction.DATA_FILE, Transaction.FIELDNAMES),
+    (TransactionJournal.DATA_FILE, TransactionJournal.FIELDNAMES),
+]
+
+
+def partition_tables():
+    """The manifest and monthly transaction partitions, if the CSV history is partitioned."""
+    if not os.path.exists(TransactionPartitions.MANIFEST_FILE):
+        return []   # still one transactions.csv: split on first use under SQLite
+    manifest = CSVBackend().read(TransactionPartitions.MANIFEST_FILE, TransactionPartitions.FIELDNAMES)
+    return [(TransactionPartitions.MANIFEST_FILE, TransactionPartitions.FIELDNAMES)] + [
+        (TransactionPartitions.path_for(row["partition"]), Transaction.FIELDNAMES) for row in manifest
+    ]
+
+
+def migrate_csv_to_sqlite(db_path=Config.SQLITE_PATH, tables=None):
+    """Copy every CSV table (default: TABLES and the partitions) into SQLite, replacing its contents."""
+    tables = tables or TABLES + partition_tables()
+    source = CSVBackend()
+    target = SQLiteBackend(db_path)
+    counts = {}
+    try:
+        for file_path, fieldnames in tables:
+            rows = source.read(file_path, fieldnames)
+            target.write(file_path, fieldnames, rows)
+            counts[SQLiteBackend.table_name(file_path)] = len(rows)
+    finally:
+        target.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate data/*.csv into SQLite.")
+    parser.add_argument("--db", default=Config.SQLITE_PATH, help="target SQLite database file")
+    args = parser.parse_args(argv)
+
+    counts = migrate_csv_to_sqlite(args.db)
+    for table, count in counts.items():
+        print(f"✅ {table:22} {count} rows")
+    print(f"📁 Migration complete: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
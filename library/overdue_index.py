@@ -0,0 +1,91 @@
+import bisect
+from datetime import date
+
+
+class OpenLoanIndex:
+    """
+    Open (not yet returned) loans ordered by borrow date.
+    Borrow dates are parsed once into day ordinals, so an overdue query
+    for any limit is a bisect plus a slice: O(log n + k). Kept current
+    by add() on borrow and refresh() on return.
+    """
+
+    # ------------------------
+    # Constructor
+    # ------------------------
+    def __init__(self, transactions=()):
+        self.__keys = []        # sorted (borrow ordinal, transaction_id)
+        self.__loans = {}       # transaction_id -> Transaction
+        self.__by_pair = {}     # (member_id, book_id) -> Transaction
+        self.__by_member = {}   # member_id -> {transaction_id: Transaction}
+        for t in transactions:
+            self._index(t)
+        # One sort for the whole build; insort is only for later add()s
+        self.__keys = sorted(self._key(t) for t in self.__loans.values())
+
+    @staticmethod
+    def ordinal(date_text):
+        """Convert a YYYY-MM-DD date to a day number."""
+        return date.fromisoformat(date_text).toordinal()
+
+    def _key(self, t):
+        return (self.ordinal(t.borrow_date), t.transaction_id)
+
+    # ------------------------
+    # Maintenance
+    # ------------------------
+    def _index(self, t):
+        """Record an open loan in the lookup dicts (not the sorted keys); True if it was new."""
+        if t.status != "Borrowed" or t.transaction_id in self.__loans:
+            return False
+        self.__loans[t.transaction_id] = t
+        self.__by_pair[(t.member_id, t.book_id)] = t
+        self.__by_member.setdefault(t.member_id, {})[t.transaction_id] = t
+        return True
+
+    def add(self, t):
+        """Index a transaction if it is an open loan."""
+        if self._index(t):
+            bisect.insort(self.__keys, self._key(t))
+
+    def discard(self, t):
+        """Remove a transaction (e.g. once it has been returned)."""
+        if self.__loans.pop(t.transaction_id, None) is None:
+            return
+        key = self._key(t)
+        i = bisect.bisect_left(self.__keys, key)
+        if i < len(self.__keys) and self.__keys[i] == key:
+            del self.__keys[i]
+        if self.__by_pair.get((t.member_id, t.book_id)) is t:
+            del self.__by_pair[(t.member_id, t.book_id)]
+        loans = self.__by_member.get(t.member_id)
+        if loans is not None:
+            loans.pop(t.transaction_id, None)
+            if not loans:
+                del self.__by_member[t.member_id]
+
+    def refresh(self, t):
+        """Re-index a transaction whose status changed in place."""
+        if t.status == "Borrowed":
+            self.add(t)
+        else:
+            self.discard(t)
+
+    def __len__(self):
+        return len(self.__loans)
+
+    # ------------------------
+    # Queries
+    # ------------------------
+    def find(self, member_id, book_id):
+        """Return the open loan of book_id by member_id, or None."""
+        return self.__by_pair.get((member_id, book_id))
+
+    def for_member(self, member_id):
+        """Open loans of one member, in borrow order (then transaction ID)."""
+        return sorted(self.__by_member.get(member_id, {}).values(), key=self._key)
+
+    def borrowed_before(self, cutoff_ordinal):
+        """Open loans borrowed strictly before cutoff_ordinal, oldest first."""
+        end = bisect.bisect_left(self.__keys, (cutoff_ordinal, ""))
+        return [self.__loans[tid] for _, tid in self.__keys[:end]]
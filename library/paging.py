@@ -0,0 +1,111 @@
+"""
+Offset-paged listings and buffered terminal output.
+
+A Page holds only the rows it shows. Tables cached in LibraryStore are
+sliced directly; otherwise rows are streamed and skipped up to the
+offset, so a listing never builds the full table just to show 20 lines.
+LineWriter collects output lines and writes them to stdout in large
+blocks instead of one print() per row.
+"""
+
+import sys
+from collections import namedtuple
+from collections.abc import Sequence
+from itertools import islice
+
+PAGE_SIZE = 20
+
+
+class Page(namedtuple("Page", ["rows", "offset", "limit", "total", "has_next"])):
+    """
+    One page of a listing. limit None means "everything from offset";
+    total is None when it is not known without a full scan.
+    """
+
+    __slots__ = ()
+
+    @property
+    def has_prev(self):
+        return self.offset > 0
+
+    @property
+    def number(self):
+        return self.offset // self.limit + 1 if self.limit else 1
+
+    @property
+    def pages(self):
+        if self.total is None or not self.limit:
+            return None
+        return max(1, -(-self.total // self.limit))
+
+    def next_offset(self):
+        return self.offset + len(self.rows) if self.has_next else None
+
+    def prev_offset(self):
+        return max(0, self.offset - self.limit) if self.has_prev and self.limit else None
+
+    def footer(self):
+        """e.g. "Page 2 of 50 · rows 21-40 of 1000" (no row total if unknown)."""
+        pages = f" of {self.pages}" if self.pages else ""
+        total = f" of {self.total}" if self.total is not None else ""
+        last = self.offset + len(self.rows)
+        return f"Page {self.number}{pages} · rows {self.offset + 1}-{last}{total}"
+
+
+def paginate(rows, offset=0, limit=PAGE_SIZE, total=None):
+    """
+    Page over any iterable: skips offset rows and keeps at most limit
+    (one more is read only to learn whether a next page exists).
+    Sequences are sliced instead, so skipped rows are never touched.
+    """
+    offset = max(0, offset)
+    stop = None if limit is None else offset + limit + 1
+    window = rows[offset:stop] if isinstance(rows, Sequence) else list(islice(rows, offset, stop))
+    if limit is None:
+        return Page(window, offset, None, total, False)
+    return Page(window[:limit], offset, limit, total, len(window) > limit)
+
+
+class LineWriter:
+    """
+    Buffered line output: lines are joined and written to stdout once
+    buffer_size characters have collected, and on exit.
+    """
+
+    def __init__(self, buffer_size=64 * 1024):
+        self.__lines = []
+        self.__size = 0
+        self.__buffer_size = buffer_size
+
+    def write(self, line=""):
+        self.__lines.append(line)
+        self.__size += len(line) + 1
+        if self.__size >= self.__buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.__lines:
+            sys.stdout.write("\n".join(self.__lines) + "\n")
+            self.__lines.clear()
+            self.__size = 0
+        sys.stdout.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def print_page(page, heading, empty_message):
+    """Print a page of rows (each with a line() method) through a LineWriter."""
+    if not page.rows:
+        print(empty_message if not page.offset else "⚠️ No more rows.")
+        return page
+    with LineWriter() as out:
+        out.write(heading)
+        for row in page.rows:
+            out.write(row.line())
+        if page.limit is not None and (page.has_next or page.has_prev):
+            out.write(page.footer())
+    return page
@@ -0,0 +1,115 @@
+"""
+Monthly partitions of the compacted transaction history.
+
+data/transactions/transactions_YYYY-MM.csv  loans borrowed in that month
+data/transactions_manifest.csv              partition,first_date,last_date,rows,open_loans
+
+A loan stays in the partition of the month it was borrowed in. Queries
+about open loans (overdue, returns, a member's current books) read only
+the partitions the manifest lists with open loans, and compaction
+rewrites only the partitions the journal touched. Reading the whole
+history chains the partitions in month order, which is the order the
+rows were written in.
+
+Every partition write is followed by a manifest write, so the manifest
+and the journal are the only files a cache has to check. A library
+still on the single data/transactions.csv is split into partitions the
+first time its history is read; the old file keeps just its header.
+"""
+
+from collections import namedtuple
+from library.file_handler import FileHandler
+from library.store import LibraryStore
+from library.snapshot import Snapshot
+
+Partition = namedtuple("Partition", ["partition", "first_date", "last_date", "rows", "open_loans"])
+
+
+class TransactionPartitions:
+    """Monthly transaction files and their manifest (see module docstring)."""
+
+    DIRECTORY = "data/transactions"
+    MANIFEST_FILE = "data/transactions_manifest.csv"
+    FIELDNAMES = list(Partition._fields)
+
+    @staticmethod
+    def partition_of(borrow_date):
+        """Partition of a loan: its borrow month, YYYY-MM."""
+        return borrow_date[:7]
+
+    @classmethod
+    def path_for(cls, partition):
+        return f"{cls.DIRECTORY}/transactions_{partition}.csv"
+
+    # ------------------------
+    # Manifest
+    # ------------------------
+    @classmethod
+    def _read_manifest(cls):
+        return sorted(
+            Partition(partition, first_date, last_date, int(rows), int(open_loans))
+            for partition, first_date, last_date, rows, open_loans
+            in FileHandler.iter_rows(cls.MANIFEST_FILE, cls.FIELDNAMES)
+        )
+
+    @classmethod
+    def manifest(cls):
+        """Partitions in month order (re-read only when the manifest changes)."""
+        return LibraryStore.load("transactions_manifest", [cls.MANIFEST_FILE], cls._read_manifest)
+
+    @staticmethod
+    def _describe(partition, transactions):
+        dates = [t.borrow_date for t in transactions]
+        return Partition(partition, min(dates), max(dates), len(transactions),
+                         sum(1 for t in transactions if t.status == "Borrowed"))
+
+    # ------------------------
+    # Writing
+    # ------------------------
+    @classmethod
+    def replace(cls, fieldnames, transactions, partitions=None, types=None):
+        """
+        Write transactions into their monthly partitions, then the
+        manifest. With partitions given, only those are replaced and
+        transactions must hold every row they keep; otherwise the whole
+        history is replaced. With snapshot types given, each written
+        partition also gets its binary snapshot (the rows are at hand).
+        """
+        groups = {}
+        for t in transactions:
+            groups.setdefault(cls.partition_of(t.borrow_date), []).append(t)
+
+        with FileHandler.lock():
+            entries = {p.partition: p for p in cls._read_manifest()} if FileHandler.exists(cls.MANIFEST_FILE) else {}
+            replaced = set(groups) | (set(entries) if partitions is None else set(partitions))
+            for partition in sorted(replaced):
+                rows = groups.get(partition, [])
+                if not rows and partition not in entries:
+                    continue
+                path = cls.path_for(partition)
+                FileHandler.write_rows(path, fieldnames, (t.to_row() for t in rows))
+                if rows:
+                    entries[partition] = cls._describe(partition, rows)
+                    if types is not None and Snapshot.enabled():
+                        Snapshot.write(path, fieldnames, types, [t.to_row() for t in rows])
+                else:
+                    del entries[partition]  # emptied: the file stays, unlisted
+            # Manifest last: readers and caches go by it
+            FileHandler.write_rows(cls.MANIFEST_FILE, cls.FIELDNAMES, sorted(entries.values()))
+
+    @classmethod
+    def ensure(cls, legacy_path, fieldnames, parse, types=None):
+        """
+        Split the single-file history at legacy_path (read with
+        parse(path)) into partitions, once. A no-op when the manifest
+        already exists.
+        """
+        if FileHandler.exists(cls.MANIFEST_FILE):
+            return
+        with FileHandler.lock():
+            if FileHandler.exists(cls.MANIFEST_FILE):
+                return
+            rows = list(parse(legacy_path)) if FileHandler.exists(legacy_path) else []
+            cls.replace(fieldnames, rows, types=types)
+            if rows:
+                FileHandler.write_rows(legacy_path, fieldnames, [])
@@ -0,0 +1,275 @@
+"""
+Opt-in hot-path instrumentation (python main.py --profile).
+
+Profiler.enable() wraps, in place:
+    FileHandler reads/writes        → calls, rows, bytes, seconds
+    model and Report class methods  → calls, rows returned/yielded, seconds
+    Book/Member/Transaction(...)    → calls, seconds (object construction)
+    sys.stdout                      → calls, bytes, seconds (printing)
+Stats are grouped by the current menu action (Profiler.action). Nothing
+is wrapped until profiling is enabled, so normal runs pay nothing.
+Times are inclusive: Book.search also contains the reads beneath it.
+"""
+
+import builtins
+import collections.abc
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+perf_counter = time.perf_counter
+
+
+class Stat:
+    """Counters for one instrumented operation."""
+
+    __slots__ = ("calls", "rows", "bytes", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def to_dict(self):
+        return {"calls": self.calls, "rows": self.rows, "bytes": self.bytes, "seconds": round(self.seconds, 6)}
+
+
+class _TimedStream:
+    """Proxy for sys.stdout that records time and bytes spent printing."""
+
+    def __init__(self, stream):
+        self.__stream = stream
+
+    def write(self, text):
+        started = perf_counter()
+        result = self.__stream.write(text)
+        Profiler.record("stdout.write (printing)", perf_counter() - started,
+                        nbytes=len(text.encode("utf-8", "replace")))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.__stream, name)
+
+
+class Profiler:
+    """Per-action timing and counter aggregation for the hot paths."""
+
+    IO_READS = ["iter_csv", "iter_rows", "read_csv"]
+    IO_WRITES = ["write_csv", "write_rows", "append_rows", "append_csv"]
+    TOTAL = "(total, excluding input)"
+
+    enabled = False
+    _action = "(outside menu actions)"
+    _stats = {}        # action -> {operation: Stat}
+    _runs = {}         # action -> number of times it ran
+    _waiting = 0.0     # seconds spent in input() during the current action
+    _originals = []    # (owner, attribute, original) to restore on disable
+
+    # ------------------------
+    # Recording
+    # ------------------------
+    @classmethod
+    def record(cls, name, seconds, rows=0, nbytes=0):
+        stats = cls._stats.setdefault(cls._action, {})
+        stat = stats.get(name)
+        if stat is None:
+            stat = stats[name] = Stat()
+        stat.calls += 1
+        stat.rows += rows
+        stat.bytes += nbytes
+        stat.seconds += seconds
+
+    @classmethod
+    @contextlib.contextmanager
+    def action(cls, name):
+        """Attribute everything inside the block to one menu action."""
+        if not cls.enabled:
+            yield
+            return
+        previous, previous_waiting = cls._action, cls._waiting
+        cls._action, cls._waiting = name, 0.0
+        cls._runs[name] = cls._runs.get(name, 0) + 1
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            cls.record(cls.TOTAL, perf_counter() - started - cls._waiting)
+            cls._action, cls._waiting = previous, previous_waiting
+
+    # ------------------------
+    # Wrappers
+    # ------------------------
+    @classmethod
+    def _timed_iter(cls, name, iterator, elapsed, nbytes=0):
+        """Re-yield an iterator, charging the time spent inside it to name."""
+        rows = 0
+        try:
+            while True:
+                started = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += perf_counter() - started
+                    break
+                elapsed += perf_counter() - started
+                rows += 1
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            cls.record(name, elapsed, rows, nbytes)
+
+    @classmethod
+    def _timed(cls, name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = perf_counter() - started
+            if isinstance(result, collections.abc.Iterator):
+                return cls._timed_iter(name, result, elapsed)
+            cls.record(name, elapsed, len(result) if isinstance(result, list) else 0)
+            return result
+        return wrapper
+
+    @staticmethod
+    def _size(file_path):
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0    # not a file (e.g. SQLite table) or not created yet
+
+    @classmethod
+    def _timed_read(cls, name, func):
+        @functools.wraps(func)
+        def wrapper(file_path, *args, **kwargs):
+            started = perf_counter()
+            result = func(file_path, *args, **kwargs)
+            elapsed = perf_counter() - started
+            if isinstance(result, collections.abc.Iterator):
+                return cls._timed_iter(name, result, elapsed, cls._size(file_path))
+            cls.record(name, elapsed, len(result), cls._size(file_path))
+            return result
+        return wrapper
+
+    @classmethod
+    def _timed_write(cls, name, func):
+        @functools.wraps(func)
+        def wrapper(file_path, fieldnames, rows):
+            counted = [0]
+
+            def counting(rows):
+                for row in rows:
+                    counted[0] += 1
+                    yield row
+
+            before = cls._size(file_path) if name.endswith(("append_rows", "append_csv")) else 0
+            started = perf_counter()
+            try:
+                return func(file_path, fieldnames, counting(rows))
+            finally:
+                cls.record(name, perf_counter() - started, counted[0], cls._size(file_path) - before)
+        return wrapper
+
+    @classmethod
+    def _timed_input(cls, func):
+        """Wrap input() so time spent waiting for the user is left out of totals."""
+        @functools.wraps(func)
+        def wrapper(*args):
+            started = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                cls._waiting += perf_counter() - started
+        return wrapper
+
+    # ------------------------
+    # Enable / Disable
+    # ------------------------
+    @classmethod
+    def _replace(cls, owner, attribute, value):
+        cls._originals.append((owner, attribute, vars(owner)[attribute]))
+        setattr(owner, attribute, value)
+
+    @classmethod
+    def instrument(cls, klass):
+        """Wrap every classmethod/staticmethod (and __init__) of klass."""
+        for attribute, value in list(vars(klass).items()):
+            name = f"{klass.__name__}.{attribute}"
+            if isinstance(value, classmethod):
+                cls._replace(klass, attribute, classmethod(cls._timed(name, value.__func__)))
+            elif isinstance(value, staticmethod):
+                cls._replace(klass, attribute, staticmethod(cls._timed(name, value.__func__)))
+            elif attribute == "__init__":
+                cls._replace(klass, attribute, cls._timed(f"{klass.__name__}()", value))
+
+    @classmethod
+    def enable(cls):
+        """Install all hooks (idempotent)."""
+        if cls.enabled:
+            return
+        # Imported here so library modules never depend on the profiler
+        from library.file_handler import FileHandler
+        from library.book import Book
+        from library.member import Member
+        from library.transaction import Transaction
+        from library.report import Report
+
+        for attribute in cls.IO_READS:
+            func = FileHandler.__dict__[attribute].__func__
+            cls._replace(FileHandler, attribute, staticmethod(cls._timed_read(f"FileHandler.{attribute}", func)))
+        for attribute in cls.IO_WRITES:
+            func = FileHandler.__dict__[attribute].__func__
+            cls._replace(FileHandler, attribute, staticmethod(cls._timed_write(f"FileHandler.{attribute}", func)))
+        for klass in (Book, Member, Transaction, Report):
+            cls.instrument(klass)
+        cls._replace(sys, "stdout", _TimedStream(sys.stdout))
+        cls._replace(builtins, "input", cls._timed_input(builtins.input))
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """Remove all hooks; collected stats are kept."""
+        while cls._originals:
+            owner, attribute, original = cls._originals.pop()
+            setattr(owner, attribute, original)
+        cls.enabled = False
+
+    # ------------------------
+    # Output
+    # ------------------------
+    @classmethod
+    def results(cls):
+        """{action: {"runs": n, "operations": {name: stats}}}, slowest first."""
+        return {
+            action: {
+                "runs": cls._runs.get(action, 1),
+                "operations": {name: stat.to_dict()
+                               for name, stat in sorted(stats.items(), key=lambda x: -x[1].seconds)},
+            }
+            for action, stats in cls._stats.items()
+        }
+
+    @classmethod
+    def dump_json(cls, file_path):
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(cls.results(), file, indent=2)
+
+    @classmethod
+    def print_table(cls, stream=None):
+        stream = stream or sys.stderr
+        print("\n📈 PROFILE (inclusive seconds: nested calls also count in their callers)", file=stream)
+        for action, result in cls.results().items():
+            print("=" * 78, file=stream)
+            print(f"{action}  ×{result['runs']}", file=stream)
+            print("-" * 78, file=stream)
+            print(f"{'operation':36} {'calls':>7} {'rows':>9} {'bytes':>11} {'seconds':>10}", file=stream)
+            for name, stat in result["operations"].items():
+                print(f"{name:36} {stat['calls']:7} {stat['rows']:9} {stat['bytes']:11} {stat['seconds']:10.4f}",
+                      file=stream)
+        print("=" * 78, file=stream)
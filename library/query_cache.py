@@ -0,0 +1,121 @@
+"""
+Bounded LRU cache of query results: searches, overdue lists, report rows.
+
+Each result is keyed by (operation, arguments) and tagged with the
+LibraryStore tables it was computed from. An entry is dropped when:
+    - one of its tables is written through LibraryStore (add_book,
+      register, borrow, return, imports, compaction) → only the entries
+      tagged with that table go
+    - a backing file changed on disk behind our back (another desk)
+    - it is older than the TTL
+    - it is the least recently used one and the cache is full
+
+Cached results are shared between callers: treat them as read-only.
+
+Usage:
+    QueryCache.get("member_search", (keyword,), {"members": [Member.DATA_FILE]},
+                   lambda: Member.search_index().search(keyword))
+    QueryCache.stats()    # hits, misses, hit_rate, evictions, ...
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from library.config import Config
+from library.file_handler import FileHandler
+
+
+class QueryCache:
+    """Process-wide LRU of query results (see module docstring)."""
+
+    max_entries = Config.QUERY_CACHE_SIZE   # 0 disables caching
+    ttl = Config.QUERY_CACHE_TTL            # seconds
+
+    STATS = ["hits", "misses", "stale", "expired", "evictions", "invalidations"]
+
+    _entries = OrderedDict()    # (operation, args) -> (tables, signature, expires, value)
+    _stats = dict.fromkeys(STATS, 0)
+    _lock = threading.Lock()    # entry bookkeeping only; results are computed outside it
+
+    # ------------------------
+    # Lookup
+    # ------------------------
+    @staticmethod
+    def signature(tables):
+        return tuple(FileHandler.signature(path) for paths in tables.values() for path in paths)
+
+    @classmethod
+    def get(cls, operation, args, tables, compute):
+        """
+        Return compute() for (operation, args), from the cache when
+        possible. tables maps each table the result is computed from to
+        its backing files, e.g. {"members": [Member.DATA_FILE]}.
+        """
+        if cls.max_entries <= 0:
+            return compute()
+        key = (operation, args)
+        before = cls.signature(tables)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None:
+                if entry[1] != before:
+                    outcome = "stale"
+                elif entry[2] <= time.monotonic():
+                    outcome = "expired"
+                else:
+                    cls._entries.move_to_end(key)
+                    cls._stats["hits"] += 1
+                    return entry[3]
+                del cls._entries[key]
+                cls._stats[outcome] += 1
+            cls._stats["misses"] += 1
+
+        value = compute()
+        # Only cache the result if nothing was written while computing it
+        if cls.signature(tables) == before:
+            cls._put(key, (frozenset(tables), before, time.monotonic() + cls.ttl, value))
+        return value
+
+    @classmethod
+    def _put(cls, key, entry):
+        with cls._lock:
+            cls._entries[key] = entry
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > cls.max_entries:
+                cls._entries.popitem(last=False)
+                cls._stats["evictions"] += 1
+
+    # ------------------------
+    # Invalidation
+    # ------------------------
+    @classmethod
+    def invalidate(cls, table=None):
+        """Drop the entries computed from table (all entries if None)."""
+        with cls._lock:
+            if table is None:
+                dropped = list(cls._entries)
+            else:
+                dropped = [key for key, entry in cls._entries.items() if table in entry[0]]
+            for key in dropped:
+                del cls._entries[key]
+            cls._stats["invalidations"] += len(dropped)
+
+    # ------------------------
+    # Statistics
+    # ------------------------
+    @classmethod
+    def stats(cls):
+        """Counters since start (or reset_stats), plus the current size and limits."""
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats["entries"] = len(cls._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["max_entries"] = cls.max_entries
+        stats["ttl"] = cls.ttl
+        return stats
+
+    @classmethod
+    def reset_stats(cls):
+        with cls._lock:
+            cls._stats = dict.fromkeys(cls.STATS, 0)
@@ -1,30 +1,47 @@
 import csv
 import os
-from datetime import datetime
+from datetime import date
 from library.book import Book
 from library.member import Member
 from library.transaction import Transaction
+from library.counters import SummaryCounters
+from library.overdue_index import OpenLoanIndex
+from library.query_cache import QueryCache
+from library import analytics
 
 
 class Report:
     """
     Generates analytical and summary reports
     from library data (books, members, transactions).
+    Each report's rows come from QueryCache, so a repeated report is
+    only recomputed after a write to the tables it reads.
     """
 
+    # ------------------------------------------------------------
+    @staticmethod
+    def _cached(operation, args, tables, compute):
+        """QueryCache.get with tables given by name ("books", "members", "transactions", ...)."""
+        paths = {
+            "books": Book._paths(),
+            "members": [Member.DATA_FILE],
+            "transactions": Transaction._paths(),
+            "open_loans": Transaction._paths(),
+            "summary": [SummaryCounters.DATA_FILE],
+        }
+        return QueryCache.get(f"report.{operation}", args, {name: paths[name] for name in tables}, compute)
+
     # ------------------------------------------------------------
     @staticmethod
     def total_summary():
-        """Show overall summary of books, members, and transactions."""
-        books = Book.load_books()
-        members = Member.load_members()
-        transactions = Transaction.load_transactions()
+        """Show overall summary of books, members, and transactions (O(1) counters)."""
+        counters = Report.summary()
 
-        total_books = len(books)
-        total_members = len(members)
-        total_transactions = len(transactions)
-        borrowed_books = len([b for b in books if not b.available])
-        returned_books = total_transactions - borrowed_books
+        total_books = counters["total_books"]
+        total_members = counters["total_members"]
+        total_transactions = counters["total_transactions"]
+        borrowed_books = counters["borrowed_books"]
+        returned_books = counters["returned_books"]
 
         print("\n📊 LIBRARY SUMMARY REPORT")
         print("=" * 45)
@@ -35,43 +52,46 @@ class Report:
         print(f"Total Returned Books:   {returned_books}")
         print("=" * 45)
 
+    @staticmethod
+    def summary():
+        """The summary counters (dict)."""
+        return Report._cached("summary", (), ["books", "members", "transactions", "summary"], SummaryCounters.load)
+
     # ------------------------------------------------------------
     @staticmethod
     def most_borrowed_books(top_n=5):
         """Show most borrowed books (without pandas)."""
-        Transaction.initialize_csv()
+        sorted_books = Report.top_books(top_n)
 
-        borrow_counts = {}
-        with open(Transaction.DATA_FILE, "r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                book_id = row["book_id"]
-                borrow_counts[book_id] = borrow_counts.get(book_id, 0) + 1
-
-        if not borrow_counts:
+        if not sorted_books:
             print("⚠️ No transaction data found.")
             return
 
-        # Sort books by borrow count (descending)
-        sorted_books = sorted(borrow_counts.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
         print(f"\n🏆 TOP {top_n} MOST BORROWED BOOKS")
         print("=" * 45)
-        for book_id, count in sorted_books:
-            book = next((b for b in Book.load_books() if b.book_id == book_id), None)
-            title = book.title if book else "Unknown"
-            print(f"{book_id} - {title:25} | Borrowed {count} times")
+        for book_id, title, count in sorted_books:
+            print(f"{book_id} - {title or 'Unknown':25} | Borrowed {count} times")
         print("=" * 45)
 
+    @staticmethod
+    def top_books(top_n=5):
+        """[(book_id, title or None, borrows)] for the top_n most borrowed books."""
+        def compute():
+            rows = []
+            for book_id, count in analytics.engine().top_books(top_n):
+                book = Book.get(book_id)
+                rows.append((book_id, book.title if book else None, count))
+            return rows
+        return Report._cached("top_books", (top_n,), ["transactions", "books"], compute)
+
     # ------------------------------------------------------------
     @staticmethod
     def active_members_report():
-        """Show members with at least one borrowed book."""
-        transactions = Transaction.load_transactions()
-        active_member_ids = {t.member_id for t in transactions if t.status == "Borrowed"}
-
-        members = Member.load_members()
-        active_members = [m for m in members if m.member_id in active_member_ids]
+        """Show members with at least one borrowed book (streamed)."""
+        def compute():
+            active_member_ids = {t.member_id for t in Transaction.iter_transactions() if t.status == "Borrowed"}
+            return [m for m in Member.iter_members() if m.member_id in active_member_ids]
+        active_members = Report._cached("active_members", (), ["transactions", "members"], compute)
 
         print("\n👥 ACTIVE MEMBERS REPORT")
         print("=" * 45)
@@ -85,43 +105,100 @@ class Report:
     # ------------------------------------------------------------
     @staticmethod
     def overdue_report(days_limit=7):
-        """List all overdue transactions."""
-        transactions = Transaction.load_transactions()
-        overdue_list = []
-
-        for t in transactions:
-            if t.status == "Borrowed":
-                borrow_date = datetime.strptime(t.borrow_date, "%Y-%m-%d")
-                days_passed = (datetime.now() - borrow_date).days
-                if days_passed > days_limit:
-                    overdue_list.append((t, days_passed))
+        """List all overdue transactions (range cut on the open-loan index)."""
+        today = date.today().toordinal()
+
+        def compute():
+            rows = []
+            for t in Transaction.open_loans().borrowed_before(today - days_limit):
+                member = Member.get(t.member_id)
+                book = Book.get(t.book_id)
+                rows.append((t.transaction_id, member.name if member else "Unknown",
+                             book.title if book else "Unknown", today - OpenLoanIndex.ordinal(t.borrow_date)))
+            return rows
+        overdue_list = Report._cached("overdue", (today, days_limit), ["open_loans", "members", "books"], compute)
 
         print(f"\n⏰ OVERDUE BOOKS (>{days_limit} days)")
         print("=" * 45)
         if not overdue_list:
             print("✅ No overdue books.")
         else:
-            for t, days in overdue_list:
-                member = next((m for m in Member.load_members() if m.member_id == t.member_id), None)
-                book = next((b for b in Book.load_books() if b.book_id == t.book_id), None)
-                member_name = member.name if member else "Unknown"
-                book_title = book.title if book else "Unknown"
-                print(f"{t.transaction_id} | {member_name:15} | {book_title:20} | {days} days overdue")
+            for transaction_id, member_name, book_title, days in overdue_list:
+                print(f"{transaction_id} | {member_name:15} | {book_title:20} | {days} days overdue")
+        print("=" * 45)
+
+    # ------------------------------------------------------------
+    @staticmethod
+    def department_activity():
+        """Show number of borrows per member department."""
+        rows = Report.department_rows()
+
+        print("\n🏢 DEPARTMENT ACTIVITY")
+        print("=" * 45)
+        if not rows:
+            print("⚠️ No transaction data found.")
+        for dept, count in rows:
+            print(f"{dept:25} | {count} borrows")
         print("=" * 45)
 
+    @staticmethod
+    def department_rows():
+        """[(department, borrows)] by borrows desc, then department name."""
+        def compute():
+            departments = {m.member_id: m.department for m in Member.iter_members()}
+            return analytics.engine().department_activity(departments)
+        return Report._cached("departments", (), ["transactions", "members"], compute)
+
+    # ------------------------------------------------------------
+    @staticmethod
+    def borrows_per_period(period="month"):
+        """Show number of borrows per month (or per year)."""
+        rows = Report.period_rows(period)
+
+        print(f"\n📅 BORROWS PER {period.upper()}")
+        print("=" * 45)
+        if not rows:
+            print("⚠️ No transaction data found.")
+        for key, count in rows:
+            print(f"{key:10} | {count} borrows")
+        print("=" * 45)
+
+    @staticmethod
+    def period_rows(period="month"):
+        """[(YYYY-MM or YYYY, borrows)] in chronological order."""
+        return Report._cached("periods", (period,), ["transactions"],
+                              lambda: analytics.engine().borrows_per_period(period))
+
+    # ------------------------------------------------------------
+    @staticmethod
+    def average_loan_duration():
+        """Show the average number of days books are kept."""
+        average = Report.average_duration()
+
+        print("\n⏳ AVERAGE LOAN DURATION")
+        print("=" * 45)
+        if average is None:
+            print("⚠️ No returned books yet.")
+        else:
+            print(f"Average Loan Duration:  {average:.1f} days")
+        print("=" * 45)
+
+    @staticmethod
+    def average_duration():
+        """Average loan length in days over returned loans, or None."""
+        return Report._cached("duration", (), ["transactions"], lambda: analytics.engine().average_loan_duration())
+
     # ------------------------------------------------------------
     @staticmethod
     def export_to_csv(output_file="data/report_summary.csv"):
         """Generate combined summary CSV for management records."""
-        books = Book.load_books()
-        members = Member.load_members()
-        transactions = Transaction.load_transactions()
-
-        total_books = len(books)
-        total_members = len(members)
-        total_transactions = len(transactions)
-        borrowed_books = len([b for b in books if not b.available])
-        returned_books = len([t for t in transactions if t.status == "Returned"])
+        counters = SummaryCounters.load()
+
+        total_books = counters["total_books"]
+        total_members = counters["total_members"]
+        total_transactions = counters["total_transactions"]
+        borrowed_books = counters["borrowed_books"]
+        returned_books = counters["returned_books"]
 
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
@@ -0,0 +1,232 @@
+import bisect
+import re
+
+
+class CatalogIndex:
+    """
+    Tokenized inverted index over book title, author and genre.
+    Supports prefix matching, multi-term AND queries and relevance
+    ordering. Query cost depends on the number of matching tokens and
+    postings rather than on the catalog size.
+    """
+
+    FIELD_WEIGHTS = {"title": 3, "author": 2, "genre": 1}
+    EXACT_BONUS = 2
+    TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+    # ------------------------
+    # Constructor
+    # ------------------------
+    def __init__(self, books=()):
+        self.__postings = {}       # token -> {book_id: field weight}
+        self.__vocabulary = []     # sorted tokens, for prefix lookups
+        self.__books = {}          # book_id -> Book
+        self.__order = {}          # book_id -> insertion order (tie-break)
+        for book in books:
+            self._index(book)
+        # Sorted once: insort per new token would make the build quadratic
+        self.__vocabulary = sorted(self.__postings)
+
+    @classmethod
+    def tokenize(cls, text):
+        """Split text into lowercase alphanumeric tokens."""
+        return cls.TOKEN_PATTERN.findall(str(text).lower())
+
+    # ------------------------
+    # Maintenance
+    # ------------------------
+    def _index(self, book):
+        """Add a book's postings; return the tokens that were new to the index."""
+        self.__books[book.book_id] = book
+        self.__order.setdefault(book.book_id, len(self.__order))
+        new_tokens = []
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for token in self.tokenize(getattr(book, field)):
+                postings = self.__postings.get(token)
+                if postings is None:
+                    postings = self.__postings[token] = {}
+                    new_tokens.append(token)
+                postings[book.book_id] = postings.get(book.book_id, 0) + weight
+        return new_tokens
+
+    def add(self, book):
+        """Index a single book (used for incremental updates)."""
+        for token in self._index(book):
+            bisect.insort(self.__vocabulary, token)
+
+    def __len__(self):
+        return len(self.__books)
+
+    # ------------------------
+    # Querying
+    # ------------------------
+    def _matches(self, term):
+        """Return {book_id: score} for every token starting with term."""
+        scores = {}
+        vocabulary = self.__vocabulary
+        i = bisect.bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            token = vocabulary[i]
+            bonus = self.EXACT_BONUS if token == term else 1
+            for book_id, weight in self.__postings[token].items():
+                scores[book_id] = scores.get(book_id, 0) + weight * bonus
+            i += 1
+        return scores
+
+    def search(self, query):
+        """Return books matching every term of the query, best match first."""
+        terms = self.tokenize(query)
+        if not terms:
+            return []
+
+        scores = None
+        for term in terms:
+            matches = self._matches(term)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {book_id: score + matches[book_id]
+                          for book_id, score in scores.items() if book_id in matches}
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda book_id: (-scores[book_id], self.__order[book_id]))
+        return [self.__books[book_id] for book_id in ranked]
+
+
+class MemberSearchIndex:
+    """
+    Trigram index over member name, email and department for
+    typo-tolerant search. Each distinct word is indexed once by its
+    trigrams. A query word is scored against the words that share a
+    trigram with it: shared / combined trigrams (Jaccard similarity),
+    so "Husain" still finds "Hussain" and "mar" finds "Maryam". Query
+    cost depends on those candidate words and their members, never on
+    the full member list.
+    """
+
+    FIELD_WEIGHTS = {"name": 3, "email": 2, "department": 1}
+    THRESHOLD = 0.3     # minimum similarity for a word to match
+    TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+    # ------------------------
+    # Constructor
+    # ------------------------
+    def __init__(self, members=()):
+        self.__postings = {}       # trigram -> set of words
+        self.__sizes = {}          # word -> number of distinct trigrams
+        self.__owners = {}         # word -> {member_id: best field weight}
+        self.__members = {}        # member_id -> Member
+        self.__order = {}          # member_id -> insertion order (tie-break)
+        for member in members:
+            self.add(member)
+
+    @classmethod
+    def tokenize(cls, text):
+        """Split text into case-folded words (emails split at . @ _ -)."""
+        return cls.TOKEN_PATTERN.findall(str(text).casefold())
+
+    @staticmethod
+    def trigrams(word):
+        """Distinct trigrams of a word padded as "  word " (start-of-word grams weigh more)."""
+        padded = f"  {word} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    # ------------------------
+    # Maintenance
+    # ------------------------
+    def add(self, member):
+        """Index a single member (used for incremental updates)."""
+        member_id = member.member_id
+        self.__members[member_id] = member
+        self.__order.setdefault(member_id, len(self.__order))
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for word in self.tokenize(getattr(member, field)):
+                owners = self.__owners.get(word)
+                if owners is None:
+                    owners = self.__owners[word] = {}
+                    grams = self.trigrams(word)
+                    self.__sizes[word] = len(grams)
+                    for gram in grams:
+                        self.__postings.setdefault(gram, set()).add(word)
+                owners.setdefault(member_id, weight)    # fields come heaviest first
+
+    def __len__(self):
+        return len(self.__members)
+
+    # ------------------------
+    # Querying
+    # ------------------------
+    def similar(self, word):
+        """Return {indexed word: similarity} for words at least THRESHOLD similar to word."""
+        grams = self.trigrams(word)
+        shared = {}
+        for gram in grams:
+            for candidate in self.__postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        matches = {}
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + self.__sizes[candidate] - count)
+            if similarity >= self.THRESHOLD:
+                matches[candidate] = similarity
+        return matches
+
+    def _cost(self, words):
+        return sum(len(self.__owners[word]) for word in words)
+
+    def _scores(self, words):
+        """Return {member_id: best similarity × field weight} over the matched words."""
+        scores = {}
+        for word, similarity in words.items():
+            for member_id, weight in self.__owners[word].items():
+                score = similarity * weight
+                if score > scores.get(member_id, 0):
+                    scores[member_id] = score
+        return scores
+
+    def _narrow(self, scores, words):
+        """Keep the members in scores that also own one of words, adding their best score."""
+        if len(scores) * len(words) >= self._cost(words):
+            matches = self._scores(words)
+            return {member_id: score + matches[member_id]
+                    for member_id, score in scores.items() if member_id in matches}
+        owners = [(self.__owners[word], similarity) for word, similarity in words.items()]
+        narrowed = {}
+        for member_id, score in scores.items():
+            best = max((similarity * owned[member_id] for owned, similarity in owners if member_id in owned),
+                       default=0)
+            if best:
+                narrowed[member_id] = score + best
+        return narrowed
+
+    def _partial(self, matched):
+        """Scores of the members matching the most query words (when none match them all)."""
+        hits, scores = {}, {}
+        for words in matched:
+            for member_id, score in self._scores(words).items():
+                hits[member_id] = hits.get(member_id, 0) + 1
+                scores[member_id] = scores.get(member_id, 0) + score
+        most = max(hits.values())
+        return {member_id: score for member_id, score in scores.items() if hits[member_id] == most}
+
+    def search(self, query):
+        """
+        Return members matching every word of the query, most similar
+        first. When no member matches them all (a word too mangled to
+        match, or a wrong one), return those matching the most words.
+        """
+        matched = [words for words in map(self.similar, self.tokenize(query)) if words]
+        if not matched:
+            return []
+
+        # Rarest word first: later words only check the remaining candidates
+        matched.sort(key=self._cost)
+        scores = self._scores(matched[0])
+        for words in matched[1:]:
+            scores = self._narrow(scores, words)
+            if not scores:
+                scores = self._partial(matched)
+                break
+
+        ranked = sorted(scores, key=lambda member_id: (-scores[member_id], self.__order[member_id]))
+        return [self.__members[member_id] for member_id in ranked]
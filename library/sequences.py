@@ -0,0 +1,104 @@
+"""
+Persisted ID sequences for new books and members.
+
+Usage:
+    python -m library.sequences            # show stored sequences
+    python -m library.sequences --rebuild  # re-seed from the tables' highest IDs
+"""
+
+import sys
+from library.file_handler import FileHandler
+
+
+class IdSequence:
+    """
+    Last allocated number per table, kept in a small sidecar so a new ID
+    never needs the table itself (no len(table)+1, which also repeats
+    IDs once rows are removed). A sequence is seeded once from the
+    highest existing ID, then only moves forward.
+    """
+
+    DATA_FILE = "data/sequences.csv"
+    FIELDNAMES = ["name", "value"]
+
+    # ------------------------
+    # Reading / Writing
+    # ------------------------
+    @classmethod
+    def _read(cls):
+        sequences = {}
+        for row in FileHandler.read_csv(cls.DATA_FILE, cls.FIELDNAMES):
+            try:
+                sequences[row["name"]] = int(row["value"])
+            except (TypeError, ValueError):
+                continue
+        return sequences
+
+    @classmethod
+    def _write(cls, sequences):
+        FileHandler.write_rows(cls.DATA_FILE, cls.FIELDNAMES, sorted(sequences.items()))
+
+    @staticmethod
+    def highest(ids):
+        """Highest numeric suffix among IDs like B007 (0 if none)."""
+        highest = 0
+        for record_id in ids:
+            digits = record_id[1:]
+            if digits.isdigit():
+                highest = max(highest, int(digits))
+        return highest
+
+    # ------------------------
+    # Allocation
+    # ------------------------
+    @classmethod
+    def allocate(cls, name, count, existing_ids):
+        """
+        Reserve count numbers for table name and return the first one.
+        existing_ids is a zero-argument callable yielding the table's IDs;
+        it is only called to seed a sequence that was never stored.
+        """
+        with FileHandler.lock():
+            sequences = cls._read()
+            last = sequences.get(name)
+            if last is None:
+                last = cls.highest(existing_ids())
+            sequences[name] = last + count
+            cls._write(sequences)
+        return last + 1
+
+    @classmethod
+    def next(cls, name, existing_ids):
+        """Reserve and return the next number for table name."""
+        return cls.allocate(name, 1, existing_ids)
+
+    @classmethod
+    def rebuild(cls, tables):
+        """Re-seed every sequence from {name: existing_ids callable}."""
+        with FileHandler.lock():
+            sequences = {name: cls.highest(existing_ids()) for name, existing_ids in tables.items()}
+            cls._write(sequences)
+        return sequences
+
+
+def main(argv=None):
+    import argparse     # CLI only: this module is imported by the models
+    from library.book import Book
+    from library.member import Member
+
+    parser = argparse.ArgumentParser(description="Inspect or re-seed the ID sequences.")
+    parser.add_argument("--rebuild", action="store_true", help="re-seed from the highest IDs in the tables")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        sequences = IdSequence.rebuild({"books": Book.existing_ids, "members": Member.existing_ids})
+        print("✅ Sequences re-seeded from the tables.")
+    else:
+        sequences = IdSequence._read()
+    for name, value in sorted(sequences.items()):
+        print(f"{name:12} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Long-running HTTP/JSON API over the library core (stdlib asyncio only).
+
+Usage:
+    python -m library.server [--host 127.0.0.1] [--port 8080]
+    python main.py serve [--port 8080]
+
+Endpoints:
+    GET  /health
+    GET  /cache                        (query cache hits, misses, evictions, ...)
+    GET  /books/search?q=python+data
+    GET  /books/<book_id>
+    GET  /members/<member_id>          (with the member's open loans)
+    GET  /overdue?days=7
+    GET  /reports/<summary|top|departments|periods|duration>?top=5&period=month
+    POST /borrow   {"member_id": "M001", "book_id": "B003"}  or  {"pairs": [["M001", "B003"], ...]}
+    POST /return   (same body as /borrow)
+
+One process keeps the tables and indexes hot in LibraryStore, so a
+request never re-parses a CSV unless another terminal changed it.
+Reads run concurrently in a thread pool; writes wait for running reads
+to finish and go one at a time.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from library import api
+
+MAX_BODY = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Abort a request with an HTTP status and message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer; waiting writers block new readers."""
+
+    def __init__(self):
+        self.__readers = 0
+        self.__writing = False
+        self.__waiting_writers = 0
+        self.__condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def read(self):
+        async with self.__condition:
+            await self.__condition.wait_for(lambda: not self.__writing and not self.__waiting_writers)
+            self.__readers += 1
+        try:
+            yield
+        finally:
+            async with self.__condition:
+                self.__readers -= 1
+                self.__condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def write(self):
+        async with self.__condition:
+            self.__waiting_writers += 1
+            await self.__condition.wait_for(lambda: not self.__writing and not self.__readers)
+            self.__waiting_writers -= 1
+            self.__writing = True
+        try:
+            yield
+        finally:
+            async with self.__condition:
+                self.__writing = False
+                self.__condition.notify_all()
+
+
+class LibraryServer:
+    """Routes HTTP requests to library.api under a read/write lock."""
+
+    def __init__(self):
+        self.lock = ReadWriteLock()
+        self.requests = 0
+
+    # ------------------------
+    # Execution
+    # ------------------------
+    async def read(self, func, *args):
+        async with self.lock.read():
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def write(self, func, *args):
+        async with self.lock.write():
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    @staticmethod
+    def warm_up():
+        """Load every table and index once, before the first request."""
+        from library.book import Book
+        from library.member import Member
+        from library.transaction import Transaction
+        Book.catalog_index()
+        Book.get("")
+        Member.get("")
+        Transaction.open_loans()
+
+    # ------------------------
+    # Routing
+    # ------------------------
+    @staticmethod
+    def _int(query, name, default):
+        try:
+            return int(query.get(name, [default])[0])
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an integer")
+
+    @staticmethod
+    def _pairs(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "request body must be JSON")
+        if isinstance(data, dict) and "pairs" in data:
+            pairs = data["pairs"]
+        elif isinstance(data, dict) and "member_id" in data and "book_id" in data:
+            return [(str(data["member_id"]), str(data["book_id"]))], True
+        else:
+            raise HTTPError(400, 'expected {"member_id", "book_id"} or {"pairs": [[member_id, book_id], ...]}')
+        if not isinstance(pairs, list) or not all(isinstance(p, list) and len(p) == 2 for p in pairs):
+            raise HTTPError(400, "'pairs' must be a list of [member_id, book_id]")
+        return [(str(m), str(b)) for m, b in pairs], False
+
+    async def dispatch(self, method, target, body):
+        """Return (status, payload) for one request."""
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+
+        if method == "GET":
+            if parts == ["health"]:
+                return 200, {"status": "ok", "requests": self.requests}
+            if parts == ["cache"]:
+                return 200, api.cache_stats()
+            if parts == ["books", "search"]:
+                return 200, await self.read(api.search_books, query.get("q", [""])[0])
+            if len(parts) == 2 and parts[0] in ("books", "members"):
+                lookup = api.get_book if parts[0] == "books" else api.get_member
+                result = await self.read(lookup, parts[1])
+                if result is None:
+                    raise HTTPError(404, f"{parts[0][:-1]} {parts[1]} not found")
+                return 200, result
+            if parts == ["overdue"]:
+                return 200, await self.read(api.overdue, self._int(query, "days", 7))
+            if len(parts) == 2 and parts[0] == "reports":
+                if parts[1] not in api.REPORTS:
+                    raise HTTPError(404, f"unknown report {parts[1]}")
+                period = query.get("period", ["month"])[0]
+                return 200, await self.read(api.report, parts[1], self._int(query, "top", 5), period)
+        elif method == "POST" and parts in (["borrow"], ["return"]):
+            pairs, single = self._pairs(body)
+            results = await self.write(api.borrow if parts == ["borrow"] else api.return_books, pairs)
+            if single:
+                return (200 if results[0]["ok"] else 409), results[0]
+            return 200, results
+        raise HTTPError(404 if method in ("GET", "POST") else 405, f"no route for {method} {url.path}")
+
+    # ------------------------
+    # HTTP/1.1
+    # ------------------------
+    @staticmethod
+    async def read_request(reader):
+        """Return (method, target, headers, body), or None at end of stream."""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    @staticmethod
+    def response(status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def handle(self, reader, writer):
+        """Serve one keep-alive connection until the client closes it."""
+        try:
+            while True:
+                keep_alive = True
+                request = None
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    self.requests += 1
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    if request is None:
+                        keep_alive = False      # unparseable request: stream position unknown
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+                    status, payload = 500, {"error": "internal server error"}
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def start(host="127.0.0.1", port=8080):
+    """Warm the caches, then start listening; return the asyncio server."""
+    library_server = LibraryServer()
+    await asyncio.get_running_loop().run_in_executor(None, library_server.warm_up)
+    return await asyncio.start_server(library_server.handle, host, port)
+
+
+def serve(host="127.0.0.1", port=8080):
+    """Run the API server until interrupted."""
+    async def main():
+        server = await start(host, port)
+        bound = server.sockets[0].getsockname()
+        print(f"🌐 Library API listening on http://{bound[0]}:{bound[1]}", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Library API stopped.", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the library over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
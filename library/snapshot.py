@@ -0,0 +1,438 @@
+"""
+Memory-mapped binary snapshots of the tables.
+
+data/books.snap sits next to data/books.csv (and each transaction
+partition has its own) and holds the same rows, already normalized, as
+columns:
+    int / bool  fixed-width array (int64 / int8)
+    str         uint64 offsets (rows + 1) into a UTF-8 string heap
+    optional    like str, but "" reads back as None (e.g. return_date)
+    dict        uint32 codes into a str dictionary; chosen by the writer
+                for repetitive columns (genres, dates, ids in loans)
+Layout: 8-byte magic, uint32 header length, JSON header (row count,
+source signature, column parts), then the 8-byte aligned parts.
+
+Opening a snapshot maps the file and reads only the header. A row is
+decoded when it is first accessed, and decoding skips the CSV parser
+and the constructors' normalization. The header stores the signature
+of the CSV the snapshot was written from. When the CSV no longer
+matches (another terminal wrote it, or it was edited by hand), the
+loader parses the CSV as before and rewrites the snapshot afterwards.
+
+Usage:
+    python -m library.snapshot            # show each snapshot's state
+    python -m library.snapshot --rebuild  # rewrite every snapshot from CSV
+"""
+
+import collections.abc
+import contextlib
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import partial
+from itertools import accumulate, starmap
+from library.config import Config
+from library.file_handler import FileHandler
+
+MAGIC = b"LMSNAP01"
+ALIGN = 8
+FORMATS = {"int": "q", "bool": "b"}
+FIRST_BLOCK, BLOCK = 64, 8192  # rows decoded together while iterating (doubling up to BLOCK)
+
+
+def _signature(path):
+    # JSON round-trip so stored and live signatures compare equal
+    return json.loads(json.dumps(list(FileHandler.signature(path))))
+
+
+class SnapshotTable:
+    """Read-only view of one snapshot file; columns are decoded on demand."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a table snapshot")
+        (length,) = struct.unpack_from("<I", self.__map, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self.__map[start:start + length])
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path}: written on a {header.get('byteorder')}-endian machine")
+        self.source = header["source"]
+        self.fieldnames = [column["name"] for column in header["columns"]]
+        self.__size = header["rows"]
+        self.__columns = header["columns"]
+        self.__keys = {}    # dict column name -> {code: key}, see _keys()
+        self.__getters = [self._getter(column) for column in self.__columns]
+
+    def __len__(self):
+        return self.__size
+
+    # ------------------------
+    # Parts
+    # ------------------------
+    def _part(self, column, part, fmt="B"):
+        offset, length = column["parts"][part]
+        return memoryview(self.__map)[offset:offset + length].cast(fmt)
+
+    def _strings(self, column, start=0, stop=None):
+        """Values start..stop of a str column (or of a dict column's dictionary)."""
+        offsets = self._part(column, "offsets", "Q")[start:(stop + 1 if stop is not None else None)].tolist()
+        if not offsets:
+            return []
+        base = offsets[0]
+        heap = self._part(column, "heap")[base:offsets[-1]].tobytes()
+        if column["ascii"]:
+            text = heap.decode("ascii")     # character offsets == byte offsets
+            return [text[a - base:b - base] for a, b in zip(offsets, offsets[1:])]
+        return [heap[a - base:b - base].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def _keys(self, column):
+        """code -> decoded key of a dict column, filled in as codes are met."""
+        return self.__keys.setdefault(column["name"], {})
+
+    def _getter(self, column):
+        """Return get(i) for one column's value at row i."""
+        get = self._value_getter(column)
+        return (lambda i: get(i) or None) if column["optional"] else get
+
+    def _value_getter(self, column):
+        kind = column["kind"]
+        if kind in FORMATS:
+            values = self._part(column, "values", FORMATS[kind])
+            return (lambda i: values[i] != 0) if kind == "bool" else values.__getitem__
+        offsets = self._part(column, "offsets", "Q")
+        heap = self._part(column, "heap")
+        if kind == "dict":
+            codes = self._part(column, "codes", "I")
+            keys = self._keys(column)
+
+            def get(i):
+                code = codes[i]
+                value = keys.get(code)
+                if value is None:
+                    value = keys[code] = heap[offsets[code]:offsets[code + 1]].tobytes().decode("utf-8")
+                return value
+            return get
+        return lambda i: heap[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    # ------------------------
+    # Access
+    # ------------------------
+    def row(self, i):
+        """Values of row i in fieldnames order."""
+        return tuple(get(i) for get in self.__getters)
+
+    def column(self, name, start=0, stop=None):
+        """Values start..stop of one column, decoded in bulk."""
+        column = self.__columns[self.fieldnames.index(name)]
+        values = self._column_values(column, start, stop)
+        return [value or None for value in values] if column["optional"] else values
+
+    def _column_values(self, column, start, stop):
+        kind = column["kind"]
+        if kind in FORMATS:
+            values = self._part(column, "values", FORMATS[kind])[start:stop].tolist()
+            return list(map(bool, values)) if kind == "bool" else values
+        if kind == "dict":
+            codes = self._part(column, "codes", "I")[start:stop].tolist()
+            keys = self._keys(column)
+            missing = set(codes).difference(keys)
+            if missing:
+                offsets = self._part(column, "offsets", "Q")
+                heap = self._part(column, "heap")
+                for code in missing:
+                    keys[code] = heap[offsets[code]:offsets[code + 1]].tobytes().decode("utf-8")
+            return list(map(keys.__getitem__, codes))
+        return self._strings(column, start, stop)
+
+    def columns(self, start=0, stop=None):
+        return [self.column(name, start, stop) for name in self.fieldnames]
+
+    def find(self, name, value):
+        """Indexes of the rows whose column equals value (dict columns compare codes)."""
+        column = self.__columns[self.fieldnames.index(name)]
+        if column["kind"] == "dict" and not column["optional"]:
+            keys = self._strings(column)
+            if value not in keys:
+                return []
+            code = keys.index(value)
+            return [i for i, c in enumerate(self._part(column, "codes", "I").tolist()) if c == code]
+        return [i for i, v in enumerate(self.column(name)) if v == value]
+
+
+class SnapshotRows(collections.abc.Sequence):
+    """
+    Model objects backed by a SnapshotTable: factory(*values) runs for a
+    row the first time it is accessed, and the object is kept, so the
+    same row always returns the same object. Iterating decodes rows
+    column by column, a block at a time, so a loop that stops early
+    leaves the rest encoded. Rows appended later (extend) are plain
+    objects.
+    """
+
+    def __init__(self, table, factory):
+        self.__table = table
+        self.__factory = factory
+        self.__objects = [None] * len(table)
+        self.__complete = not self.__objects
+
+    def __len__(self):
+        return len(self.__objects)
+
+    def _decode(self, i):
+        obj = self.__objects[i]
+        if obj is None:
+            obj = self.__objects[i] = self.__factory(*self.__table.row(i))
+        return obj
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if self.__complete:
+                return self.__objects[i]
+            return [self._decode(j) for j in range(*i.indices(len(self.__objects)))]
+        if i < 0:
+            i += len(self.__objects)
+        if not 0 <= i < len(self.__objects):
+            raise IndexError("snapshot row index out of range")
+        return self._decode(i)
+
+    def __iter__(self):
+        if self.__complete:
+            return iter(self.__objects)
+        return self._stream()
+
+    def _stream(self):
+        """Yield every row, decoding column by column in blocks that grow up to BLOCK rows."""
+        objects, factory, table = self.__objects, self.__factory, self.__table
+        size = len(table)
+        start, step = 0, FIRST_BLOCK
+        while start < size:
+            stop = min(start + step, size)
+            step = min(2 * step, BLOCK)
+            done = objects[start:stop]
+            if None not in done:
+                start = stop
+                yield from done
+                continue
+            # Millions of new objects would trigger repeated full GC passes
+            # over them; none can form a cycle, so pause the collector
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                block = list(starmap(factory, zip(*table.columns(start, stop))))
+            finally:
+                if enabled:
+                    gc.enable()
+            if done.count(None) != len(done):
+                # keep objects already handed out
+                block = [old if old is not None else new for old, new in zip(done, block)]
+            objects[start:stop] = block
+            start = stop
+            yield from block
+        self.__complete = True
+        yield from objects[size:]
+
+    def where(self, name, value):
+        """Objects whose attribute name equals value, decoding only the matching rows."""
+        if self.__complete:
+            return [obj for obj in self.__objects if getattr(obj, name) == value]
+        size = len(self.__table)
+        matches = [self._decode(i) for i in self.__table.find(name, value)]
+        return matches + [obj for obj in self.__objects[size:] if getattr(obj, name) == value]
+
+    def extend(self, rows):
+        self.__objects.extend(rows)
+
+
+class Snapshot:
+    """Writes, validates and opens the binary snapshot next to a table's CSV."""
+
+    SUFFIX = ".snap"
+
+    @classmethod
+    def enabled(cls):
+        return Config.SNAPSHOTS != "off"
+
+    @classmethod
+    def path_for(cls, csv_path):
+        return os.path.splitext(csv_path)[0] + cls.SUFFIX
+
+    # ------------------------
+    # Reading
+    # ------------------------
+    @classmethod
+    def open(cls, csv_path):
+        """The SnapshotTable for csv_path if it matches the CSV on disk, else None."""
+        if not cls.enabled():
+            return None
+        try:
+            table = SnapshotTable(cls.path_for(csv_path))
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+        return table if table.source == _signature(csv_path) else None
+
+    @classmethod
+    def rows(cls, csv_path, factory):
+        """SnapshotRows of factory objects if the snapshot is current, else None."""
+        table = cls.open(csv_path)
+        return SnapshotRows(table, factory) if table is not None else None
+
+    @staticmethod
+    def where(rows, name, value):
+        """
+        rows.where(name, value) for SnapshotRows, so a derived structure
+        that only wants a few rows (e.g. open loans) decodes just those;
+        any other iterable is returned unchanged for the caller to filter.
+        """
+        return rows.where(name, value) if isinstance(rows, SnapshotRows) else rows
+
+    @classmethod
+    def load(cls, csv_path, fieldnames, types, factory, parse):
+        """
+        All rows of a table: mapped from the snapshot when it is current,
+        otherwise parse() from CSV, after which the snapshot is rewritten
+        from the parsed objects (their to_row()) for the next start.
+        """
+        rows = cls.rows(csv_path, factory)
+        if rows is not None:
+            return rows
+        signature = FileHandler.signature(csv_path)
+        rows = list(parse())
+        if cls.enabled() and FileHandler.signature(csv_path) == signature:
+            cls.write(csv_path, fieldnames, types, [row.to_row() for row in rows], signature)
+        return rows
+
+    # ------------------------
+    # Writing
+    # ------------------------
+    @staticmethod
+    def _encode_strings(values):
+        text = "".join(values)
+        if text.isascii():
+            heap, lengths = text.encode("ascii"), map(len, values)
+        else:
+            encoded = [value.encode("utf-8") for value in values]
+            heap, lengths = b"".join(encoded), map(len, encoded)
+        offsets = array("Q", accumulate(lengths, initial=0))
+        return {"offsets": offsets.tobytes(), "heap": heap}, heap.isascii()
+
+    @classmethod
+    def _encode_column(cls, kind, values):
+        """Return (kind, {part: bytes}, ascii) for one column."""
+        if kind == "int":
+            return kind, {"values": array("q", map(int, values)).tobytes()}, True
+        if kind == "bool":
+            flags = (value is True or str(value).lower() == "true" for value in values)
+            return kind, {"values": array("b", flags).tobytes()}, True
+        keys = dict.fromkeys(values)
+        if len(keys) * 2 <= len(values):
+            codes = {key: code for code, key in enumerate(keys)}
+            parts, ascii_ = cls._encode_strings(keys)
+            parts["codes"] = array("I", map(codes.__getitem__, values)).tobytes()
+            return "dict", parts, ascii_
+        parts, ascii_ = cls._encode_strings(values)
+        return "str", parts, ascii_
+
+    @classmethod
+    def write(cls, csv_path, fieldnames, types, rows, signature=None):
+        """
+        Write the snapshot of rows (sequences in fieldnames order, already
+        normalized) as the current image of csv_path. types maps column
+        names to "int", "bool" or "optional"; every other column holds str
+        values. Derived data: temp file + rename, no fsync; a failed write
+        only costs the next start a CSV parse.
+        """
+        rows = list(rows)
+        columns = list(zip(*rows)) if rows else [() for _ in fieldnames]
+        header = {"version": 1, "byteorder": sys.byteorder, "rows": len(rows),
+                  "source": _signature(csv_path) if signature is None else list(signature), "columns": []}
+        blobs = []
+        for name, values in zip(fieldnames, columns):
+            kind = types.get(name, "str")
+            optional = kind == "optional"
+            if optional:
+                values = ["" if value is None else value for value in values]
+            kind, parts, ascii_ = cls._encode_column(kind, values)
+            header["columns"].append({"name": name, "kind": kind, "optional": optional,
+                                      "ascii": ascii_, "parts": {}})
+            blobs.append(parts)
+
+        # Part offsets depend on the header length, which depends on the offsets: size it first
+        def layout(start):
+            position = start
+            for column, parts in zip(header["columns"], blobs):
+                for part, data in parts.items():
+                    position += -position % ALIGN
+                    column["parts"][part] = [position, len(data)]
+                    position += len(data)
+            return json.dumps(header).encode("utf-8")
+
+        encoded = layout(0)
+        while True:
+            start = len(MAGIC) + 4 + len(encoded)
+            start += -start % ALIGN
+            again = layout(start)
+            if len(again) == len(encoded):
+                encoded = again
+                break
+            encoded = again
+
+        path = cls.path_for(csv_path)
+        temp_path = os.path.join(os.path.dirname(path) or ".", f".tmp-{os.getpid()}-{os.path.basename(path)}")
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+                for parts in blobs:
+                    for data in parts.values():
+                        file.write(b"\0" * (-file.tell() % ALIGN))
+                        file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # e.g. the old snapshot is still mapped on Windows: keep using CSV
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+
+
+def tables():
+    """(name, csv_path, fieldnames, types, factory, parse) for every snapshotted table."""
+    from library.book import Book
+    from library.member import Member
+    from library.transaction import Transaction
+    from library.partitions import TransactionPartitions
+    result = [
+        ("books", Book.DATA_FILE, Book.FIELDNAMES, Book.SNAPSHOT_TYPES, Book._restore, Book._parse_books),
+        ("members", Member.DATA_FILE, Member.FIELDNAMES, Member.SNAPSHOT_TYPES, Member._restore,
+         Member._parse_members),
+    ]
+    # One snapshot per monthly transaction partition
+    for partition in Transaction.partitions():
+        path = TransactionPartitions.path_for(partition.partition)
+        result.append((f"transactions {partition.partition}", path, Transaction.FIELDNAMES,
+                       Transaction.SNAPSHOT_TYPES, Transaction, partial(Transaction._parse_transactions, path)))
+    return result
+
+
+def main(argv=None):
+    import argparse     # CLI only: the models import this module
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the binary table snapshots.")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite every snapshot from its CSV")
+    args = parser.parse_args(argv)
+
+    for name, csv_path, fieldnames, types, factory, parse in tables():
+        if args.rebuild:
+            with FileHandler.lock(exclusive=False):
+                signature = FileHandler.signature(csv_path)
+                Snapshot.write(csv_path, fieldnames, types, [row.to_row() for row in parse()], signature)
+        table = Snapshot.open(csv_path)
+        state = f"{len(table)} rows, current" if table is not None else "missing or stale (CSV is used)"
+        print(f"{name:20} {Snapshot.path_for(csv_path)}: {state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
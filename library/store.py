@@ -0,0 +1,223 @@
+from itertools import islice
+from library.file_handler import FileHandler
+from library.paging import Page, paginate
+from library.query_cache import QueryCache
+
+
+class PrimaryKeyIndex(dict):
+    """Dict from a primary-key attribute (e.g. book_id) to its object."""
+
+    def __init__(self, attr, rows=()):
+        super().__init__()
+        self.attr = attr
+        for row in rows:
+            self.add(row)
+
+    def add(self, row):
+        self[getattr(row, self.attr)] = row
+
+
+class LibraryStore:
+    """
+    Process-wide in-memory cache of parsed tables.
+    Sits between the model classes and FileHandler: each table is parsed
+    once and served from memory until one of its backing files changes
+    on disk (detected by mtime and size, or the backend's equivalent).
+
+    Derived structures (primary-key indexes, search indexes, ...) are
+    cached alongside each table and rebuilt only when the table is
+    re-parsed. Structures with an add(row) method are kept up to date
+    incrementally by append().
+
+    Every write-through call (store, append, touch, invalidate) also
+    drops the QueryCache results computed from that table.
+    """
+
+    _tables = {}
+    _views = {}
+
+    # ------------------------
+    # Change Detection
+    # ------------------------
+    @staticmethod
+    def signature(paths):
+        """Return a tuple identifying the stored state of the given tables."""
+        return tuple(FileHandler.signature(path) for path in paths)
+
+    @classmethod
+    def _entry(cls, name, paths, loader):
+        """Return the cache entry for a table, re-parsing it if stale."""
+        entry = cls._tables.get(name)
+        before = cls.signature(paths)
+        if entry is not None and entry["signature"] == before:
+            return entry
+
+        # Parse under a shared lock so multi-file tables are read consistently
+        with FileHandler.lock(exclusive=False):
+            before = cls.signature(paths)
+            rows = loader()
+            after = cls.signature(paths)
+        # Only trust the cache if nothing changed while we were parsing
+        # (a missing file may legitimately be created by the loader)
+        missing = any(None in part for part in before)
+        signature = after if (before == after or missing) else None
+        entry = {"signature": signature, "rows": rows, "derived": {}}
+        cls._tables[name] = entry
+        return entry
+
+    # ------------------------
+    # Cached Access
+    # ------------------------
+    @classmethod
+    def load(cls, name, paths, loader):
+        """
+        Return the cached rows for a table, calling loader() to re-parse
+        only when a backing file changed. A fresh list is returned each
+        time so callers may append to it before saving.
+        """
+        return list(cls._entry(name, paths, loader)["rows"])
+
+    @classmethod
+    def iter(cls, name, paths, streamer):
+        """
+        Iterate a table: from memory when the cached copy is fresh,
+        otherwise straight from storage via streamer() without caching.
+        """
+        entry = cls._tables.get(name)
+        if entry is not None and entry["signature"] == cls.signature(paths):
+            # No copy: store() swaps in a new list, and bounding the walk to
+            # the current length keeps rows append()ed meanwhile out of it
+            rows = entry["rows"]
+            return islice(rows, len(rows))
+        return streamer()
+
+    @classmethod
+    def page(cls, name, paths, loader, streamer, offset=0, limit=None, predicate=None):
+        """
+        Return one Page of a table in stored order (rows matching
+        predicate, if given). A fresh cached copy is sliced in memory;
+        otherwise rows are streamed past the offset without caching, so
+        only the page itself is ever materialised. limit None asks for
+        the whole table, which is loaded (and cached) as usual.
+        """
+        offset = max(0, offset)
+        if limit is None:
+            rows = cls._entry(name, paths, loader)["rows"]
+        else:
+            entry = cls._tables.get(name)
+            fresh = entry is not None and entry["signature"] == cls.signature(paths)
+            rows = entry["rows"] if fresh else None
+        if rows is not None:
+            if predicate is None:
+                stop = None if limit is None else offset + limit
+                return Page(rows[offset:stop], offset, limit, len(rows), stop is not None and stop < len(rows))
+            return paginate(filter(predicate, rows), offset, limit)
+        source = streamer()
+        try:
+            return paginate(source if predicate is None else filter(predicate, source), offset, limit)
+        finally:
+            if hasattr(source, "close"):
+                source.close()      # release the read lock held by a half-consumed stream
+
+    @classmethod
+    def derived(cls, name, paths, loader, key, builder):
+        """Return a structure built by builder(rows), cached with the table."""
+        entry = cls._entry(name, paths, loader)
+        if key not in entry["derived"]:
+            entry["derived"][key] = builder(entry["rows"])
+        return entry["derived"][key]
+
+    @classmethod
+    def view(cls, name, paths, key, builder):
+        """
+        Return builder() cached against the table's signature, without
+        materialising the table's rows (e.g. columnar arrays built by
+        streaming). Rebuilt after any write to the table.
+        """
+        cached = cls._views.get((name, key))
+        if cached is not None and cached[0] == cls.signature(paths):
+            return cached[1]
+        with FileHandler.lock(exclusive=False):
+            signature = cls.signature(paths)
+            value = builder()
+        cls._views[(name, key)] = (signature, value)
+        return value
+
+    @classmethod
+    def index(cls, name, paths, loader, attr):
+        """Return the primary-key index (attr value -> object) for a table."""
+        return cls.derived(name, paths, loader, ("pk", attr),
+                           lambda rows: PrimaryKeyIndex(attr, rows))
+
+    # ------------------------
+    # Write-Through
+    # ------------------------
+    @classmethod
+    def store(cls, name, paths, rows):
+        """
+        Record rows just written to disk so the next load is a cache hit.
+        Derived structures survive when the same objects were rewritten
+        (e.g. a book's availability flipped in place).
+        """
+        QueryCache.invalidate(name)
+        entry = cls._tables.get(name)
+        rows = list(rows)
+        derived = {}
+        if entry is not None and len(entry["rows"]) == len(rows) \
+                and all(a is b for a, b in zip(entry["rows"], rows)):
+            derived = entry["derived"]
+        cls._tables[name] = {"signature": cls.signature(paths), "rows": rows, "derived": derived}
+
+    @classmethod
+    def is_fresh(cls, name, paths):
+        """True if the cached table still matches the files on disk."""
+        entry = cls._tables.get(name)
+        return entry is not None and entry["signature"] is not None and entry["signature"] == cls.signature(paths)
+
+    @classmethod
+    def append(cls, name, paths, rows):
+        """
+        Record rows just appended on disk, updating derived structures
+        incrementally. Falls back to invalidation if the table was not cached.
+        """
+        QueryCache.invalidate(name)
+        entry = cls._tables.get(name)
+        if entry is None or entry["signature"] is None:
+            cls.invalidate(name)
+            return
+        entry["rows"].extend(rows)
+        for key, structure in list(entry["derived"].items()):
+            if hasattr(structure, "add"):
+                for row in rows:
+                    structure.add(row)
+            else:
+                del entry["derived"][key]
+        entry["signature"] = cls.signature(paths)
+
+    @classmethod
+    def touch(cls, name, paths, rows=()):
+        """
+        Refresh a table's signature after cached objects (rows) were
+        updated in place. Derived structures with a refresh(row) method
+        re-index those rows; others are keyed on fields that never change.
+        """
+        QueryCache.invalidate(name)
+        entry = cls._tables.get(name)
+        if entry is not None:
+            for structure in entry["derived"].values():
+                if hasattr(structure, "refresh"):
+                    for row in rows:
+                        structure.refresh(row)
+            entry["signature"] = cls.signature(paths)
+
+    @classmethod
+    def invalidate(cls, name=None):
+        """Drop one cached table (or all of them), its views and cached query results."""
+        QueryCache.invalidate(name)
+        if name is None:
+            cls._tables.clear()
+            cls._views.clear()
+        else:
+            cls._tables.pop(name, None)
+            for key in [k for k in cls._views if k[0] == name]:
+                del cls._views[key]
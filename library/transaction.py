@@ -1,17 +1,32 @@
-from datetime import datetime, timedelta
+import sys
+from datetime import date, datetime
+from itertools import chain
 from library.book import Book
 from library.member import Member
 from library.file_handler import FileHandler
+from library.journal import TransactionJournal
+from library.partitions import TransactionPartitions
+from library.store import LibraryStore
+from library.query_cache import QueryCache
+from library.overdue_index import OpenLoanIndex
+from library.paging import PAGE_SIZE, paginate, print_page
+from library.snapshot import Snapshot
 
 
 class Transaction:
     """
     Manages borrowing and returning of books.
-    Uses FileHandler for CSV operations.
+    Uses FileHandler for CSV operations. New borrows and returns are
+    appended to the TransactionJournal; the monthly TransactionPartitions
+    hold the compacted history the journal is replayed on top of.
     """
 
-    DATA_FILE = "data/transactions.csv"
+    DATA_FILE = "data/transactions.csv"     # pre-partitioning layout, split on first use
     FIELDNAMES = ["transaction_id", "member_id", "book_id", "borrow_date", "return_date", "status"]
+    SNAPSHOT_TYPES = {"return_date": "optional"}
+
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("__transaction_id", "__member_id", "__book_id", "__borrow_date", "__return_date", "__status")
 
     # ------------------------
     # Constructor
@@ -51,6 +66,11 @@ class Transaction:
     def status(self):
         return self.__status
 
+    def mark_returned(self, return_date):
+        """Close this transaction as returned on the given date."""
+        self.__return_date = return_date
+        self.__status = "Returned"
+
     # ------------------------
     # Utility Methods
     # ------------------------
@@ -65,23 +85,28 @@ class Transaction:
             "status": self.__status
         }
 
-    def display(self):
-        """Display transaction details."""
-        print(
+    def to_row(self):
+        """Convert transaction object to a CSV row (FIELDNAMES order), no dict."""
+        return (self.__transaction_id, self.__member_id, self.__book_id,
+                self.__borrow_date, self.__return_date or "", self.__status)
+
+    def line(self):
+        """One-line description used by display() and paged listings."""
+        return (
             f"[{self.__transaction_id}] Member: {self.__member_id} | "
             f"Book: {self.__book_id} | Borrowed: {self.__borrow_date} | "
             f"Returned: {self.__return_date or 'Not Returned'} | Status: {self.__status}"
         )
+
+    def display(self):
+        """Display transaction details."""
+        print(self.line())
+
     @classmethod
     def view_member_borrowed(cls, member_id):
         """Display all books borrowed by a specific member."""
-        from library.file_handler import FileHandler
-
-        # Load all transactions
-        transactions = FileHandler.read_csv(cls.DATA_FILE)
-
-        # Filter transactions for the given member_id
-        borrowed_books = [t for t in transactions if t.get("member_id") == member_id and t.get("return_date") == ""]
+        # Open loans indexed by member: no scan over the full history
+        borrowed_books = cls.open_loans().for_member(member_id)
 
         if not borrowed_books:
             print(f"\nNo active borrowed books found for Member ID: {member_id}")
@@ -90,7 +115,7 @@ class Transaction:
         print(f"\nBooks currently borrowed by Member ID {member_id}:")
         print("-" * 60)
         for t in borrowed_books:
-            print(f"Book ID: {t['book_id']} | Issue Date: {t['issue_date']} | Due Date: {t['due_date']}")
+            print(f"Book ID: {t.book_id} | Issue Date: {t.borrow_date}")
         print("-" * 60)
 
     # ------------------------
@@ -98,25 +123,169 @@ class Transaction:
     # ------------------------
     @classmethod
     def load_transactions(cls):
-        """Load all transactions from CSV using FileHandler."""
-        rows = FileHandler.read_csv(cls.DATA_FILE)
-        transactions = []
-        for row in rows:
-            transactions.append(Transaction(
-                row["transaction_id"],
-                row["member_id"],
-                row["book_id"],
-                row["borrow_date"],
-                row.get("return_date") or None,
-                row["status"]
-            ))
-        return transactions
+        """Load all transactions (served from LibraryStore, parsed only on change)."""
+        return LibraryStore.load("transactions", cls._paths(), cls._read_transactions)
+
+    @classmethod
+    def get(cls, transaction_id):
+        """Look up a single transaction by ID via the primary-key index."""
+        return LibraryStore.index("transactions", cls._paths(), cls._read_transactions,
+                                  "transaction_id").get(transaction_id)
+
+    @classmethod
+    def open_loans(cls):
+        """Return the borrow-date ordered index of open loans."""
+        return LibraryStore.derived("open_loans", cls._paths(), cls._read_open_loans, "index", OpenLoanIndex)
+
+    @classmethod
+    def _paths(cls):
+        """Files backing the transaction table: partition manifest + journal."""
+        return [TransactionPartitions.MANIFEST_FILE, TransactionJournal.DATA_FILE]
+
+    @classmethod
+    def partitions(cls):
+        """Manifest entries in month order (a legacy transactions.csv is split first)."""
+        TransactionPartitions.ensure(cls.DATA_FILE, cls.FIELDNAMES, cls._parse_transactions, cls.SNAPSHOT_TYPES)
+        return TransactionPartitions.manifest()
+
+    @classmethod
+    def count(cls):
+        """Number of transactions: partition row counts plus borrows still in the journal."""
+        stored = sum(p.rows for p in cls.partitions())
+        return stored + sum(1 for e in TransactionJournal.read_events() if e["event"] == TransactionJournal.BORROW)
+
+    @classmethod
+    def loan_counts(cls):
+        """(total, open) loans from the manifest and the journal, without reading any partition."""
+        partitions = cls.partitions()
+        events = TransactionJournal.read_events()
+        borrows = sum(1 for e in events if e["event"] == TransactionJournal.BORROW)
+        returns = len(events) - borrows
+        return (sum(p.rows for p in partitions) + borrows,
+                sum(p.open_loans for p in partitions) + borrows - returns)
+
+    @classmethod
+    def iter_transactions(cls):
+        """Yield transactions one at a time (streamed unless already cached)."""
+        return LibraryStore.iter("transactions", cls._paths(), cls._stream_transactions)
+
+    @classmethod
+    def _partition_rows(cls, partition, stream=False):
+        """
+        One partition's rows: mapped from its binary snapshot if current,
+        else parsed from CSV (loading also rewrites the snapshot; streaming
+        does not).
+        """
+        path = TransactionPartitions.path_for(partition.partition)
+        if stream:
+            rows = Snapshot.rows(path, Transaction)
+            return rows if rows is not None else cls._parse_transactions(path)
+        return Snapshot.load(path, cls.FIELDNAMES, cls.SNAPSHOT_TYPES, Transaction,
+                             lambda: cls._parse_transactions(path))
+
+    @classmethod
+    def _stream_partitions(cls, partitions):
+        for partition in partitions:
+            yield from cls._partition_rows(partition, stream=True)
+
+    @classmethod
+    def _stream_transactions(cls):
+        """Stream the partitions in month order, replaying the journal as rows go by."""
+        partitions = cls.partitions()
+        events = TransactionJournal.read_events()
+        if events:
+            return TransactionJournal.replay(cls._stream_partitions(partitions), events, Transaction)
+        if len(partitions) == 1:
+            return cls._partition_rows(partitions[0], stream=True)  # pages can slice mapped rows directly
+        return cls._stream_partitions(partitions)
+
+    @classmethod
+    def _parse_transactions(cls, path=None):
+        """Parse one transactions CSV (default: the legacy single file) lazily using FileHandler."""
+        # Ids, dates and status repeat heavily across history: intern them
+        # so millions of rows share one string object per distinct value
+        intern = sys.intern
+        for transaction_id, member_id, book_id, borrow_date, return_date, status \
+                in FileHandler.iter_rows(path or cls.DATA_FILE, cls.FIELDNAMES):
+            yield Transaction(transaction_id, intern(member_id), intern(book_id), intern(borrow_date),
+                              intern(return_date) if return_date else None, intern(status))
+
+    @classmethod
+    def _read_transactions(cls):
+        """Load every partition (mapped or parsed from CSV) and replay the journal on top."""
+        partitions = [cls._partition_rows(p) for p in cls.partitions()]
+        events = TransactionJournal.read_events()
+        if events:
+            return list(TransactionJournal.replay(chain.from_iterable(partitions), events, Transaction))
+        return partitions[0] if len(partitions) == 1 else list(chain.from_iterable(partitions))
+
+    @classmethod
+    def _read_open_loans(cls):
+        """Open loans only: partitions the manifest lists without any are never read."""
+        loans = []
+        for partition in cls.partitions():
+            if partition.open_loans:
+                loans.extend(Snapshot.where(cls._partition_rows(partition), "status", "Borrowed"))
+        replayed = TransactionJournal.replay(loans, TransactionJournal.read_events(), Transaction)
+        return [t for t in replayed if t.status == "Borrowed"]
 
     @classmethod
     def save_transactions(cls, transactions):
-        """Save all transactions (list of Transaction objects) using FileHandler."""
-        data = [t.to_dict() for t in transactions]
-        FileHandler.write_csv(cls.DATA_FILE, cls.FIELDNAMES, data)
+        """Replace the whole history (list of Transaction objects) using FileHandler."""
+        TransactionPartitions.replace(cls.FIELDNAMES, transactions, types=cls.SNAPSHOT_TYPES)
+
+    @classmethod
+    def compact(cls):
+        """Fold the journal into the partitions it touches and empty it."""
+        with FileHandler.lock():
+            events = TransactionJournal.read_events()
+            if not events:
+                return
+            fresh = cls._fresh_caches()
+            borrowed = {e["transaction_id"]: TransactionPartitions.partition_of(e["date"])
+                        for e in events if e["event"] == TransactionJournal.BORROW}
+            returned = {e["transaction_id"] for e in events if e["event"] == TransactionJournal.RETURN}
+
+            # A return can only close a loan in a partition with open loans;
+            # a borrow lands in its own month. Nothing else is read.
+            touched = [p for p in cls.partitions()
+                       if (returned and p.open_loans) or p.partition in borrowed.values()]
+            rows = list(TransactionJournal.replay(chain.from_iterable(cls._partition_rows(p) for p in touched),
+                                                  events, Transaction))
+            changed = set(borrowed.values())
+            changed.update(TransactionPartitions.partition_of(t.borrow_date)
+                           for t in rows if t.transaction_id in returned)
+            TransactionPartitions.replace(
+                cls.FIELDNAMES,
+                [t for t in rows if TransactionPartitions.partition_of(t.borrow_date) in changed],
+                changed, cls.SNAPSHOT_TYPES)
+            # Fold the journal's loans into books.csv too before the journal goes
+            Book.save_books(Book.load_books())
+            TransactionJournal.clear()
+            LibraryStore.touch("books", Book._paths())
+            cls._after_write(fresh)     # same rows, new files
+
+    @classmethod
+    def _maybe_compact(cls):
+        """Compact periodically so replay cost stays bounded."""
+        if TransactionJournal.needs_compaction():
+            cls.compact()
+
+    @classmethod
+    def _fresh_caches(cls):
+        """Cached transaction tables still matching the files (check before writing)."""
+        return [name for name in ("transactions", "open_loans") if LibraryStore.is_fresh(name, cls._paths())]
+
+    @classmethod
+    def _after_write(cls, fresh, added=(), changed=()):
+        """Carry the caches in fresh over a write: append added rows, re-index changed ones."""
+        for name in ("transactions", "open_loans"):
+            if name not in fresh:
+                LibraryStore.invalidate(name)
+            elif added:
+                LibraryStore.append(name, cls._paths(), added)
+            else:
+                LibraryStore.touch(name, cls._paths(), changed)
 
     # ------------------------
     # Functional Methods
@@ -124,92 +293,145 @@ class Transaction:
     @classmethod
     def borrow_book(cls, member_id, book_id):
         """Borrow a book if available."""
-        books = Book.load_books()
-        members = Member.load_members()
-        transactions = cls.load_transactions()
-
-        # Validate member
-        member = next((m for m in members if m.member_id == member_id), None)
-        if not member:
-            print("❌ Member not found!")
-            return
+        result = cls.borrow_many([(member_id, book_id)])[0]
+        print(result["message"])
 
-        # Validate book
-        book = next((b for b in books if b.book_id == book_id), None)
-        if not book:
-            print("❌ Book not found!")
-            return
-        if not book.available:
-            print("⚠️ Book is already borrowed.")
-            return
+    @classmethod
+    def return_book(cls, member_id, book_id):
+        """Return a borrowed book."""
+        result = cls.return_many([(member_id, book_id)])[0]
+        print(result["message"])
 
-        # Create transaction
-        transaction_id = f"T{len(transactions) + 1:04d}"
-        borrow_date = datetime.now().strftime("%Y-%m-%d")
-        new_transaction = Transaction(transaction_id, member_id, book_id, borrow_date)
-        transactions.append(new_transaction)
+    @classmethod
+    def borrow_many(cls, pairs):
+        """
+        Borrow a batch of (member_id, book_id) pairs.
+        The whole batch is validated against one loaded snapshot and
+        persisted once. Returns one result dict per pair, in order.
+        """
+        with FileHandler.lock():
+            Book.load_books()   # lent books are updated in the cached copies
+            cls.open_loans()    # load before writing, so the index is kept current
+            total = cls.count()
+            borrow_date = datetime.now().strftime("%Y-%m-%d")
+            new_transactions = []
+            lent = []
+            results = []
+
+            for member_id, book_id in pairs:
+                result = {"member_id": member_id, "book_id": book_id, "ok": False, "transaction_id": ""}
+                results.append(result)
+
+                # Validate member
+                member = Member.get(member_id)
+                if not member:
+                    result["message"] = "❌ Member not found!"
+                    continue
+
+                # Validate book (a book lent earlier in the batch is already unavailable)
+                book = Book.get(book_id)
+                if not book:
+                    result["message"] = "❌ Book not found!"
+                    continue
+                if not book.available:
+                    result["message"] = "⚠️ Book is already borrowed."
+                    continue
+
+                # Create transaction
+                transaction_id = f"T{total + len(new_transactions) + 1:04d}"
+                new_transactions.append(Transaction(transaction_id, member_id, book_id, borrow_date))
+                book.available = False
+                lent.append(book)
+
+                result.update(ok=True, transaction_id=transaction_id,
+                              message=f"✅ Book '{book.title}' borrowed successfully by '{member.name}' "
+                                      f"(Transaction ID: {transaction_id}).")
+
+            # Persist once: one journal append carries the loans and the books' availability
+            if new_transactions:
+                fresh = cls._fresh_caches()
+                TransactionJournal.record_borrows(new_transactions)
+                LibraryStore.touch("books", Book._paths(), lent)
+                cls._after_write(fresh, added=new_transactions)
+                cls._maybe_compact()
+        return results
 
-        # Update book availability
-        book.available = False
-        Book.save_books(books)
-        cls.save_transactions(transactions)
+    @classmethod
+    def return_many(cls, pairs):
+        """
+        Return a batch of (member_id, book_id) pairs.
+        Each pair is looked up in the open-loan index of one snapshot and
+        all updates are persisted once. Returns one result dict per pair,
+        in order.
+        """
+        with FileHandler.lock():
+            Book.load_books()   # returned books are updated in the cached copies
+            open_loans = cls.open_loans()
+            return_date = datetime.now().strftime("%Y-%m-%d")
+            returned = []
+            freed = []
+            results = []
+
+            for member_id, book_id in pairs:
+                result = {"member_id": member_id, "book_id": book_id, "ok": False, "transaction_id": ""}
+                results.append(result)
+
+                # Find active transaction
+                transaction = open_loans.find(member_id, book_id)
+                if not transaction or transaction.status != "Borrowed":
+                    result["message"] = "⚠️ No active borrow record found for this member and book."
+                    continue
+
+                # Update transaction and book status
+                transaction.mark_returned(return_date)
+                returned.append(transaction)
+                book = Book.get(book_id)
+                if book:
+                    book.available = True
+                    freed.append(book)
+
+                title = book.title if book else book_id
+                result.update(ok=True, transaction_id=transaction.transaction_id,
+                              message=f"📘 Book '{title}' successfully returned by Member ID {member_id}.")
+
+            # Persist once: one journal append carries the returns and the books' availability
+            if returned:
+                fresh = cls._fresh_caches()
+                if "transactions" in fresh:
+                    # The full table holds its own copies of these loans
+                    for t in returned:
+                        copy = cls.get(t.transaction_id)
+                        if copy is not None and copy is not t:
+                            copy.mark_returned(return_date)
+                TransactionJournal.record_returns(returned)
+                LibraryStore.touch("books", Book._paths(), freed)
+                cls._after_write(fresh, changed=returned)
+                cls._maybe_compact()
+        return results
 
-        print(f"✅ Book '{book.title}' borrowed successfully by '{member.name}' (Transaction ID: {transaction_id}).")
+    @classmethod
+    def page(cls, offset=0, limit=PAGE_SIZE):
+        """One page of transactions in stored order; only that page is materialised."""
+        return LibraryStore.page("transactions", cls._paths(), cls._read_transactions,
+                                 cls._stream_transactions, offset, limit)
 
     @classmethod
-    def return_book(cls, member_id, book_id):
-        """Return a borrowed book."""
-        books = Book.load_books()
-        transactions = cls.load_transactions()
+    def view_all(cls, offset=0, limit=None):
+        """Display all transaction records (or one page of them); return the Page shown."""
+        return print_page(cls.page(offset, limit), "\n=== All Transactions ===", "🕮 No transactions found.")
 
-        # Find active transaction
-        transaction = next(
-            (t for t in transactions if t.member_id == member_id and t.book_id == book_id and t.status == "Borrowed"),
-            None
-        )
-        if not transaction:
-            print("⚠️ No active borrow record found for this member and book.")
-            return
+    @classmethod
+    def overdue(cls, days_limit=7):
+        """Return open loans borrowed more than N days ago, oldest first (cached until a loan changes)."""
+        # Borrowed N or more calendar days ago: more than N days have elapsed
+        cutoff = date.today().toordinal() - days_limit + 1
+        return QueryCache.get("overdue", (cutoff,), {"open_loans": cls._paths()},
+                              lambda: cls.open_loans().borrowed_before(cutoff))
 
-        # Update transaction and book status
-        transaction.__return_date = datetime.now().strftime("%Y-%m-%d")
-        transaction.__status = "Returned"
-
-        book = next((b for b in books if b.book_id == book_id), None)
-        if book:
-            book.available = True
-
-        # Save updates
-        cls.save_transactions(transactions)
-        Book.save_books(books)
-        print(f"📘 Book '{book.title}' successfully returned by Member ID {member_id}.")
-
-    @classmethod
-    def view_all(cls):
-        """Display all transaction records."""
-        transactions = cls.load_transactions()
-        if not transactions:
-            print("🕮 No transactions found.")
-        else:
-            print("\n=== All Transactions ===")
-            for t in transactions:
-                t.display()
-
-    @classmethod
-    def overdue_books(cls, days_limit=7):
-        """Display overdue books (borrowed for more than N days)."""
-        transactions = cls.load_transactions()
-        overdue_list = []
-
-        for t in transactions:
-            if t.status == "Borrowed":
-                borrow_date = datetime.strptime(t.borrow_date, "%Y-%m-%d")
-                if datetime.now() - borrow_date > timedelta(days=days_limit):
-                    overdue_list.append(t)
-
-        if not overdue_list:
-            print("✅ No overdue books.")
-        else:
-            print(f"\n⚠️ Overdue Books (Borrowed more than {days_limit} days ago):")
-            for t in overdue_list:
-                t.display()
+    @classmethod
+    def overdue_books(cls, days_limit=7, offset=0, limit=None):
+        """Display overdue books (borrowed for more than N days); return the Page shown."""
+        overdue_list = cls.overdue(days_limit)
+        return print_page(paginate(overdue_list, offset, limit, len(overdue_list)),
+                          f"\n⚠️ Overdue Books (Borrowed more than {days_limit} days ago):",
+                          "✅ No overdue books.")
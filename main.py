@@ -14,22 +14,60 @@ Options:
  9. Library Report
 10. Add New Book
 11. Register New Member
+12. Bulk Borrow/Return from File
+13. Most Borrowed Books
+14. Department Activity
+15. Borrows per Month
+16. Average Loan Duration
  0. Exit
 =================================================
+
+Scripting (JSON on stdout, exit status 1 on failure):
+    python main.py search KEYWORD...
+    python main.py book BOOK_ID | member MEMBER_ID
+    python main.py borrow MEMBER_ID BOOK_ID
+    python main.py return MEMBER_ID BOOK_ID
+    python main.py overdue [--days 7]
+    python main.py report [summary|top|departments|periods|duration]
+    python main.py export [--output-dir DIR]    (every report to CSV, in parallel)
+    python main.py serve [--port 8080]          (HTTP/JSON API)
 """
 
-# from library import Member, Transaction, Report
-from library.book import Book
-from library.member import Member
-from library.transaction import Transaction
-from library.report import Report
+# Library modules are imported inside the functions that use them, so a
+# subcommand only pays for the modules it needs (see `python -X importtime`)
+import argparse
 import sys
 import os
 
+MENU = {
+    "1": "Display All Books",
+    "2": "Display Available Books",
+    "3": "Display All Members",
+    "4": "Search Books",
+    "5": "Borrow a Book",
+    "6": "Return a Book",
+    "7": "View Member's Borrowed Books",
+    "8": "View Overdue Books",
+    "9": "Library Report",
+    "10": "Add New Book",
+    "11": "Register New Member",
+    "12": "Bulk Borrow/Return from File",
+    "13": "Most Borrowed Books",
+    "14": "Department Activity",
+    "15": "Borrows per Month",
+    "16": "Average Loan Duration",
+    "0": "Exit",
+}
+
 
 def clear_screen():
-    """Clear terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear terminal screen (ANSI escape: no shell spawned per loop)."""
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        print("\033[2J\033[H", end="", flush=True)
 
 
 def pause():
@@ -37,94 +75,341 @@ def pause():
     input("\nPress ENTER to continue...")
 
 
+def load_pairs(file_path):
+    """Read member_id,book_id pairs from a scanner dump (header optional)."""
+    import csv
+    pairs = []
+    with open(file_path, "r", newline="", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if len(row) < 2 or row[0].strip().lower() == "member_id":
+                continue
+            pairs.append((row[0].strip(), row[1].strip()))
+    return pairs
+
+
+def bulk_desk_operation():
+    """Borrow or return every member_id,book_id pair listed in a file."""
+    from library.transaction import Transaction
+    mode = input("Borrow or Return? (b/r): ").strip().lower()
+    file_path = input("Enter path to member_id,book_id file: ").strip()
+    try:
+        pairs = load_pairs(file_path)
+    except OSError as e:
+        print(f"❌ Could not read file: {e}")
+        return
+
+    if mode == "b":
+        results = Transaction.borrow_many(pairs)
+    elif mode == "r":
+        results = Transaction.return_many(pairs)
+    else:
+        print("⚠️ Invalid choice. Please enter 'b' or 'r'.")
+        return
+
+    for r in results:
+        print(f"{r['member_id']:>6} | {r['book_id']:>6} | {r['message']}")
+    succeeded = sum(1 for r in results if r["ok"])
+    print(f"\n📦 Processed {len(results)} items: {succeeded} succeeded, {len(results) - succeeded} failed.")
+
+
+def browse(show):
+    """
+    Page through a listing: show(offset, limit) prints one page and
+    returns it; [n]ext / [p]rev move between pages, anything else stops.
+    """
+    from library.paging import PAGE_SIZE
+    offset = 0
+    while True:
+        page = show(offset, PAGE_SIZE)
+        if not (page.has_next or page.has_prev):
+            return
+        choices = "/".join(c for c, ok in (("[n]ext", page.has_next), ("[p]rev", page.has_prev)) if ok)
+        move = input(f"{choices}, ENTER to stop: ").strip().lower()
+        if move == "n" and page.has_next:
+            offset = page.next_offset()
+        elif move == "p" and page.has_prev:
+            offset = page.prev_offset()
+        else:
+            return
+
+
 def main():
     """Main interactive menu system."""
+    from library.profiling import Profiler
     while True:
         clear_screen()
         print("=" * 55)
         print("             LIBRARY MANAGEMENT SYSTEM")
         print("=" * 55)
-        print("1. Display All Books")
-        print("2. Display Available Books")
-        print("3. Display All Members")
-        print("4. Search Books")
-        print("5. Borrow a Book")
-        print("6. Return a Book")
-        print("7. View Member's Borrowed Books")
-        print("8. View Overdue Books")
-        print("9. Library Report")
-        print("10. Add New Book")
-        print("11. Register New Member")
-        print("0. Exit")
+        for key, label in MENU.items():
+            print(f"{key}. {label}")
         print("=" * 55)
 
-        choice = input("Enter your choice (0-11): ").strip()
-
-        # ------------------------------------------------
-        # Functional Menu Logic
-        # ------------------------------------------------
-        if choice == "1":
-            Book.display_all()
-
-        elif choice == "2":
-            Book.available_books()
-
-        elif choice == "3":
-            Member.display_all()
-
-        elif choice == "4":
-            keyword = input("Enter book title/author to search: ")
-            Book.search(keyword)
-
-        elif choice == "5":
-            member_id = input("Enter Member ID: ")
-            book_id = input("Enter Book ID: ")
-            Transaction.borrow_book(member_id, book_id)
-
-        elif choice == "6":
-            member_id = input("Enter Member ID: ")
-            book_id = input("Enter Book ID: ")
-            Transaction.return_book(member_id, book_id)
-
-        elif choice == "7":
-            member_id = input("Enter Member ID: ")
-            print(f"\n📘 Books borrowed by {member_id}:")
-            Transaction.view_member_borrowed(member_id)
-
-        elif choice == "8":
-            days = input("Enter overdue limit (default 7): ").strip()
-            days = int(days) if days else 7
-            Transaction.overdue_books(days)
-
-        elif choice == "9":
-            Report.total_summary()
-
-        elif choice == "10":
-            title = input("Enter Book Title: ")
-            author = input("Enter Author Name: ")
-            genre = input("Enter Genre: ")
-            year = input("Enter Published Year: ")
-            Book.add_book(title, author, genre, year)
-
-        elif choice == "11":
-            name = input("Enter Member Name: ")
-            email = input("Enter Email: ")
-            phone = input("Enter Phone: ")
-            dept = input("Enter Department: ")
-            Member.register(name, email, phone, dept)
-
-        elif choice == "0":
-            print("\n👋 Exiting Library Management System... Goodbye!")
-            sys.exit(0)
+        choice = input("Enter your choice (0-16): ").strip()
 
-        else:
-            print("⚠️ Invalid choice. Please try again!")
+        with Profiler.action(f"{choice}. {MENU[choice]}" if choice in MENU else "invalid choice"):
+            dispatch(choice)
 
         pause()
 
 
+def dispatch(choice):
+    """Run one menu action."""
+    from library.book import Book
+    from library.member import Member
+    from library.transaction import Transaction
+    from library.report import Report
+    # ------------------------------------------------
+    # Functional Menu Logic
+    # ------------------------------------------------
+    if choice == "1":
+        browse(Book.display_all)
+
+    elif choice == "2":
+        browse(Book.available_books)
+
+    elif choice == "3":
+        browse(Member.display_all)
+
+    elif choice == "4":
+        keyword = input("Enter book title/author/genre to search: ")
+        browse(lambda offset, limit: Book.search(keyword, offset, limit))
+
+    elif choice == "5":
+        member_id = input("Enter Member ID: ")
+        book_id = input("Enter Book ID: ")
+        Transaction.borrow_book(member_id, book_id)
+
+    elif choice == "6":
+        member_id = input("Enter Member ID: ")
+        book_id = input("Enter Book ID: ")
+        Transaction.return_book(member_id, book_id)
+
+    elif choice == "7":
+        member_id = input("Enter Member ID: ")
+        print(f"\n📘 Books borrowed by {member_id}:")
+        Transaction.view_member_borrowed(member_id)
+
+    elif choice == "8":
+        days = input("Enter overdue limit (default 7): ").strip()
+        days = int(days) if days else 7
+        browse(lambda offset, limit: Transaction.overdue_books(days, offset, limit))
+
+    elif choice == "9":
+        Report.total_summary()
+
+    elif choice == "10":
+        title = input("Enter Book Title: ")
+        author = input("Enter Author Name: ")
+        genre = input("Enter Genre: ")
+        year = input("Enter Published Year: ")
+        Book.add_book(title, author, genre, year)
+
+    elif choice == "11":
+        name = input("Enter Member Name: ")
+        email = input("Enter Email: ")
+        phone = input("Enter Phone: ")
+        dept = input("Enter Department: ")
+        Member.register(name, email, phone, dept)
+
+    elif choice == "12":
+        bulk_desk_operation()
+
+    elif choice == "13":
+        Report.most_borrowed_books()
+
+    elif choice == "14":
+        Report.department_activity()
+
+    elif choice == "15":
+        Report.borrows_per_period()
+
+    elif choice == "16":
+        Report.average_loan_duration()
+
+    elif choice == "0":
+        print("\n👋 Exiting Library Management System... Goodbye!")
+        sys.exit(0)
+
+    else:
+        print("⚠️ Invalid choice. Please try again!")
+
+
+# ------------------------------------------------
+# SUBCOMMANDS (non-interactive)
+# ------------------------------------------------
+def cmd_search(args):
+    from library import api
+    return api.search_books(" ".join(args.keyword)), 0
+
+
+def cmd_book(args):
+    from library import api
+    result = api.get_book(args.book_id)
+    return result, 0 if result else 1
+
+
+def cmd_member(args):
+    from library import api
+    result = api.get_member(args.member_id)
+    return result, 0 if result else 1
+
+
+def cmd_borrow(args):
+    from library import api
+    result = api.borrow([(args.member_id, args.book_id)])[0]
+    return result, 0 if result["ok"] else 1
+
+
+def cmd_return(args):
+    from library import api
+    result = api.return_books([(args.member_id, args.book_id)])[0]
+    return result, 0 if result["ok"] else 1
+
+
+def cmd_overdue(args):
+    from library import api
+    return api.overdue(args.days), 0
+
+
+def cmd_report(args):
+    from library import api
+    return api.report(args.name, args.top, args.period), 0
+
+
+def cmd_import(args):
+    from library import importer
+    try:
+        stats = importer.import_catalog(args.file, args.workers, args.chunk_size, args.dry_run,
+                                        importer.progress_printer())
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}, 1
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    return stats, 0
+
+
+def cmd_export(args):
+    from library import export
+    try:
+        return export.export_reports(args.output_dir, args.workers, args.days, args.only), 0
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}, 1
+
+
+def cmd_serve(args):
+    from library.server import serve
+    serve(args.host, args.port)
+    return None, 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Library Management System (no subcommand: interactive menu)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time file I/O and model calls per menu action; print a table on exit")
+    parser.add_argument("--profile-json", metavar="FILE", help="like --profile, but write the stats as JSON")
+    parser.add_argument("--cprofile", metavar="FILE", help="also capture a cProfile dump (view: python -m pstats FILE)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    search = commands.add_parser("search", help="search books by title/author/genre")
+    search.add_argument("keyword", nargs="+")
+    search.set_defaults(handler=cmd_search)
+
+    book = commands.add_parser("book", help="look up one book")
+    book.add_argument("book_id")
+    book.set_defaults(handler=cmd_book)
+
+    member = commands.add_parser("member", help="look up one member and their open loans")
+    member.add_argument("member_id")
+    member.set_defaults(handler=cmd_member)
+
+    for name, handler, text in [("borrow", cmd_borrow, "borrow a book"), ("return", cmd_return, "return a book")]:
+        command = commands.add_parser(name, help=text)
+        command.add_argument("member_id")
+        command.add_argument("book_id")
+        command.set_defaults(handler=handler)
+
+    overdue = commands.add_parser("overdue", help="list overdue loans")
+    overdue.add_argument("--days", type=int, default=7, help="overdue limit in days (default 7)")
+    overdue.set_defaults(handler=cmd_overdue)
+
+    report = commands.add_parser("report", help="library reports")
+    report.add_argument("name", nargs="?", default="summary",
+                        choices=["summary", "top", "departments", "periods", "duration"])
+    report.add_argument("--top", type=int, default=5, help="number of books for 'top'")
+    report.add_argument("--period", choices=["month", "year"], default="month", help="bucket for 'periods'")
+    report.set_defaults(handler=cmd_report)
+
+    catalog = commands.add_parser("import", help="bulk-import books from a CSV or JSON-lines file")
+    catalog.add_argument("file")
+    catalog.add_argument("--workers", type=int, help="normalizing processes (default: CPU count)")
+    catalog.add_argument("--chunk-size", type=int, default=10000, help="records per chunk")
+    catalog.add_argument("--dry-run", action="store_true", help="count new/duplicate/invalid records only")
+    catalog.set_defaults(handler=cmd_import)
+
+    export = commands.add_parser("export", help="export every report (and breakdowns) to CSV in parallel")
+    export.add_argument("--output-dir", default="data/reports", help="folder for the CSVs")
+    export.add_argument("--workers", type=int, help="report processes (default: CPU count)")
+    export.add_argument("--days", type=int, default=7, help="overdue limit in days (default 7)")
+    export.add_argument("--only", nargs="+", metavar="NAME", help="export only these reports")
+    export.set_defaults(handler=cmd_export)
+
+    serve = commands.add_parser("serve", help="run the HTTP/JSON API server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def run_command(args):
+    """Run one subcommand and print its result as JSON; return the exit status."""
+    import json
+    result, status = args.handler(args)
+    if args.command != "serve":
+        json.dump(result, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return status
+
+
 # ------------------------------------------------
 # ENTRY POINT
 # ------------------------------------------------
+def run(argv=None):
+    """Parse command-line options, then run a subcommand or the menu."""
+    args = build_parser().parse_args(argv)
+
+    profiling = args.profile or args.profile_json
+    if profiling:
+        from library.profiling import Profiler
+        Profiler.enable()
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    status = 0
+    try:
+        if args.command is None:
+            main()
+        elif profiling:
+            with Profiler.action(f"command: {args.command}"):
+                status = run_command(args)
+        else:
+            status = run_command(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"📁 cProfile stats written to {args.cprofile}", file=sys.stderr)
+        if profiling:
+            Profiler.disable()
+            if args.profile_json:
+                Profiler.dump_json(args.profile_json)
+                print(f"📁 Profile written to {args.profile_json}", file=sys.stderr)
+            else:
+                Profiler.print_table()
+    return status
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(run())